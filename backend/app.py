@@ -20,14 +20,35 @@ def create_app():
     Compress(app)
     db.init_app(app)
 
+    from commands import register_commands
+    register_commands(app)
+
+    from services.response_cache import response_cache
+    response_cache.configure(app.config)
+
+    from services.blobstore import init_blob_store
+    init_blob_store(app)
+
     # Register blueprints
     from routes.models import models_bp
     from routes.development import development_bp
     from routes.dashboard import dashboard_bp
+    from routes.alert_rules import alert_rules_bp
+    from routes.search import search_bp
+    from routes.export import export_bp
+    from routes.importer import importer_bp
+    from routes.monitoring import monitoring_bp
+    from routes.scoring import scoring_bp
 
     app.register_blueprint(models_bp, url_prefix="/api/models")
     app.register_blueprint(development_bp, url_prefix="/api/development")
     app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
+    app.register_blueprint(alert_rules_bp, url_prefix="/api/alert-rules")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(export_bp, url_prefix="/api/export")
+    app.register_blueprint(importer_bp, url_prefix="/api/import")
+    app.register_blueprint(monitoring_bp, url_prefix="/api/models")
+    app.register_blueprint(scoring_bp, url_prefix="/api/models")
 
     # Health check endpoints
     @app.route("/")
@@ -38,11 +59,24 @@ def create_app():
     def health():
         return jsonify({"status": "ok"})
 
+    @app.route("/health/cache")
+    def cache_stats():
+        """Yanıt önbelleği hit/miss/eviction sayaçları (bu worker için)."""
+        return jsonify(response_cache.stats())
+
     # Create tables and auto-seed if empty
     with app.app_context():
         import models.scorecard  # noqa: F401
         import models.development  # noqa: F401
+        import models.dashboard  # noqa: F401
+        import models.system  # noqa: F401
+        import services.versioning  # noqa: F401  (tablo versiyon event'lerini kaydeder)
+        import services.summary  # noqa: F401  (sayaç event'lerini kaydeder)
+        import services.search  # noqa: F401  (arama dokümanı event'lerini kaydeder)
         db.create_all()
+        # create_all mevcut tablolara yeni kolon/indeks eklemez
+        from services.schema import upgrade_schema
+        upgrade_schema()
 
         # Production'da seed istemezsin — SEED_ON_EMPTY=true ile kontrol et
         if os.getenv("SEED_ON_EMPTY", "true").lower() == "true":
@@ -51,6 +85,18 @@ def create_app():
                 from seed_data import seed_db
                 seed_db()
 
+        # Türetilmiş tabloları kaynak verilerle hizala (drift onarımı, doğrudan DB'de yapılan kural değişikliği)
+        from services.summary import rebuild_summary
+        from services.alerts import ensure_default_rules, refresh_alert_state
+        from services.versioning import ensure_versions
+        from services.search import ensure_search_index
+        ensure_versions()
+        ensure_search_index()
+        rebuild_summary()
+        ensure_default_rules()
+        refresh_alert_state()
+        db.session.commit()
+
     return app
 
 
@@ -0,0 +1,86 @@
+"""Bakım komutları — `flask --app app <komut>` ile çalıştırılır."""
+import click
+
+
+def register_commands(app):
+
+    @app.cli.command("rebuild-summary")
+    def rebuild_summary_command():
+        """Dashboard özet sayaçlarını kaynak tablolardan yeniden hesapla."""
+        from services.summary import rebuild_summary
+        summary = rebuild_summary()
+        data = summary.to_dict()
+        click.echo(f"Summary rebuilt: {data['models']['total']} models, "
+                   f"{data['development']['total_projects']} projects, "
+                   f"{data['development']['overdue_stages']} overdue stages")
+
+    @app.cli.command("reevaluate-alerts")
+    def reevaluate_alerts_command():
+        """Tüm modellerin Gini/PSI alert durumunu yeniden değerlendir (kurallar doğrudan DB'de değiştirildiğinde)."""
+        from models import db
+        from services.alerts import refresh_alert_state
+        alerts = refresh_alert_state()
+        db.session.commit()
+        gini = sum(1 for a in alerts if a["gini_alert"])
+        click.echo(f"Alert state re-evaluated: {len(alerts)} alerts ({gini} Gini, {len(alerts) - gini} PSI only)")
+
+    @app.cli.command("reindex-search")
+    def reindex_search_command():
+        """Arama dokümanlarını ve tam metin indeksini kaynak tablolardan yeniden kur."""
+        from models import db
+        from services.search import get_backend, rebuild_search_index
+        total = rebuild_search_index()
+        db.session.commit()
+        click.echo(f"Search index rebuilt: {total} documents ({get_backend().name})")
+
+    @app.cli.command("upgrade-schema")
+    def upgrade_schema_command():
+        """Mevcut tablolara modelde olup veritabanında olmayan kolon ve indeksleri ekle."""
+        from services.schema import upgrade_schema
+        changes = upgrade_schema()
+        for change in changes:
+            click.echo(f"  + {change}")
+        click.echo(f"Schema upgraded: {len(changes)} changes")
+
+    @app.cli.command("migrate-blobs")
+    def migrate_blobs_command():
+        """DB'de (file_data) tutulan validasyon raporu dosyalarını blob deposuna taşı."""
+        from services.report_files import migrate_report_files
+        migrated, total_bytes = migrate_report_files()
+        click.echo(f"Blobs migrated: {migrated} files, {total_bytes / (1024 * 1024):.1f} MB")
+
+    @app.cli.command("gc-blobs")
+    def gc_blobs_command():
+        """Hiçbir rapora bağlı olmayan blob dosyalarını ve yarım kalmış yüklemeleri sil."""
+        from services.report_files import collect_unreferenced_files
+        removed, temporary = collect_unreferenced_files()
+        click.echo(f"Blobs removed: {removed} files, {temporary} temporary files")
+
+    @app.cli.command("compute-psi")
+    @click.argument("period")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--score-column", default="score")
+    @click.option("--model-id-column", default="model_id")
+    @click.option("--weight-column", default=None)
+    def compute_psi_command(period, path, score_column, model_id_column, weight_column):
+        """Portföyün dönem PSI'ını CSV'den (model_id, skor) hesapla; psi_history ve psi_flag güncellenir."""
+        from models import db
+        from services.psi import record_psi, split_by_model
+        from services.samples import read_columns
+        names = [model_id_column, score_column] + ([weight_column] if weight_column else [])
+        with open(path, "rb") as stream:
+            columns = read_columns(stream, "csv", names)
+        missing = [name for name in names if name not in columns]
+        if missing:
+            raise click.ClickException(f"Kolon bulunamadı: {', '.join(missing)}")
+        try:
+            samples = split_by_model(columns[model_id_column], columns[score_column],
+                                     columns[weight_column] if weight_column else None)
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from None
+        results, errors = record_psi(period, samples)
+        db.session.commit()
+        for model_id, message in sorted(errors.items()):
+            click.echo(f"  ! model {model_id}: {message}")
+        flagged = sum(1 for r in results.values() if r["psi_status"] == "alert")
+        click.echo(f"PSI computed for {period}: {len(results)} models ({flagged} alert), {len(errors)} skipped")
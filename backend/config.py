@@ -25,3 +25,37 @@ class Config:
         "pool_recycle": 1800,
         "pool_pre_ping": True,
     }
+
+    # Sunucu tarafı yanıt önbelleği (worker başına, LRU) — 0 verilirse kapalı
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # /api/dashboard/bootstrap paralel sorgu sayısı — pool_size'ın altında tutulmalı
+    DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", "3"))
+
+    # /api/dashboard/stream: diğer worker'lardaki yazımlar için kontrol aralığı ve bağlantı ömrü (sn)
+    DASHBOARD_STREAM_POLL_SECONDS = int(os.getenv("DASHBOARD_STREAM_POLL_SECONDS", "5"))
+    DASHBOARD_STREAM_MAX_SECONDS = int(os.getenv("DASHBOARD_STREAM_MAX_SECONDS", "300"))
+    # Worker başına açık stream sınırı: gunicorn thread'lerinden (gunicorn.conf.py) API'ye ayrılanlar düşülür
+    GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "64"))
+    DASHBOARD_API_THREADS = int(os.getenv("DASHBOARD_API_THREADS", "8"))
+    DASHBOARD_STREAM_MAX_CONNECTIONS = int(os.getenv(
+        "DASHBOARD_STREAM_MAX_CONNECTIONS", str(max(GUNICORN_THREADS - DASHBOARD_API_THREADS, 1))
+    ))
+
+    # Liste endpoint'leri sayfa parametresi verilmeden en fazla bu kadar kayıt döner (düz dizi);
+    # aşılırsa ilk keyset (cursor) sayfası döner
+    LIST_UNPAGED_MAX = int(os.getenv("LIST_UNPAGED_MAX", "500"))
+
+    # Validasyon raporu dosyaları: içerik adresli depo (şimdilik yalnızca "local")
+    BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")
+    BLOB_STORE_PATH = os.getenv(
+        "BLOB_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "blobs")
+    )
+    # Kaydı silinen / bağlanmamış dosyalar en az bu kadar süre dokunulmamışsa silinir (sn)
+    BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+
+    # PSI: stabilite durumu eşikleri (psi >= WARNING -> warning, >= ALERT -> alert ve psi_flag)
+    PSI_WARNING_THRESHOLD = float(os.getenv("PSI_WARNING_THRESHOLD", "0.10"))
+    PSI_ALERT_THRESHOLD = float(os.getenv("PSI_ALERT_THRESHOLD", "0.25"))
+    PSI_BINS = int(os.getenv("PSI_BINS", "10"))
@@ -0,0 +1,13 @@
+"""
+gunicorn ayarları (gunicorn çalışma dizinindeki bu dosyayı kendiliğinden okur).
+
+gthread: her açık /api/dashboard/stream bağlantısı bir thread tutar. Thread sayısı
+GUNICORN_THREADS ile verilir; aynı değer config.py'de stream sınırını belirler
+(thread'lerin DASHBOARD_API_THREADS kadarı API isteklerine ayrılır).
+"""
+import os
+
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "64"))
+timeout = 120
+preload_app = True
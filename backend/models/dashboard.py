@@ -0,0 +1,146 @@
+import json
+from datetime import datetime, timezone
+from models import db
+
+
+class DashboardSummary(db.Model):
+    """Dashboard özet sayaçları - tek satırlık, ORM event'leri ile artımlı güncellenir."""
+    __tablename__ = "dashboard_summary"
+
+    id = db.Column(db.Integer, primary_key=True)  # Her zaman 1
+    # Mevcut modeller
+    models_total = db.Column(db.Integer, nullable=False, default=0)
+    models_active = db.Column(db.Integer, nullable=False, default=0)
+    models_under_review = db.Column(db.Integer, nullable=False, default=0)
+    models_basvuru = db.Column(db.Integer, nullable=False, default=0)
+    models_davranis = db.Column(db.Integer, nullable=False, default=0)
+    models_psi_flag = db.Column(db.Integer, nullable=False, default=0)
+    models_cal_warning = db.Column(db.Integer, nullable=False, default=0)
+    models_cal_critical = db.Column(db.Integer, nullable=False, default=0)
+    # Geliştirilen skorkartlar
+    projects_total = db.Column(db.Integer, nullable=False, default=0)
+    projects_active = db.Column(db.Integer, nullable=False, default=0)
+    projects_completed = db.Column(db.Integer, nullable=False, default=0)
+    projects_basvuru = db.Column(db.Integer, nullable=False, default=0)
+    projects_davranis = db.Column(db.Integer, nullable=False, default=0)
+    # Geciken aşamalar tarihe bağlı: overdue_as_of gününe göre geçerlidir
+    overdue_stages = db.Column(db.Integer, nullable=False, default=0)
+    overdue_as_of = db.Column(db.Date)
+    rebuilt_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "models": {
+                "total": self.models_total,
+                "active": self.models_active,
+                "under_review": self.models_under_review,
+                "basvuru": self.models_basvuru,
+                "davranis": self.models_davranis,
+                "psi_flag_count": self.models_psi_flag,
+                "cal_warning": self.models_cal_warning,
+                "cal_critical": self.models_cal_critical,
+            },
+            "development": {
+                "total_projects": self.projects_total,
+                "active_projects": self.projects_active,
+                "completed_projects": self.projects_completed,
+                "overdue_stages": self.overdue_stages,
+                "dev_basvuru": self.projects_basvuru,
+                "dev_davranis": self.projects_davranis,
+            },
+        }
+
+
+class AlertState(db.Model):
+    """
+    Model bazında Gini/PSI alert durumu. Yalnızca alert olan modellerin satırı tutulur;
+    Gini kaydı ya da alert'e etki eden model alanları yazıldığında yeniden değerlendirilir.
+    """
+    __tablename__ = "alert_state"
+    __table_args__ = (
+        # Dashboard okuması bu sıralamayla yapılır
+        db.Index("ix_alert_state_severity", "severity_rank", "severity"),
+    )
+
+    model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), primary_key=True)
+    gini_alert = db.Column(db.Boolean, nullable=False, default=False)
+    gini_threshold = db.Column(db.Float)
+    alert_reason = db.Column(db.Text)     # JSON liste: consecutive_deviation, window_deviation, threshold_breach, calibration
+    last_periods = db.Column(db.Text)     # JSON liste
+    last_values = db.Column(db.Text)      # JSON liste
+    last_diffs = db.Column(db.Text)       # JSON liste
+    direction = db.Column(db.String(10))  # drop | rise
+    severity_rank = db.Column(db.Integer, nullable=False, default=1)  # 0: Gini alert, 1: PSI / kalibrasyon
+    severity = db.Column(db.Float, nullable=False, default=0)         # |son sapma|
+    evaluated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self, model):
+        """`model`: ModelInventory ya da aynı alanları taşıyan satır."""
+        return {
+            "model_id": self.model_id,
+            "model_name": model.model_name,
+            "scorecard_category": model.scorecard_category,
+            "product_type": model.product_type,
+            "status": model.status,
+            "gini_development": model.gini_development,
+            "gini_current": model.gini_current,
+            "gini_threshold": self.gini_threshold,
+            "last3_periods": json.loads(self.last_periods or "[]"),
+            "last3_values": json.loads(self.last_values or "[]"),
+            "last3_diffs": json.loads(self.last_diffs or "[]"),
+            "direction": self.direction,
+            "alert_reason": json.loads(self.alert_reason or "[]"),
+            "gini_alert": self.gini_alert,
+            "psi_flag": model.psi_flag or False,
+            "alert_work_started": model.alert_work_started or False,
+        }
+
+
+class AlertRule(db.Model):
+    """
+    Alert kuralı. Kategori/ürün boş bırakılırsa o boyutta her değere uyar; bir modele
+    en özel kural uygulanır (kategori+ürün > kategori > ürün > genel), eşitlikte priority.
+    """
+    __tablename__ = "alert_rule"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    scorecard_category = db.Column(db.String(100))  # Boş: tüm kategoriler
+    product_type = db.Column(db.String(100))        # Boş: tüm ürünler
+    # Gini: güncel değer eşiğin altındaysa alert (boş: eşik kontrolü yok)
+    gini_threshold = db.Column(db.Float)
+    # Son window_months aylık kaydın en az min_breaches tanesinde ≥ min_gini_diff sapma
+    window_months = db.Column(db.Integer, nullable=False, default=3)
+    min_breaches = db.Column(db.Integer, nullable=False, default=3)
+    min_gini_diff = db.Column(db.Float, nullable=False, default=0.05)
+    # PSI flag tek başına alert üretir mi
+    psi_alert = db.Column(db.Boolean, nullable=False, default=True)
+    # Alert üreten kalibrasyon durumları, virgülle ayrılmış: "critical" ya da "warning,critical"
+    calibration_levels = db.Column(db.String(50))
+    calibration_requires_psi = db.Column(db.Boolean, nullable=False, default=False)
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    description = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "scorecard_category": self.scorecard_category,
+            "product_type": self.product_type,
+            "gini_threshold": self.gini_threshold,
+            "window_months": self.window_months,
+            "min_breaches": self.min_breaches,
+            "min_gini_diff": self.min_gini_diff,
+            "psi_alert": self.psi_alert,
+            "calibration_levels": self.calibration_levels.split(",") if self.calibration_levels else [],
+            "calibration_requires_psi": self.calibration_requires_psi,
+            "priority": self.priority,
+            "is_active": self.is_active,
+            "description": self.description,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
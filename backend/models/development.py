@@ -1,10 +1,15 @@
 from datetime import datetime, timezone
+from sqlalchemy import select, func, case
 from models import db
 
 
 class DevelopmentProject(db.Model):
     """Geliştirilen skorkart projesi."""
     __tablename__ = "development_project"
+    __table_args__ = (
+        # Liste sırası ve keyset sayfalama (updated_at DESC, id DESC)
+        db.Index("ix_development_project_updated", "updated_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_name = db.Column(db.String(300), nullable=False)
@@ -25,7 +30,12 @@ class DevelopmentProject(db.Model):
     stages = db.relationship("DevelopmentStage", backref="project", lazy=True,
                              cascade="all, delete-orphan", order_by="DevelopmentStage.order_index")
 
-    def to_dict(self, include_stages=False):
+    def to_dict(self, include_stages=False, stage_counts=None):
+        """stage_counts: SQL'de hesaplanmış (toplam, tamamlanan) üst seviye aşama sayısı.
+        Verilirse aşamalar yüklenmez (bkz. stage_progress_subquery)."""
+        if stage_counts is None:
+            stage_counts = self._count_top_stages()
+        stage_total, stage_completed = stage_counts
         data = {
             "id": self.id,
             "project_name": self.project_name,
@@ -40,22 +50,26 @@ class DevelopmentProject(db.Model):
             "description": self.description,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "progress": self._calculate_progress(),
+            "progress": progress_percent(stage_completed, stage_total),
+            "stage_count": stage_total,
+            "completed_stage_count": stage_completed,
         }
         if include_stages:
             # Only top-level stages; children are nested inside each stage's to_dict
             data["stages"] = [s.to_dict() for s in self.stages if s.parent_id is None]
         return data
 
-    def _calculate_progress(self):
-        if not self.stages:
-            return 0
+    def _count_top_stages(self):
         # Only count top-level stages (no parent) for progress
         top_stages = [s for s in self.stages if s.parent_id is None]
-        if not top_stages:
-            return 0
         completed = sum(1 for s in top_stages if s.status == "completed")
-        return round((completed / len(top_stages)) * 100)
+        return len(top_stages), completed
+
+
+def progress_percent(completed, total):
+    if not total:
+        return 0
+    return round((completed / total) * 100)
 
 
 class DevelopmentStage(db.Model):
@@ -122,3 +136,20 @@ class StageTask(db.Model):
             "is_completed": self.is_completed,
             "order_index": self.order_index,
         }
+
+
+def stage_progress_subquery():
+    """
+    Proje başına üst seviye aşama sayıları (stage_total, stage_completed) — tek GROUP BY.
+    Proje sorgusuna outer join edilerek ilerleme, aşama nesneleri yüklenmeden hesaplanır.
+    """
+    return (
+        select(
+            DevelopmentStage.project_id,
+            func.count(DevelopmentStage.id).label("stage_total"),
+            func.count(case((DevelopmentStage.status == "completed", 1))).label("stage_completed"),
+        )
+        .where(DevelopmentStage.parent_id.is_(None))
+        .group_by(DevelopmentStage.project_id)
+        .subquery("stage_progress")
+    )
@@ -1,10 +1,16 @@
-from datetime import datetime, timezone
+import json
+from datetime import date, datetime, timezone
+from sqlalchemy import case, or_
 from models import db
 
 
 class ModelInventory(db.Model):
     """Mevcut model envanteri - temel model bilgileri."""
     __tablename__ = "model_inventory"
+    __table_args__ = (
+        # Liste sırası ve keyset sayfalama (updated_at DESC, id DESC)
+        db.Index("ix_model_inventory_updated", "updated_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     model_name = db.Column(db.String(200), nullable=False)
@@ -44,6 +50,28 @@ class ModelInventory(db.Model):
     gini_history = db.relationship("GiniHistory", backref="model", lazy=True, cascade="all, delete-orphan")
     rollout_stages = db.relationship("ModelRollout", backref="model", lazy=True, cascade="all, delete-orphan")
     model_variables = db.relationship("ModelVariable", backref="model", lazy=True, cascade="all, delete-orphan")
+    alert_state = db.relationship("AlertState", backref="model", lazy=True, uselist=False,
+                                  cascade="all, delete-orphan")
+    psi_baseline = db.relationship("PsiBaseline", backref="model", lazy=True, uselist=False,
+                                   cascade="all, delete-orphan")
+    psi_history = db.relationship("PsiHistory", backref="model", lazy=True, cascade="all, delete-orphan")
+
+    # Liste endpoint'inde view= ile seçilebilen hazır alan setleri (fields= ile birleştirilebilir)
+    LIST_VIEWS = {
+        "summary": ("model_name", "scorecard_category", "product_type", "owner",
+                    "gini_current", "status", "psi_flag", "calibration_status"),
+    }
+
+    @staticmethod
+    def fields_to_dict(row, fields):
+        """Yalnızca seçilen kolonları taşıyan satırı to_dict ile aynı biçimde serileştir."""
+        data = {}
+        for name in fields:
+            value = getattr(row, name)
+            data[name] = value.isoformat() if isinstance(value, (date, datetime)) else value
+        if "calibration_status" in data:
+            data["calibration_status"] = data["calibration_status"] or "ok"
+        return data
 
     def to_dict(self):
         return {
@@ -114,8 +142,12 @@ class ValidationReport(db.Model):
     model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), nullable=False, index=True)
     report_name = db.Column(db.String(300), nullable=False)
     report_type = db.Column(db.String(50), nullable=False)  # incoming, outgoing, wiseminer
-    file_path = db.Column(db.String(500))
-    file_data = db.Column(db.LargeBinary)   # Gerçek dosya içeriği (upload)
+    file_path = db.Column(db.String(500))   # Yüklenen dosyanın adı
+    # Eski kayıtlar: dosya içeriği DB'de (flask migrate-blobs ile taşınır). Hiçbir zaman
+    # nesneyle birlikte yüklenmez; okumak için açık SELECT gerekir (services/report_files.py)
+    file_data = db.deferred(db.Column(db.LargeBinary), raiseload=True)
+    file_hash = db.Column(db.String(64), index=True)  # Blob deposundaki SHA-256 adresi
+    file_size = db.Column(db.BigInteger)
     file_mimetype = db.Column(db.String(100))
     report_date = db.Column(db.Date)
     notes = db.Column(db.Text)
@@ -128,7 +160,9 @@ class ValidationReport(db.Model):
             "report_name": self.report_name,
             "report_type": self.report_type,
             "file_path": self.file_path,
-            "has_file": self.file_data is not None,
+            "has_file": bool(self.has_file),
+            "file_size": self.file_size,
+            "checksum": self.file_hash,
             "file_mimetype": self.file_mimetype,
             "report_date": self.report_date.isoformat() if self.report_date else None,
             "notes": self.notes,
@@ -136,9 +170,23 @@ class ValidationReport(db.Model):
         }
 
 
+# Dosya var mı — SQL'de hesaplanır, file_data yüklenmeden (Oracle için 1/0)
+ValidationReport.has_file = db.column_property(
+    case(
+        (or_(ValidationReport.__table__.c.file_hash.isnot(None),
+             ValidationReport.__table__.c.file_data.isnot(None)), 1),
+        else_=0,
+    )
+)
+
+
 class GiniHistory(db.Model):
     """Güncel gini değerleri takibi."""
     __tablename__ = "gini_history"
+    __table_args__ = (
+        # Alert sorgusundaki PARTITION BY model_id ORDER BY period için
+        db.Index("ix_gini_history_model_period", "model_id", "period"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), nullable=False, index=True)
@@ -162,6 +210,60 @@ class GiniHistory(db.Model):
         }
 
 
+class PsiBaseline(db.Model):
+    """PSI referans dağılımı — geliştirme örneklemi skorlarının bin sınırları ve oranları."""
+    __tablename__ = "psi_baseline"
+
+    id = db.Column(db.Integer, primary_key=True)
+    model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), nullable=False, unique=True)
+    bin_edges = db.Column(db.Text, nullable=False)      # JSON: iç sınırlar (n_bins - 1 adet)
+    expected = db.Column(db.Text, nullable=False)       # JSON: bin başına geliştirme oranları
+    sample_size = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "model_id": self.model_id,
+            "bin_edges": json.loads(self.bin_edges),
+            "expected": json.loads(self.expected),
+            "sample_size": self.sample_size,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class PsiHistory(db.Model):
+    """Dönemlik PSI (popülasyon stabilite endeksi) takibi."""
+    __tablename__ = "psi_history"
+    __table_args__ = (
+        db.Index("ix_psi_history_model_period", "model_id", "period"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), nullable=False, index=True)
+    period = db.Column(db.String(20), nullable=False)
+    psi_value = db.Column(db.Float, nullable=False)
+    psi_status = db.Column(db.String(20))  # stable | warning | alert
+    sample_size = db.Column(db.Integer)
+    actual = db.Column(db.Text)            # JSON: bin başına dönem oranları
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "model_id": self.model_id,
+            "period": self.period,
+            "psi_value": self.psi_value,
+            "psi_status": self.psi_status,
+            "sample_size": self.sample_size,
+            "actual": json.loads(self.actual) if self.actual else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
 class ModelRollout(db.Model):
     """Model implementasyon kademeleri - canlıya çıkma tarihleri."""
     __tablename__ = "model_rollout"
@@ -200,6 +302,10 @@ class ModelVariable(db.Model):
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    binning = db.relationship("VariableBinning", backref="variable", lazy=True, uselist=False,
+                              cascade="all, delete-orphan")
+    csi_history = db.relationship("CsiHistory", backref="variable", lazy=True, cascade="all, delete-orphan")
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -214,3 +320,60 @@ class ModelVariable(db.Model):
             "notes": self.notes,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class VariableBinning(db.Model):
+    """CSI referansı — değişkenin geliştirme dağılımı (bin sınırları + oranlar, son bin eksik değer)."""
+    __tablename__ = "variable_binning"
+
+    id = db.Column(db.Integer, primary_key=True)
+    model_variable_id = db.Column(db.Integer, db.ForeignKey("model_variable.id"), nullable=False, unique=True)
+    model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), nullable=False, index=True)
+    bin_edges = db.Column(db.Text, nullable=False)   # JSON: iç sınırlar
+    expected = db.Column(db.Text, nullable=False)    # JSON: bin oranları + eksik değer oranı
+    sample_size = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "model_variable_id": self.model_variable_id,
+            "model_id": self.model_id,
+            "bin_edges": json.loads(self.bin_edges),
+            "expected": json.loads(self.expected),
+            "sample_size": self.sample_size,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class CsiHistory(db.Model):
+    """Dönemlik değişken stabilitesi (CSI) takibi."""
+    __tablename__ = "csi_history"
+    __table_args__ = (
+        db.Index("ix_csi_history_model_period", "model_id", "period"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    model_variable_id = db.Column(db.Integer, db.ForeignKey("model_variable.id"), nullable=False, index=True)
+    model_id = db.Column(db.Integer, db.ForeignKey("model_inventory.id"), nullable=False)
+    period = db.Column(db.String(20), nullable=False)
+    csi_value = db.Column(db.Float, nullable=False)
+    csi_status = db.Column(db.String(20))  # stable | warning | alert
+    sample_size = db.Column(db.Integer)
+    actual = db.Column(db.Text)            # JSON: bin oranları + eksik değer oranı
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "model_variable_id": self.model_variable_id,
+            "model_id": self.model_id,
+            "period": self.period,
+            "csi_value": self.csi_value,
+            "csi_status": self.csi_status,
+            "sample_size": self.sample_size,
+            "actual": json.loads(self.actual) if self.actual else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
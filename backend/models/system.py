@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from models import db
+
+
+class DataVersion(db.Model):
+    """Tablo bazında değişiklik sayacı - her commit edilen yazımda artar (HTTP validator kaynağı)."""
+    __tablename__ = "data_version"
+
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self):
+        return {
+            "table_name": self.table_name,
+            "version": self.version,
+            "changed_at": self.changed_at.isoformat() if self.changed_at else None,
+        }
+
+
+class SearchDocument(db.Model):
+    """
+    Aranabilir metin — model, teknik kılavuz bölümü ve değişken başına bir satır.
+    Kaynak kayıtlar yazıldıkça güncellenir; tam metin indeksi bu tablo üzerindedir (services/search.py).
+    """
+    __tablename__ = "search_document"
+    __table_args__ = (
+        db.UniqueConstraint("entity", "entity_id", name="uq_search_document_entity"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)  # model, technical, variable
+    entity_id = db.Column(db.Integer, nullable=False)
+    model_id = db.Column(db.Integer, index=True)
+    title = db.Column(db.String(300))
+    text = db.Column(db.Text)             # Orijinal metin (snippet için)
+    title_key = db.Column(db.String(300)) # Normalize başlık (indekslenir)
+    content = db.Column(db.Text)          # Normalize metin (indekslenir)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
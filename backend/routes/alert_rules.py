@@ -0,0 +1,132 @@
+import math
+from flask import Blueprint, request, jsonify
+from models import db
+from models.dashboard import AlertRule
+from services.alerts import CALIBRATION_LEVELS, refresh_alert_state, rule_scope_condition
+from services.http_cache import conditional
+
+alert_rules_bp = Blueprint("alert_rules", __name__)
+
+# Alan -> (tip, boş bırakılabilir mi)
+_RULE_FIELDS = {
+    "name": (str, False),
+    "scorecard_category": (str, True),
+    "product_type": (str, True),
+    "gini_threshold": (float, True),
+    "window_months": (int, False),
+    "min_breaches": (int, False),
+    "min_gini_diff": (float, False),
+    "psi_alert": (bool, False),
+    "calibration_requires_psi": (bool, False),
+    "priority": (int, False),
+    "is_active": (bool, False),
+    "description": (str, True),
+}
+_TYPE_NAMES = {str: "metin", int: "tam sayı", float: "sonlu sayı", bool: "true/false"}
+
+
+def _field_value(field, value):
+    """İstek değerini kolon tipine göre doğrula; geçersizse ValueError."""
+    kind, nullable = _RULE_FIELDS[field]
+    if value is None:
+        if nullable:
+            return None
+        raise ValueError(f"{field} boş olamaz")
+    if isinstance(value, bool) and kind is not bool:
+        valid = False
+    elif kind is float:
+        valid = isinstance(value, (int, float)) and math.isfinite(value)
+        value = float(value) if valid else value
+    else:
+        valid = isinstance(value, kind)
+    if not valid:
+        raise ValueError(f"{field}: {_TYPE_NAMES[kind]} bekleniyordu")
+    return value
+
+
+def _apply_rule_fields(rule, data):
+    """İstekteki alanları kurala yaz; geçersizse hata mesajı döndür."""
+    if not isinstance(data, dict):
+        return "Gövde bir JSON nesnesi olmalıdır"
+    for field in _RULE_FIELDS:
+        if field in data:
+            try:
+                setattr(rule, field, _field_value(field, data[field]))
+            except ValueError as exc:
+                return str(exc)
+    if "calibration_levels" in data:
+        levels = data["calibration_levels"] or []
+        if isinstance(levels, str):
+            levels = [level.strip() for level in levels.split(",") if level.strip()]
+        if not isinstance(levels, list) or not all(isinstance(level, str) for level in levels):
+            return "calibration_levels: metin listesi bekleniyordu"
+        unknown = set(levels) - set(CALIBRATION_LEVELS)
+        if unknown:
+            return f"Geçersiz kalibrasyon durumu: {', '.join(sorted(unknown))}"
+        rule.calibration_levels = ",".join(level for level in CALIBRATION_LEVELS if level in levels) or None
+
+    if not rule.name:
+        return "Kural adı zorunludur"
+    window = rule.window_months if rule.window_months is not None else 3
+    breaches = rule.min_breaches if rule.min_breaches is not None else 3
+    if window < 1 or not 1 <= breaches <= window:
+        return "min_breaches 1 ile window_months arasında olmalıdır"
+    return None
+
+
+def _scope(rule):
+    return rule.scorecard_category, rule.product_type
+
+
+def _refresh_scopes(*scopes):
+    """Yalnızca kuralın kapsamındaki modellerin alert durumunu yenile (genel kuralda tümü)."""
+    refresh_alert_state(condition=rule_scope_condition(set(scopes)))
+
+
+@alert_rules_bp.route("/", methods=["GET"])
+@conditional("alert_rule")
+def list_rules():
+    """Alert kurallarını listele (genelden özele)."""
+    rules = AlertRule.query.order_by(
+        AlertRule.scorecard_category, AlertRule.product_type, AlertRule.priority.desc(), AlertRule.id
+    ).all()
+    return jsonify([r.to_dict() for r in rules])
+
+
+@alert_rules_bp.route("/", methods=["POST"])
+def create_rule():
+    """Yeni kural ekle; kapsamındaki modellerin alert durumu aynı transaction'da yeniden değerlendirilir."""
+    rule = AlertRule()
+    error = _apply_rule_fields(rule, request.get_json())
+    if error:
+        return jsonify({"error": error}), 400
+    db.session.add(rule)
+    db.session.flush()
+    _refresh_scopes(_scope(rule))
+    db.session.commit()
+    return jsonify(rule.to_dict()), 201
+
+
+@alert_rules_bp.route("/<int:rule_id>", methods=["PUT"])
+def update_rule(rule_id):
+    rule = db.get_or_404(AlertRule, rule_id)
+    old_scope = _scope(rule)
+    error = _apply_rule_fields(rule, request.get_json())
+    if error:
+        db.session.rollback()
+        return jsonify({"error": error}), 400
+    db.session.flush()
+    _refresh_scopes(old_scope, _scope(rule))  # Kapsam değiştiyse eski kapsam da
+    db.session.commit()
+    return jsonify(rule.to_dict())
+
+
+@alert_rules_bp.route("/<int:rule_id>", methods=["DELETE"])
+def delete_rule(rule_id):
+    rule = db.get_or_404(AlertRule, rule_id)
+    scope = _scope(rule)
+    db.session.delete(rule)
+    db.session.flush()
+    _refresh_scopes(scope)
+    db.session.commit()
+    return "", 204
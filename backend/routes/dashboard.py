@@ -1,96 +1,91 @@
-import re
-from flask import Blueprint, jsonify
-from sqlalchemy import func, case
-from sqlalchemy.orm import selectinload
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from flask import Blueprint, Response, current_app, jsonify
+from sqlalchemy import select, case, and_, or_
 from models import db
 from models.scorecard import ModelInventory
-from models.development import DevelopmentProject, DevelopmentStage
+from models.development import DevelopmentProject, progress_percent, stage_progress_subquery
+from services import alerts as alert_service
+from services import summary as summary_service
+from services.events import event_broker, sse_comment, sse_message, stream_slots
+from services.http_cache import conditional
+from services.versioning import current_versions
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
-# Kategori bazlı Gini alert eşikleri
-GINI_ALERT_THRESHOLD = {
-    "Başvuru": 0.50,
-    "Davranış": 0.55,
-}
-# Ardışık ay sayısı ve minimum puan sapması
-CONSECUTIVE_MONTHS = 3
-MIN_GINI_DIFF = 0.05
+# Gini overview'un kullandığı model kolonları (uzun Text kolonları yüklenmez)
+_OVERVIEW_COLUMNS = (
+    ModelInventory.id,
+    ModelInventory.model_name,
+    ModelInventory.scorecard_category,
+    ModelInventory.product_type,
+    ModelInventory.gini_development,
+    ModelInventory.gini_current,
+    ModelInventory.psi_flag,
+    ModelInventory.calibration_status,
+)
+# Alert listesinin ek olarak ihtiyaç duyduğu kolonlar (bootstrap ortak yüklemesi)
+_ALERT_COLUMNS = (
+    ModelInventory.status,
+    ModelInventory.alert_work_started,
+)
 
+# Bootstrap endpoint'inin bağımsız sorguları için küçük thread havuzu (lazy — gunicorn fork'u sonrası oluşur)
+_executor = None
 
-@dashboard_bp.route("/summary", methods=["GET"])
-def get_summary():
-    """Dashboard özet istatistikleri - mevcut ve geliştirilen skorkartlar ayrımıyla."""
-    from datetime import date
-
-    _active_filter = ModelInventory.status.in_(["active", "under_review"])
-
-    # Single query for all model counts
-    total_models, active_models, under_review, basvuru_count, davranis_count, \
-        psi_flag_count, cal_warning, cal_critical = db.session.query(
-        func.count(ModelInventory.id),
-        func.count(case((ModelInventory.status == "active", 1))),
-        func.count(case((ModelInventory.status == "under_review", 1))),
-        func.count(case((_active_filter, case((ModelInventory.scorecard_category == "Başvuru", 1))))),
-        func.count(case((_active_filter, case((ModelInventory.scorecard_category == "Davranış", 1))))),
-        func.count(case((_active_filter, case((ModelInventory.psi_flag == True, 1))))),
-        func.count(case((_active_filter, case((ModelInventory.calibration_status == "warning", 1))))),
-        func.count(case((_active_filter, case((ModelInventory.calibration_status == "critical", 1))))),
-    ).one()
-
-    # Single query for all development counts
-    total_projects, active_projects, completed_projects, dev_basvuru, dev_davranis = db.session.query(
-        func.count(DevelopmentProject.id),
-        func.count(case((DevelopmentProject.status == "in_progress", 1))),
-        func.count(case((DevelopmentProject.status == "completed", 1))),
-        func.count(case((
-            (DevelopmentProject.status == "in_progress") & (DevelopmentProject.scorecard_category == "Başvuru"), 1
-        ))),
-        func.count(case((
-            (DevelopmentProject.status == "in_progress") & (DevelopmentProject.scorecard_category == "Davranış"), 1
-        ))),
-    ).one()
-
-    overdue_stages = DevelopmentStage.query.filter(
-        DevelopmentStage.deadline < date.today(),
-        DevelopmentStage.status != "completed"
-    ).count()
-
-    response = jsonify({
-        "models": {
-            "total": total_models,
-            "active": active_models,
-            "under_review": under_review,
-            "basvuru": basvuru_count,
-            "davranis": davranis_count,
-            "psi_flag_count": psi_flag_count,
-            "cal_warning": cal_warning,
-            "cal_critical": cal_critical,
-        },
-        "development": {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "completed_projects": completed_projects,
-            "overdue_stages": overdue_stages,
-            "dev_basvuru": dev_basvuru,
-            "dev_davranis": dev_davranis,
-        },
-    })
-    response.headers["Cache-Control"] = "public, max-age=30"
-    return response
 
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=current_app.config["DASHBOARD_WORKERS"],
+            thread_name_prefix="dashboard",
+        )
+    return _executor
 
-@dashboard_bp.route("/gini-overview", methods=["GET"])
-def gini_overview():
-    """Aktif modellerin Gini değerleri — Başvuru ve Davranış olarak ayrı döner."""
-    models = ModelInventory.query.filter_by(status="active").all()
 
-    dev_projects = DevelopmentProject.query.filter_by(status="in_progress").all()
-    dev_set = {(p.scorecard_category, p.product_type) for p in dev_projects}
+def _run_in_app_context(app, fn):
+    # Her thread kendi app context'inde, dolayısıyla kendi session/bağlantısıyla çalışır
+    with app.app_context():
+        return fn()
 
+
+# ── Payload builders ──
+
+def _in_development():
+    """Modelin (kategori, ürün) çifti için devam eden geliştirme projesi var mı — EXISTS."""
+    project_exists = (
+        select(DevelopmentProject.id)
+        .where(
+            DevelopmentProject.status == "in_progress",
+            DevelopmentProject.scorecard_category == ModelInventory.scorecard_category,
+            or_(
+                DevelopmentProject.product_type == ModelInventory.product_type,
+                and_(DevelopmentProject.product_type.is_(None), ModelInventory.product_type.is_(None)),
+            ),
+        )
+        .exists()
+    )
+    # Oracle SELECT listesinde çıplak boolean kabul etmez
+    return case((project_exists, 1), else_=0).label("in_development")
+
+
+def _models_statement(statuses, columns):
+    return (
+        select(*columns, _in_development())
+        .where(ModelInventory.status.in_(statuses))
+        .order_by(ModelInventory.id)
+        .execution_options(yield_per=500)
+    )
+
+
+def _gini_overview_payload(rows):
+    """Satırlar akış halinde okunup doğrudan kategori kovalarına yazılır."""
     basvuru = []
     davranis = []
-    for m in models:
+    for m in rows:
         entry = {
             "model_id": m.id,
             "model_name": m.model_name,
@@ -100,115 +95,241 @@ def gini_overview():
             "gini_current": m.gini_current,
             "psi_flag": m.psi_flag or False,
             "calibration_status": m.calibration_status or "ok",
-            "in_development": (m.scorecard_category, m.product_type) in dev_set,
+            "in_development": bool(m.in_development),
         }
         if m.scorecard_category == "Başvuru":
             basvuru.append(entry)
         else:
             davranis.append(entry)
+    return {"basvuru": basvuru, "davranis": davranis}
 
-    response = jsonify({"basvuru": basvuru, "davranis": davranis})
-    response.headers["Cache-Control"] = "public, max-age=30"
-    return response
 
-
-@dashboard_bp.route("/development-progress", methods=["GET"])
-def development_progress():
-    """Owner bazında geliştirme ilerleme durumu."""
-    projects = DevelopmentProject.query.options(
-        selectinload(DevelopmentProject.stages)
-    ).filter_by(status="in_progress").all()
-    return jsonify([{
+def _development_progress_payload():
+    # İlerleme gruplu aggregate ile hesaplanır — aşama nesnesi yüklenmez
+    progress = stage_progress_subquery()
+    rows = db.session.execute(
+        select(
+            DevelopmentProject.id,
+            DevelopmentProject.project_name,
+            DevelopmentProject.owner,
+            DevelopmentProject.scorecard_category,
+            DevelopmentProject.product_type,
+            DevelopmentProject.priority,
+            DevelopmentProject.target_end_date,
+            progress.c.stage_total,
+            progress.c.stage_completed,
+        )
+        .outerjoin(progress, progress.c.project_id == DevelopmentProject.id)
+        .where(DevelopmentProject.status == "in_progress")
+        .order_by(DevelopmentProject.id)
+    )
+    return [{
         "project_id": p.id,
         "project_name": p.project_name,
         "owner": p.owner,
         "scorecard_category": p.scorecard_category,
         "product_type": p.product_type,
-        "progress": p._calculate_progress(),
+        "progress": progress_percent(p.stage_completed, p.stage_total),
         "priority": p.priority,
         "target_end_date": p.target_end_date.isoformat() if p.target_end_date else None,
-    } for p in projects])
+    } for p in rows]
+
+
+def _summary_payload():
+    return summary_service.get_summary().to_dict()
+
+
+def _overview_rows():
+    payload = _gini_overview_payload(
+        db.session.execute(_models_statement(("active",), _OVERVIEW_COLUMNS))
+    )
+    return payload["basvuru"] + payload["davranis"]
+
+
+# ── Live stream (SSE) ──
+
+# (event adı, bağlı tablolar, payload üretici, satır anahtarı — None ise değer bütün olarak gönderilir)
+_STREAM_FEEDS = (
+    ("summary", ("model_inventory", "development_project", "development_stage"), _summary_payload, None),
+    ("alerts", ("alert_state", "model_inventory"), alert_service.list_alert_states, "model_id"),
+    ("progress", ("development_project", "development_stage"), _development_progress_payload, "project_id"),
+    ("overview", ("model_inventory", "development_project"), _overview_rows, "model_id"),
+)
+_STREAM_TABLES = tuple(sorted({table for _, tables, _, _ in _STREAM_FEEDS for table in tables}))
+
+# Aynı worker'daki stream'ler aynı versiyon için payload'ı bir kez hesaplar
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def _snapshot(name, fingerprint, build):
+    with _snapshots_lock:
+        cached = _snapshots.get(name)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    value = build()
+    with _snapshots_lock:
+        _snapshots[name] = (fingerprint, value)
+    return value
+
 
+def _diff_rows(previous, current, key):
+    """Anahtara göre değişen/yeni satırlar ve silinen anahtarlar."""
+    old = {row[key]: row for row in previous}
+    new_keys = {row[key] for row in current}
+    return {
+        "upserted": [row for row in current if old.get(row[key]) != row],
+        "removed": [k for k in old if k not in new_keys],
+    }
 
-_MONTHLY_RE = re.compile(r'^\d{4}-\d{2}$')
+
+def _stream_events(state):
+    """
+    Bağımlı tabloları değişen feed'leri yeniden hesaplayıp önceki değerle karşılaştır.
+    state: {feed: (fingerprint, payload)} — ilk çağrıda doldurulur, event üretilmez.
+    """
+    versions = current_versions(_STREAM_TABLES)
+    today = date.today()
+    events = []
+    for name, tables, build, key in _STREAM_FEEDS:
+        fingerprint = tuple(versions[table][0] for table in tables)
+        if name == "summary":
+            fingerprint += (today,)  # geciken aşama sayısı güne bağlı
+        previous = state.get(name)
+        if previous is not None and previous[0] == fingerprint:
+            continue
+        payload = _snapshot(name, fingerprint, build)
+        state[name] = (fingerprint, payload)
+        if previous is None:
+            continue
+        if key is None:
+            if payload != previous[1]:
+                events.append((name, payload))
+        else:
+            delta = _diff_rows(previous[1], payload, key)
+            if delta["upserted"] or delta["removed"]:
+                events.append((name, delta))
+    return events
+
+
+# ── Endpoints ──
+
+@dashboard_bp.route("/summary", methods=["GET"])
+@conditional("model_inventory", "development_project", "development_stage",
+             max_age=30, extra=date.today)  # geciken aşama sayısı güne bağlı
+def get_summary():
+    """Dashboard özet istatistikleri - mevcut ve geliştirilen skorkartlar ayrımıyla."""
+    # Sayaçlar yazım anında güncellenir (services/summary.py) — burada tek satır okunur
+    return jsonify(_summary_payload())
+
+
+@dashboard_bp.route("/gini-overview", methods=["GET"])
+@conditional("model_inventory", "development_project", max_age=30)
+def gini_overview():
+    """Aktif modellerin Gini değerleri — Başvuru ve Davranış olarak ayrı döner."""
+    rows = db.session.execute(_models_statement(("active",), _OVERVIEW_COLUMNS))
+    return jsonify(_gini_overview_payload(rows))
+
+
+@dashboard_bp.route("/development-progress", methods=["GET"])
+@conditional("development_project", "development_stage")
+def development_progress():
+    """Owner bazında geliştirme ilerleme durumu."""
+    return jsonify(_development_progress_payload())
 
 
 @dashboard_bp.route("/gini-alerts", methods=["GET"])
+@conditional("alert_state", "model_inventory", max_age=60)
 def gini_alerts():
     """
     Gini alert sistemi:
     - Başvuru modelleri: güncel gini < 0.50 VEYA son 3 ayda ≥5pp ardışık sapma
     - Davranış modelleri: güncel gini < 0.55 VEYA son 3 ayda ≥5pp ardışık sapma
     - PSI flag bağımsız olarak ayrıca dönülür.
+    Durumlar yazım anında hesaplanıp alert_state tablosunda tutulur (services/alerts.py).
     """
-    models = ModelInventory.query.options(
-        selectinload(ModelInventory.gini_history)
-    ).filter(ModelInventory.status.in_(["active", "under_review"])).all()
+    return jsonify(alert_service.list_alert_states())
 
-    alerts = []
-    for model in models:
-        if model.gini_development is None:
-            continue
 
-        # Son 3 aylık kayıt kontrolü
-        monthly = sorted(
-            [g for g in model.gini_history if _MONTHLY_RE.match(g.period)],
-            key=lambda g: g.period,
-            reverse=True,
-        )
+@dashboard_bp.route("/bootstrap", methods=["GET"])
+@conditional("model_inventory", "development_project", "development_stage", "alert_state",
+             max_age=30, extra=date.today)
+def bootstrap():
+    """
+    Dashboard'un ilk yüklemesi için tek istek: summary, gini-overview,
+    development-progress ve gini-alerts birlikte döner.
+    Aktif modeller bir kez yüklenir; bağımsız sorgular thread havuzunda ayrı
+    bağlantılarla paralel çalışır.
+    """
+    app = current_app._get_current_object()
+    executor = _get_executor()
+    summary = executor.submit(_run_in_app_context, app, _summary_payload)
+    progress = executor.submit(_run_in_app_context, app, _development_progress_payload)
+    alert_states = executor.submit(_run_in_app_context, app, alert_service.load_alert_states)
 
-        threshold = GINI_ALERT_THRESHOLD.get(model.scorecard_category, 0.50)
+    models = db.session.execute(
+        _models_statement(alert_service.ALERT_STATUSES, _OVERVIEW_COLUMNS + _ALERT_COLUMNS)
+    ).all()
+    models_by_id = {m.id: m for m in models}
 
-        gini_alert = False
-        alert_reason = []
-        diffs = []
-        last3 = []
+    return jsonify({
+        "summary": summary.result(),
+        "gini_overview": _gini_overview_payload(m for m in models if m.status == "active"),
+        "development_progress": progress.result(),
+        "gini_alerts": [
+            state.to_dict(models_by_id[state.model_id])
+            for state in alert_states.result() if state.model_id in models_by_id
+        ],
+    })
 
-        # Ardışık sapma kuralı
-        if len(monthly) >= CONSECUTIVE_MONTHS:
-            last3 = monthly[:CONSECUTIVE_MONTHS]
-            diffs = [model.gini_development - g.gini_value for g in last3]
-            if all(abs(d) >= MIN_GINI_DIFF for d in diffs):
-                gini_alert = True
-                alert_reason.append("consecutive_deviation")
 
-        # Eşik kontrolü (güncel gini < threshold)
-        if model.gini_current is not None and model.gini_current < threshold:
-            gini_alert = True
-            alert_reason.append("threshold_breach")
+@dashboard_bp.route("/stream", methods=["GET"])
+def stream():
+    """
+    Canlı dashboard güncellemeleri (text/event-stream).
+    Bağlantı açıldığında mevcut durum referans alınır; sonrasında yalnızca değişiklikler
+    gönderilir: summary (tam sayaçlar), alerts / progress / overview
+    ({"upserted": [...], "removed": [id, ...]}).
+    İlk veri /bootstrap ile alınmalıdır.
 
-        if not gini_alert and not model.psi_flag:
-            continue
+    Her açık stream bir gthread thread'ini tutar; worker başına en fazla
+    DASHBOARD_STREAM_MAX_CONNECTIONS (varsayılan: GUNICORN_THREADS − DASHBOARD_API_THREADS)
+    stream açılır. Sınır dolarsa 503 (Retry-After) döner; istemci stream'i yeniden
+    deneyene kadar /bootstrap'ı ETag ile yoklar.
+    """
+    app = current_app._get_current_object()
+    poll_seconds = app.config["DASHBOARD_STREAM_POLL_SECONDS"]
+    max_seconds = app.config["DASHBOARD_STREAM_MAX_SECONDS"]
+    if not stream_slots.acquire(app.config["DASHBOARD_STREAM_MAX_CONNECTIONS"]):
+        response = jsonify({"error": "Canlı bağlantı sınırı dolu", "retry": max_seconds})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(max_seconds)
+        return response
+
+    def generate():
+        state = {}
+        # Her kontrol kendi app context'inde: bağlantı beklemeler arasında pool'a döner
+        with app.app_context():
+            _stream_events(state)
+        seen = event_broker.sequence
+        # Sunucu bağlantıyı max_seconds sonunda kapatır; EventSource bu süre sonra yeniden bağlanır
+        yield f"retry: {poll_seconds * 1000}\n\n"
 
-        direction = None
-        if diffs:
-            direction = "drop" if diffs[0] > 0 else "rise"
-
-        alerts.append({
-            "model_id": model.id,
-            "model_name": model.model_name,
-            "scorecard_category": model.scorecard_category,
-            "product_type": model.product_type,
-            "status": model.status,
-            "gini_development": model.gini_development,
-            "gini_current": model.gini_current,
-            "gini_threshold": threshold,
-            "last3_periods": [g.period for g in last3],
-            "last3_values": [round(g.gini_value, 4) for g in last3],
-            "last3_diffs": [round(d, 4) for d in diffs],
-            "direction": direction,
-            "alert_reason": alert_reason,
-            "gini_alert": gini_alert,
-            "psi_flag": model.psi_flag or False,
-            "alert_work_started": model.alert_work_started or False,
-        })
-
-    # Önce Gini alert olanlar, sonra sadece PSI flag olanlar; sapma büyüklüğüne göre
-    alerts.sort(key=lambda a: (
-        0 if a["gini_alert"] else 1,
-        -(abs(a["last3_diffs"][0]) if a["last3_diffs"] else 0),
-    ))
-
-    response = jsonify(alerts)
-    response.headers["Cache-Control"] = "public, max-age=60"
+        started = time.monotonic()
+        while time.monotonic() - started < max_seconds:
+            seen = event_broker.wait(seen, poll_seconds)
+            with app.app_context():
+                events = _stream_events(state)
+            if events:
+                for name, data in events:
+                    yield sse_message(name, data)
+            else:
+                yield sse_comment("keepalive")
+
+    response = Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx/OpenShift router tamponlamasın
+    })
+    # Generator hiç başlamasa da (istemci hemen koparsa) sunucu close() çağırır
+    response.call_on_close(stream_slots.release)
     return response
@@ -2,7 +2,9 @@ from datetime import date, datetime, timezone
 from flask import Blueprint, request, jsonify
 from sqlalchemy.orm import selectinload
 from models import db
-from models.development import DevelopmentProject, DevelopmentStage, StageTask
+from models.development import DevelopmentProject, DevelopmentStage, StageTask, stage_progress_subquery
+from services.http_cache import conditional
+from services.pagination import InvalidCursor, paginate_listing
 
 development_bp = Blueprint("development", __name__)
 
@@ -17,12 +19,24 @@ def _stages_loader():
 
 
 @development_bp.route("/projects", methods=["GET"])
+@conditional("development_project", "development_stage", "stage_task")
 def list_projects():
-    """Tüm geliştirme projelerini listele."""
-    query = DevelopmentProject.query.options(
-        _stages_loader(),
-        selectinload(DevelopmentProject.stages).selectinload(DevelopmentStage.tasks),
-    )
+    """Tüm geliştirme projelerini listele.
+
+    include_stages=false verilirse aşama ağacı dönmez; ilerleme ve aşama sayıları
+    SQL'de gruplu aggregate ile hesaplanır (aşama nesnesi yüklenmez).
+    """
+    include_stages = request.args.get("include_stages", "true").lower() != "false"
+    if include_stages:
+        query = DevelopmentProject.query.options(
+            _stages_loader(),
+            selectinload(DevelopmentProject.stages).selectinload(DevelopmentStage.tasks),
+        )
+    else:
+        progress = stage_progress_subquery()
+        query = db.session.query(
+            DevelopmentProject, progress.c.stage_total, progress.c.stage_completed
+        ).outerjoin(progress, progress.c.project_id == DevelopmentProject.id)
 
     owner = request.args.get("owner")
     status = request.args.get("status")
@@ -38,23 +52,22 @@ def list_projects():
     if scorecard_category:
         query = query.filter(DevelopmentProject.scorecard_category == scorecard_category)
 
-    query = query.order_by(DevelopmentProject.updated_at.desc())
-
-    # Optional pagination
-    page = request.args.get("page", type=int)
-    per_page = request.args.get("per_page", 20, type=int)
-    if page is not None:
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        return jsonify({
-            "items": [p.to_dict(include_stages=True) for p in pagination.items],
-            "total": pagination.total,
-            "page": pagination.page,
-            "per_page": pagination.per_page,
-            "pages": pagination.pages,
-        })
-
-    projects = query.all()
-    return jsonify([p.to_dict(include_stages=True) for p in projects])
+    def serialize(item):
+        if include_stages:
+            return item.to_dict(include_stages=True)
+        project, stage_total, stage_completed = item
+        return project.to_dict(stage_counts=(stage_total or 0, stage_completed or 0))
+
+    # Sayfalama: cursor/limit (keyset), page/per_page (offset) ya da tüm liste (LIST_UNPAGED_MAX'a kadar)
+    try:
+        payload = paginate_listing(
+            query, DevelopmentProject.updated_at, DevelopmentProject.id,
+            tables=("development_project",), serialize=serialize,
+            row_key=None if include_stages else (lambda row: row[0]),
+        )
+    except InvalidCursor as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(payload)
 
 
 @development_bp.route("/projects", methods=["POST"])
@@ -84,6 +97,7 @@ def create_project():
 
 
 @development_bp.route("/projects/<int:project_id>", methods=["GET"])
+@conditional("development_project", "development_stage", "stage_task")
 def get_project(project_id):
     """Proje detaylarını aşamalarıyla birlikte getir."""
     project = DevelopmentProject.query.options(
@@ -245,6 +259,7 @@ def delete_task(stage_id, task_id):
 # ── Owner listesi ──
 
 @development_bp.route("/owners", methods=["GET"])
+@conditional("development_project")
 def list_owners():
     """Tüm benzersiz owner'ları listele."""
     owners = db.session.query(DevelopmentProject.owner).distinct().all()
@@ -0,0 +1,158 @@
+"""
+Tablo dışa aktarma: CSV, NDJSON ve XLSX.
+
+Satırlar `yield_per` ile sunucu tarafı cursor üzerinden parça parça okunur ve
+generator yanıtla yazılır; bellek kullanımı tablo boyutundan bağımsızdır, ilk byte
+ilk parça okunur okunmaz gider. XLSX bir zip arşivi olduğundan bitmeden gönderilemez:
+openpyxl write-only modunda geçici dosyaya yazılır, ardından dosya parça parça akıtılır.
+"""
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import select
+from models import db
+from models.scorecard import ModelInventory, GiniHistory, ModelVariable
+from models.development import DevelopmentProject
+from services.tabular import to_bool, to_date, to_float, to_int
+
+export_bp = Blueprint("export", __name__)
+
+YIELD_PER = 1000
+_FILE_CHUNK = 64 * 1024
+
+# Veri seti -> (model, eşitlik filtresi olarak kabul edilen kolonlar)
+DATASETS = {
+    "models": (ModelInventory, ("scorecard_category", "product_type", "status", "owner")),
+    "gini_history": (GiniHistory, ("model_id",)),
+    "model_variables": (ModelVariable, ("model_id",)),
+    "projects": (DevelopmentProject, ("scorecard_category", "status")),
+}
+
+# Filtre değerleri kolon tipine çevrilir: hatalı değer stream başlamadan 400 döner
+# (Oracle tip hatası aksi halde 200 başlıkları gittikten sonra yanıtı yarıda keser)
+_CONVERTERS = {int: to_int, float: to_float, bool: to_bool, date: to_date}
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def _csv_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _filter_value(column, raw):
+    convert = _CONVERTERS.get(column.type.python_type)
+    if convert is None:
+        return raw
+    value = convert(raw)
+    if value is None:
+        raise ValueError("Değer boş olamaz")
+    return value
+
+
+def _iter_rows(statement):
+    """Satırları YIELD_PER'lık parçalar halinde oku (sunucu tarafı cursor)."""
+    result = db.session.execute(statement.execution_options(yield_per=YIELD_PER))
+    for partition in result.partitions():
+        yield partition
+
+
+def _csv_stream(columns, statement):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # Excel'in UTF-8 olarak açması için BOM
+    writer.writerow(columns)
+    for partition in _iter_rows(statement):
+        writer.writerows([_csv_value(v) for v in row] for row in partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_stream(columns, statement):
+    for partition in _iter_rows(statement):
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+            for row in partition
+        )
+
+
+def _xlsx_stream(workbook_cls, dataset, columns, statement):
+    workbook = workbook_cls(write_only=True)
+    sheet = workbook.create_sheet(dataset)
+    sheet.append(columns)
+    for partition in _iter_rows(statement):
+        for row in partition:
+            # Excel saat dilimi bilgisi tutmaz
+            sheet.append([v.replace(tzinfo=None) if isinstance(v, datetime) else v for v in row])
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(_FILE_CHUNK)
+            if not chunk:
+                break
+            yield chunk
+
+
+@export_bp.route("/<dataset>", methods=["GET"])
+def export(dataset):
+    """
+    Tabloyu dışa aktar: /api/export/models?format=csv
+    Veri setleri: models, gini_history, model_variables, projects.
+    format: csv (varsayılan), ndjson, xlsx. Kolon eşitlik filtreleri parametre olarak verilebilir
+    (ör. gini_history?model_id=3, models?status=active).
+    """
+    if dataset not in DATASETS:
+        return jsonify({"error": f"Bilinmeyen veri seti: {dataset}"}), 404
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Desteklenmeyen biçim: {fmt}"}), 400
+
+    model, filter_fields = DATASETS[dataset]
+    table = model.__table__
+    columns = [column.name for column in table.columns]
+    statement = select(*table.columns).order_by(table.c.id)
+    for field in filter_fields:
+        raw = request.args.get(field)
+        if raw is None:
+            continue
+        try:
+            value = _filter_value(table.c[field], raw)
+        except ValueError as exc:
+            return jsonify({"error": f"{field}: {exc}"}), 400
+        statement = statement.where(table.c[field] == value)
+
+    if fmt == "csv":
+        body = _csv_stream(columns, statement)
+    elif fmt == "ndjson":
+        body = _ndjson_stream(columns, statement)
+    else:
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            return jsonify({"error": "XLSX dışa aktarma için openpyxl kurulu olmalıdır"}), 501
+        body = _xlsx_stream(Workbook, dataset, columns, statement)
+
+    filename = f"{dataset}-{date.today().isoformat()}.{fmt}"
+    return Response(stream_with_context(body), content_type=FORMATS[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",
+    })
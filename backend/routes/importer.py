@@ -0,0 +1,45 @@
+from flask import Blueprint, request, jsonify
+from services.importer import ENTITIES, run_import
+from services.tabular import detect_format, iter_records, iter_sheet, open_workbook
+
+importer_bp = Blueprint("importer", __name__)
+
+
+@importer_bp.route("/", methods=["POST"], strict_slashes=False)
+def import_inventory():
+    """
+    Envanter dosyası yükle (multipart "file" ya da ham gövde) ve doğal anahtarla upsert et.
+    XLSX: models, variables, rollout adlı sayfalar (hangileri varsa) bu sırayla işlenir.
+    CSV / NDJSON ya da tek sayfa: entity= (models, variables, rollout) zorunludur.
+    dry_run=1: hiçbir şey yazmadan yapılacak değişiklikleri raporla.
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt = detect_format(
+        upload.mimetype if upload else request.mimetype,
+        request.args.get("format"),
+        upload.filename if upload else None,
+    )
+    if fmt is None:
+        return jsonify({"error": "Desteklenmeyen biçim: xlsx, csv ya da ndjson gönderin"}), 415
+
+    entity = request.args.get("entity")
+    if entity is not None and entity not in ENTITIES:
+        return jsonify({"error": f"Bilinmeyen entity: {entity}"}), 400
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+
+    if fmt == "xlsx" and entity is None:
+        try:
+            workbook = open_workbook(stream)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        sheets = {sheet.title.strip().lower(): sheet for sheet in workbook.worksheets}
+        sources = [(name, iter_sheet(sheets[name])) for name in ENTITIES if name in sheets]
+        if not sources:
+            return jsonify({"error": "Çalışma kitabında models, variables ya da rollout sayfası yok"}), 400
+    elif entity is None:
+        return jsonify({"error": "entity parametresi zorunludur"}), 400
+    else:
+        sources = [(entity, iter_records(stream, fmt))]
+
+    return jsonify(run_import(sources, dry_run))
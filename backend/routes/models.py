@@ -1,9 +1,17 @@
-import io
 from datetime import date
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from models import db
 from models.scorecard import ModelInventory, TechnicalGuide, ValidationReport, GiniHistory, ModelRollout, ModelVariable
+from services.alerts import ALERT_FIELDS, refresh_alert_state
+from services.bulk_update import BulkUpdateError, bulk_update_models, filtered_ids, validate_changes
+from services.gini_ingest import ingest_gini_records
+from services.http_cache import conditional
+from services.pagination import InvalidCursor, paginate_listing
+from services.report_files import attach_upload, release_file, send_report_file
+from services.tabular import detect_format, iter_records
+from services.timeseries import GRANULARITIES, build_series
 
 models_bp = Blueprint("models", __name__)
 
@@ -11,9 +19,25 @@ models_bp = Blueprint("models", __name__)
 # ── Model Inventory CRUD ──
 
 @models_bp.route("/", methods=["GET"])
+@conditional("model_inventory")
 def list_models():
-    """Tüm modelleri listele, filtreleme ve sayfalama destekli."""
-    query = ModelInventory.query
+    """Tüm modelleri listele, filtreleme ve sayfalama (keyset cursor ya da page) destekli.
+    Sayfa parametresi yoksa LIST_UNPAGED_MAX kayda kadar düz dizi, üstünde ilk cursor sayfası döner.
+
+    fields=model_name,status,... ve/veya view=summary verilirse yalnızca bu kolonlar
+    SELECT edilip döner (id ve updated_at her zaman eklenir).
+    """
+    try:
+        fields = _requested_fields()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    if fields is None:
+        query = ModelInventory.query
+        serialize = lambda m: m.to_dict()  # noqa: E731
+    else:
+        query = db.session.query(*(getattr(ModelInventory, name) for name in fields))
+        serialize = lambda row: ModelInventory.fields_to_dict(row, fields)  # noqa: E731
 
     # Filters
     scorecard_category = request.args.get("scorecard_category")
@@ -31,24 +55,40 @@ def list_models():
     if owner:
         query = query.filter(ModelInventory.owner == owner)
     if search:
+        # Ad içinde alt metin araması; çok alanlı tam metin arama /api/search'te
         query = query.filter(ModelInventory.model_name.ilike(f"%{search}%"))
 
-    query = query.order_by(ModelInventory.updated_at.desc())
+    # Sayfalama: cursor/limit (keyset), page/per_page (offset) ya da tüm liste (LIST_UNPAGED_MAX'a kadar)
+    try:
+        payload = paginate_listing(
+            query, ModelInventory.updated_at, ModelInventory.id,
+            tables=("model_inventory",), serialize=serialize,
+        )
+    except InvalidCursor as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(payload)
+
 
-    # Pagination (optional: omit page param to get all results for backward compat)
-    page = request.args.get("page", type=int)
-    per_page = request.args.get("per_page", 20, type=int)
-    if page is not None:
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        return jsonify({
-            "items": [m.to_dict() for m in pagination.items],
-            "total": pagination.total,
-            "page": pagination.page,
-            "per_page": pagination.per_page,
-            "pages": pagination.pages,
-        })
+def _requested_fields():
+    """fields= / view= parametrelerinden kolon listesi; None ise tam gösterim (boş fields= dahil)."""
+    view = request.args.get("view")
+    fields = [name.strip() for name in request.args.get("fields", "").split(",") if name.strip()]
+    if (not view or view == "full") and not fields:
+        return None
 
-    return jsonify([m.to_dict() for m in query.all()])
+    names = []
+    if view and view != "full":
+        if view not in ModelInventory.LIST_VIEWS:
+            raise ValueError(f"Bilinmeyen view: {view}")
+        names.extend(ModelInventory.LIST_VIEWS[view])
+    names.extend(fields)
+
+    columns = ModelInventory.__table__.c
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"Bilinmeyen alan: {', '.join(unknown)}")
+    # id kimlik, updated_at keyset cursor'u için her zaman gerekir
+    return list(dict.fromkeys(["id", *names, "updated_at"]))
 
 
 @models_bp.route("/", methods=["POST"])
@@ -84,27 +124,76 @@ def create_model():
         calibration_status=data.get("calibration_status", "ok"),
     )
     db.session.add(model)
+    db.session.flush()
+    refresh_alert_state([model.id])
     db.session.commit()
     return jsonify(model.to_dict()), 201
 
 
+# Detay ilişkileri: ad -> (ilişki, sıralama anahtarı). get_model ve batch aynı gösterimi kullanır.
+DETAIL_RELATIONS = {
+    "technical_details": (ModelInventory.technical_details, None),
+    "validation_reports": (ModelInventory.validation_reports, None),
+    "gini_history": (ModelInventory.gini_history, None),
+    "rollout_stages": (ModelInventory.rollout_stages, lambda x: x["rollout_percentage"]),
+    "model_variables": (ModelInventory.model_variables, lambda x: (x["importance_rank"] or 9999)),
+}
+BATCH_MAX_IDS = 200
+
+
+def _detail_dict(model, relations):
+    data = model.to_dict()
+    for name in relations:
+        sort_key = DETAIL_RELATIONS[name][1]
+        items = [item.to_dict() for item in getattr(model, name)]
+        data[name] = sorted(items, key=sort_key) if sort_key else items
+    return data
+
+
 @models_bp.route("/<int:model_id>", methods=["GET"])
+@conditional("model_inventory", "technical_guide", "validation_report",
+             "gini_history", "model_rollout", "model_variable")
 def get_model(model_id):
     """Tek bir modelin detaylarını getir."""
     model = ModelInventory.query.options(
-        selectinload(ModelInventory.technical_details),
-        selectinload(ModelInventory.validation_reports),
-        selectinload(ModelInventory.gini_history),
-        selectinload(ModelInventory.rollout_stages),
-        selectinload(ModelInventory.model_variables),
+        *(selectinload(relation) for relation, _ in DETAIL_RELATIONS.values())
     ).get_or_404(model_id)
-    data = model.to_dict()
-    data["technical_details"] = [t.to_dict() for t in model.technical_details]
-    data["validation_reports"] = [v.to_dict() for v in model.validation_reports]
-    data["gini_history"] = [g.to_dict() for g in model.gini_history]
-    data["rollout_stages"] = sorted([r.to_dict() for r in model.rollout_stages], key=lambda x: x["rollout_percentage"])
-    data["model_variables"] = sorted([v.to_dict() for v in model.model_variables], key=lambda x: (x["importance_rank"] or 9999))
-    return jsonify(data)
+    return jsonify(_detail_dict(model, DETAIL_RELATIONS))
+
+
+@models_bp.route("/batch", methods=["GET"])
+@conditional("model_inventory", "technical_guide", "validation_report",
+             "gini_history", "model_rollout", "model_variable")
+def get_models_batch():
+    """
+    Birden çok modelin detayı tek istekte: ids=1,2,3&include=gini_history,model_variables.
+    Yalnızca istenen ilişkiler yüklenir (ilişki başına tek IN sorgusu); include=all hepsi.
+    Dönüş: {"models": {id: model}, "missing": [bulunamayan id'ler]}.
+    """
+    try:
+        ids = list(dict.fromkeys(int(x) for x in request.args.get("ids", "").split(",") if x.strip()))
+    except ValueError:
+        return jsonify({"error": "ids virgülle ayrılmış tam sayılar olmalıdır"}), 400
+    if not ids:
+        return jsonify({"error": "ids zorunludur"}), 400
+    if len(ids) > BATCH_MAX_IDS:
+        return jsonify({"error": f"En fazla {BATCH_MAX_IDS} model istenebilir"}), 400
+
+    include = [name.strip() for name in request.args.get("include", "").split(",") if name.strip()]
+    if include == ["all"]:
+        include = list(DETAIL_RELATIONS)
+    unknown = [name for name in include if name not in DETAIL_RELATIONS]
+    if unknown:
+        return jsonify({"error": f"Bilinmeyen include: {', '.join(unknown)}"}), 400
+
+    models = ModelInventory.query.filter(ModelInventory.id.in_(ids)).options(
+        *(selectinload(DETAIL_RELATIONS[name][0]) for name in include)
+    ).all()
+    found = {model.id: model for model in models}
+    return jsonify({
+        "models": {str(model_id): _detail_dict(found[model_id], include) for model_id in ids if model_id in found},
+        "missing": [model_id for model_id in ids if model_id not in found],
+    })
 
 
 @models_bp.route("/<int:model_id>", methods=["PUT"])
@@ -126,22 +215,68 @@ def update_model(model_id):
         if date_field in data:
             setattr(model, date_field, _parse_date(data[date_field]))
 
+    if ALERT_FIELDS.intersection(data):
+        refresh_alert_state([model.id])
     db.session.commit()
     return jsonify(model.to_dict())
 
 
+@models_bp.route("/bulk", methods=["PATCH"])
+def bulk_update():
+    """
+    Operasyonel alanları (status, psi_flag, calibration_status, alert_work_started)
+    birden çok modelde tek transaction'da güncelle. Gövde iki biçimden biri:
+      {"updates": [{"id": 1, "changes": {...}}, ...]}
+      {"filter": {"ids": [...], "scorecard_category": ..., ...}, "changes": {...}}
+    Bir id bulunamazsa ya da değişiklik geçersizse hiçbir şey yazılmaz.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        if "updates" in data:
+            if not isinstance(data["updates"], list):
+                raise BulkUpdateError("updates bir liste olmalıdır")
+            changes_by_id = {}
+            for item in data["updates"]:
+                if not isinstance(item, dict) or not isinstance(item.get("id"), int) or isinstance(item["id"], bool):
+                    raise BulkUpdateError("Her güncelleme {id, changes} olmalıdır")
+                changes_by_id.setdefault(item["id"], {}).update(validate_changes(item.get("changes")))
+        elif "filter" in data:
+            changes = validate_changes(data.get("changes"))
+            changes_by_id = {model_id: changes for model_id in filtered_ids(data["filter"])}
+        else:
+            raise BulkUpdateError("updates ya da filter + changes zorunludur")
+        ids = bulk_update_models(changes_by_id) if changes_by_id else []
+    except BulkUpdateError as exc:
+        db.session.rollback()
+        body = {"error": str(exc)}
+        if exc.missing:
+            body["missing"] = exc.missing
+            return jsonify(body), 404
+        return jsonify(body), 400
+    db.session.commit()
+    return jsonify({"updated": len(ids), "ids": ids})
+
+
 @models_bp.route("/<int:model_id>", methods=["DELETE"])
 def delete_model(model_id):
     """Model sil."""
     model = db.get_or_404(ModelInventory, model_id)
+    file_hashes = db.session.execute(
+        select(ValidationReport.file_hash).where(
+            ValidationReport.model_id == model_id, ValidationReport.file_hash.isnot(None)
+        )
+    ).scalars().all()
     db.session.delete(model)
     db.session.commit()
+    for file_hash in set(file_hashes):
+        release_file(file_hash)
     return "", 204
 
 
 # ── Technical Guide ──
 
 @models_bp.route("/<int:model_id>/technical", methods=["GET"])
+@conditional("technical_guide")
 def list_technical(model_id):
     guides = TechnicalGuide.query.filter_by(model_id=model_id).order_by(TechnicalGuide.order_index).all()
     return jsonify([g.to_dict() for g in guides])
@@ -186,6 +321,7 @@ def delete_technical(model_id, guide_id):
 # ── Validation Reports ──
 
 @models_bp.route("/<int:model_id>/validations", methods=["GET"])
+@conditional("validation_report")
 def list_validations(model_id):
     reports = ValidationReport.query.filter_by(model_id=model_id).order_by(ValidationReport.report_date.desc()).all()
     return jsonify([r.to_dict() for r in reports])
@@ -212,9 +348,8 @@ def create_validation(model_id):
             notes=notes,
         )
         if file_obj:
-            report.file_data = file_obj.read()
-            report.file_mimetype = file_obj.mimetype
-            report.file_path = file_obj.filename
+            # Dosya blob deposuna parça parça akıtılır, belleğe okunmaz
+            attach_upload(report, file_obj)
     else:
         data = request.get_json()
         report = ValidationReport(
@@ -233,32 +368,28 @@ def create_validation(model_id):
 
 @models_bp.route("/<int:model_id>/validations/<int:report_id>/download", methods=["GET"])
 def download_validation(model_id, report_id):
-    """Validasyon raporunu indir."""
+    """Validasyon raporunu indir (Range, ETag = içerik özeti)."""
     report = db.get_or_404(ValidationReport, report_id)
-    if not report.file_data:
+    response = send_report_file(report)
+    if response is None:
         return jsonify({"error": "Dosya bulunamadı"}), 404
-
-    mimetype = report.file_mimetype or "application/octet-stream"
-    filename = report.file_path or report.report_name
-    return send_file(
-        io.BytesIO(report.file_data),
-        mimetype=mimetype,
-        as_attachment=True,
-        download_name=filename,
-    )
+    return response
 
 
 @models_bp.route("/<int:model_id>/validations/<int:report_id>", methods=["DELETE"])
 def delete_validation(model_id, report_id):
     report = db.get_or_404(ValidationReport, report_id)
+    file_hash = report.file_hash
     db.session.delete(report)
     db.session.commit()
+    release_file(file_hash)
     return "", 204
 
 
 # ── Gini History ──
 
 @models_bp.route("/<int:model_id>/gini-history", methods=["GET"])
+@conditional("gini_history")
 def list_gini_history(model_id):
     # Tarih filtresi
     period_from = request.args.get("period_from")
@@ -272,6 +403,34 @@ def list_gini_history(model_id):
     return jsonify([r.to_dict() for r in records])
 
 
+@models_bp.route("/<int:model_id>/gini-history/series", methods=["GET"])
+@conditional("gini_history")
+def gini_series(model_id):
+    """
+    Grafik için Gini zaman serisi (kolon bazlı: paralel diziler).
+    Parametreler: granularity (month|quarter|year), window (hareketli pencere, dönem),
+    points (LTTB ile indirilecek nokta sayısı), period_from, period_to.
+    """
+    db.get_or_404(ModelInventory, model_id)
+    granularity = request.args.get("granularity", "month")
+    if granularity not in GRANULARITIES:
+        return jsonify({"error": f"Geçersiz granularity: {granularity}"}), 400
+    window = min(max(request.args.get("window", 3, type=int), 1), 60)
+    points = request.args.get("points", type=int)
+    rows = db.session.execute(
+        select(GiniHistory.period, GiniHistory.gini_value, GiniHistory.target_ratio, GiniHistory.sample_size)
+        .where(GiniHistory.model_id == model_id)
+    ).all()
+    try:
+        series = build_series(
+            rows, granularity, window, points,
+            request.args.get("period_from"), request.args.get("period_to"),
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"model_id": model_id, **series})
+
+
 @models_bp.route("/<int:model_id>/gini-history", methods=["POST"])
 def create_gini_record(model_id):
     db.get_or_404(ModelInventory, model_id)
@@ -285,16 +444,35 @@ def create_gini_record(model_id):
         notes=data.get("notes"),
     )
     db.session.add(record)
+    db.session.flush()
+    refresh_alert_state([model_id])
     db.session.commit()
     return jsonify(record.to_dict()), 201
 
 
+@models_bp.route("/gini-history/bulk", methods=["POST"])
+def bulk_gini_history():
+    """
+    Birden çok model için Gini kayıtlarını tek istekte yükle (CSV, NDJSON ya da XLSX gövde).
+    Kolonlar: model_id, period, gini_value, target_ratio, sample_size, notes.
+    Mevcut (model_id, period) kaydı satırdaki değerlerle değiştirilir, yoksa eklenir;
+    hatalı satırlar raporlanır.
+    Biçim Content-Type'tan (text/csv, application/x-ndjson, xlsx) ya da format= parametresinden alınır.
+    """
+    fmt = detect_format(request.mimetype, request.args.get("format"))
+    if fmt is None:
+        return jsonify({"error": "Desteklenmeyen biçim: text/csv, application/x-ndjson ya da xlsx gönderin"}), 415
+    report = ingest_gini_records(iter_records(request.stream, fmt))
+    return jsonify(report)
+
+
 # NOT: Gini geçmişi kayıtları silinmez (feedback gereği)
 
 
 # ── Model Rollout (İmplementasyon Kademeleri) ──
 
 @models_bp.route("/<int:model_id>/rollout", methods=["GET"])
+@conditional("model_rollout")
 def list_rollout(model_id):
     stages = ModelRollout.query.filter_by(model_id=model_id).order_by(ModelRollout.rollout_percentage).all()
     return jsonify([s.to_dict() for s in stages])
@@ -340,6 +518,7 @@ def delete_rollout(model_id, stage_id):
 # ── Model Variables (Feature Importance) ──
 
 @models_bp.route("/<int:model_id>/variables", methods=["GET"])
+@conditional("model_variable")
 def list_variables(model_id):
     variables = ModelVariable.query.filter_by(model_id=model_id).order_by(
         ModelVariable.importance_rank.asc().nullslast()
@@ -0,0 +1,272 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select
+from models import db
+from models.scorecard import (
+    ModelInventory, GiniHistory, PsiBaseline, PsiHistory, ModelVariable, VariableBinning, CsiHistory,
+)
+from services.alerts import refresh_alert_state
+from services.http_cache import conditional
+from services.csi import load_binnings, record_csi, save_variable_bins
+from services.monitoring import gini_auc
+from services.psi import record_psi, save_baseline, split_by_model
+from services.samples import UnsupportedFormat, request_columns
+
+monitoring_bp = Blueprint("monitoring", __name__)
+
+
+def _flag(name, default):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "evet")
+
+
+def _period():
+    """period parametresi; geçersizse ValueError, verilmemişse None."""
+    period = request.args.get("period")
+    if period is not None and not 0 < len(period) <= GiniHistory.period.type.length:
+        raise ValueError("Geçersiz period")
+    return period
+
+
+def _score_columns(*extra):
+    """score_column / weight_column parametrelerine göre kolonları oku: (skor, ağırlık, ekler)."""
+    score_column = request.args.get("score_column", "score")
+    weight_column = request.args.get("weight_column")
+    required = [score_column, *extra]
+    columns = request_columns(required + ([weight_column] if weight_column else []), required=required)
+    weights = columns[weight_column] if weight_column and weight_column in columns else None
+    if weight_column and weights is None:
+        raise ValueError(f"Kolon bulunamadı: {weight_column}")
+    return columns[score_column], weights, [columns[name] for name in extra]
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/gini", methods=["POST"])
+def compute_gini(model_id):
+    """
+    Skorlanmış örneklemden Gini / AUC hesapla (CSV, NDJSON ya da kolon bazlı JSON gövde).
+    Parametreler: score_column (score), target_column (target, 1 = kötü), weight_column
+    (isteğe bağlı), higher_is_better (varsayılan true — skorkart puanı).
+    period verilirse sonuç (gini, sample_size, target_ratio) o dönemin GiniHistory kaydına
+    yazılır; kayıt varsa güncellenir.
+    """
+    db.get_or_404(ModelInventory, model_id)
+    try:
+        period = _period()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    score_column = request.args.get("score_column", "score")
+    target_column = request.args.get("target_column", "target")
+    weight_column = request.args.get("weight_column")
+    names = [score_column, target_column] + ([weight_column] if weight_column else [])
+    try:
+        columns = request_columns(names, required=names)
+        result = gini_auc(
+            columns[score_column], columns[target_column],
+            columns.get(weight_column) if weight_column else None,
+            higher_is_better=_flag("higher_is_better", True),
+        )
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    payload = {"model_id": model_id, **result}
+    if period is not None:
+        values = {
+            "gini_value": round(result["gini"], 6),
+            "sample_size": result["sample_size"],
+            "target_ratio": round(result["target_ratio"], 6),
+        }
+        records = GiniHistory.query.filter_by(model_id=model_id, period=period).all()
+        if records:
+            for record in records:
+                for key, value in values.items():
+                    setattr(record, key, value)
+        else:
+            records = [GiniHistory(model_id=model_id, period=period, notes="Örneklemden hesaplandı", **values)]
+            db.session.add(records[0])
+        db.session.flush()
+        refresh_alert_state([model_id])
+        db.session.commit()
+        payload["record"] = records[0].to_dict()
+    return jsonify(payload)
+
+
+# ── PSI ──
+
+@monitoring_bp.route("/<int:model_id>/monitoring/psi/baseline", methods=["GET"])
+@conditional("psi_baseline")
+def get_psi_baseline(model_id):
+    baseline = PsiBaseline.query.filter_by(model_id=model_id).first()
+    if baseline is None:
+        return jsonify({"error": "PSI referans dağılımı yok"}), 404
+    return jsonify(baseline.to_dict())
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/psi/baseline", methods=["PUT"])
+def put_psi_baseline(model_id):
+    """
+    Geliştirme örnekleminin skorlarından PSI referans bin'lerini kur (varsa değiştirir).
+    Parametreler: score_column (score), weight_column, bins (varsayılan PSI_BINS).
+    """
+    db.get_or_404(ModelInventory, model_id)
+    bins = request.args.get("bins", type=int)
+    if bins is not None and not 2 <= bins <= 100:
+        return jsonify({"error": "bins 2 ile 100 arasında olmalıdır"}), 400
+    try:
+        scores, weights, _ = _score_columns()
+        baseline = save_baseline(model_id, scores, weights, bins)
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        db.session.rollback()
+        return jsonify({"error": str(exc)}), 400
+    db.session.commit()
+    return jsonify(baseline.to_dict())
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/psi", methods=["GET"])
+@conditional("psi_history")
+def list_psi_history(model_id):
+    records = PsiHistory.query.filter_by(model_id=model_id).order_by(PsiHistory.period.desc()).all()
+    return jsonify([r.to_dict() for r in records])
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/psi", methods=["POST"])
+def compute_psi(model_id):
+    """
+    Dönem örnekleminin skorlarından PSI hesapla ve psi_history'ye yaz (period zorunlu).
+    Modelin en güncel dönemindeki PSI, PSI_ALERT_THRESHOLD'u aşarsa psi_flag açılır.
+    """
+    db.get_or_404(ModelInventory, model_id)
+    try:
+        period = _period()
+        if period is None:
+            raise ValueError("period zorunludur")
+        scores, weights, _ = _score_columns()
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    results, errors = record_psi(period, {model_id: (scores, weights)})
+    if errors:
+        db.session.rollback()
+        return jsonify({"error": errors[model_id]}), 400
+    db.session.commit()
+    record = PsiHistory.query.filter_by(model_id=model_id, period=period).first()
+    model = db.session.get(ModelInventory, model_id)
+    return jsonify({**record.to_dict(), "psi_flag": model.psi_flag})
+
+
+@monitoring_bp.route("/monitoring/psi/batch", methods=["POST"])
+def compute_psi_batch():
+    """
+    Portföyün dönem PSI'ı tek istekte: örneklem model_id ve skor kolonlarını içerir
+    (model_id_column, score_column, weight_column). Referansı olmayan modeller hata
+    listesinde döner; diğerleri tek transaction'da yazılır.
+    """
+    try:
+        period = _period()
+        if period is None:
+            raise ValueError("period zorunludur")
+        scores, weights, (model_ids,) = _score_columns(request.args.get("model_id_column", "model_id"))
+        samples = split_by_model(model_ids, scores, weights)
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    results, errors = record_psi(period, samples)
+    db.session.commit()
+    return jsonify({
+        "period": period,
+        "models": len(results),
+        "results": {
+            str(model_id): {k: v for k, v in result.items() if k != "actual"}
+            for model_id, result in results.items()
+        },
+        "errors": {str(model_id): message for model_id, message in errors.items()},
+    })
+
+
+# ── CSI ──
+
+@monitoring_bp.route("/<int:model_id>/monitoring/csi/baseline", methods=["GET"])
+@conditional("variable_binning", "model_variable")
+def get_csi_baseline(model_id):
+    names = dict(db.session.execute(
+        select(ModelVariable.id, ModelVariable.variable_name).where(ModelVariable.model_id == model_id)
+    ).all())
+    return jsonify([
+        {"variable_name": names.get(b.model_variable_id), **b.to_dict()}
+        for b in VariableBinning.query.filter_by(model_id=model_id).order_by(VariableBinning.model_variable_id)
+    ])
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/csi/baseline", methods=["PUT"])
+def put_csi_baseline(model_id):
+    """
+    Geliştirme örnekleminden değişken referanslarını kur. Kolon adları değişken adlarıdır
+    (variable_name); bin sayısı woe_bin_count'tan alınır. Örneklemde olmayan değişkenler raporlanır.
+    """
+    db.get_or_404(ModelInventory, model_id)
+    names = list(db.session.execute(
+        select(ModelVariable.variable_name).where(ModelVariable.model_id == model_id)
+    ).scalars())
+    if not names:
+        return jsonify({"error": "Modelin değişkeni yok"}), 400
+    try:
+        columns = request_columns(names)
+        saved, missing = save_variable_bins(model_id, columns)
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        db.session.rollback()
+        return jsonify({"error": str(exc)}), 400
+    if not saved:
+        db.session.rollback()
+        return jsonify({"error": "Örneklemde modelin değişken kolonu yok"}), 400
+    db.session.commit()
+    return jsonify({"saved": len(saved), "missing_variables": missing})
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/csi", methods=["GET"])
+@conditional("csi_history", "model_variable")
+def list_csi_history(model_id):
+    """CSI geçmişi; period verilirse yalnızca o dönem (CSI'ı büyükten küçüğe)."""
+    query = db.session.query(CsiHistory, ModelVariable.variable_name).join(
+        ModelVariable, ModelVariable.id == CsiHistory.model_variable_id
+    ).filter(CsiHistory.model_id == model_id)
+    period = request.args.get("period")
+    if period:
+        query = query.filter(CsiHistory.period == period)
+    rows = query.order_by(CsiHistory.period.desc(), CsiHistory.csi_value.desc()).all()
+    return jsonify([{"variable_name": name, **record.to_dict()} for record, name in rows])
+
+
+@monitoring_bp.route("/<int:model_id>/monitoring/csi", methods=["POST"])
+def compute_csi(model_id):
+    """
+    Dönem örnekleminden modelin tüm değişkenleri için CSI hesapla ve csi_history'ye yaz
+    (period zorunlu). Yanıt değişkenleri CSI'a göre sıralar; dönemin PSI'ı varsa eklenir.
+    """
+    db.get_or_404(ModelInventory, model_id)
+    binnings = load_binnings(model_id)
+    if not binnings:
+        return jsonify({"error": "CSI referans dağılımı yok"}), 404
+    try:
+        period = _period()
+        if period is None:
+            raise ValueError("period zorunludur")
+        columns = request_columns([name for _, name, _, _ in binnings])
+        result = record_csi(model_id, period, columns, binnings)
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        db.session.rollback()
+        return jsonify({"error": str(exc)}), 400
+    db.session.commit()
+    return jsonify({"model_id": model_id, **result})
@@ -0,0 +1,103 @@
+"""
+Toplu skorlama: /api/models/<id>/score
+
+Örneklem kolon bazlı okunur (CSV, NDJSON, kolon bazlı JSON ya da Arrow IPC), eksik
+değerler eğitim medyanıyla doldurulur ve skorlar kayıtlı katsayılarla tek matris
+çarpımında hesaplanır. Yanıt kolon bazlı JSON (varsayılan) ya da CSV'dir.
+"""
+import numpy as np
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from models import db
+from models.scorecard import ModelInventory
+from services.samples import UnsupportedFormat, request_columns
+from services.scoring import compiled_model, score_columns
+from services.tabular import to_float
+
+scoring_bp = Blueprint("scoring", __name__)
+
+OUTPUTS = ("json", "csv")
+_CSV_CHUNK = 100_000
+
+
+def _ids(values):
+    """Tam sayı id'ler int olarak döner (float64 okunduğu için)."""
+    if (values == np.trunc(values)).all():
+        return values.astype(np.int64)
+    return values
+
+
+def _intercept(raw):
+    """?intercept= açıkça çevrilir (type=float geçersiz değeri sessizce None yapardı)."""
+    try:
+        return to_float(raw)
+    except ValueError as exc:
+        raise ValueError(f"intercept: {exc}") from None
+
+
+def _csv_stream(header, arrays):
+    """Kolonlar parça parça metne çevrilir (np.savetxt satır başına biçimlendirir, daha yavaş)."""
+    yield ",".join(header) + "\n"
+    fixed = "{:.10g}".format
+    for start in range(0, len(arrays[0]), _CSV_CHUNK):
+        end = start + _CSV_CHUNK
+        columns = [map(str, arrays[0][start:end].tolist())] if len(arrays) > 2 else []
+        columns += [map(fixed, values[start:end].tolist()) for values in arrays[-2:]]
+        yield "\n".join(map(",".join, zip(*columns))) + "\n"
+
+
+@scoring_bp.route("/<int:model_id>/score", methods=["POST"])
+def score_batch(model_id):
+    """
+    Modelin değişken katsayılarıyla toplu skorla. Kolon adları değişken adlarıdır;
+    dosyada olmayan değişkenler tamamen medyanla doldurulur (missing_columns).
+    Parametreler: id_column (isteğe bağlı, sayısal; sonuçlarla birlikte döner),
+    intercept (kayıtlı sabiti geçersiz kılar), output: json (varsayılan) | csv.
+    """
+    db.get_or_404(ModelInventory, model_id)
+    output = request.args.get("output", "json").lower()
+    if output not in OUTPUTS:
+        return jsonify({"error": f"Desteklenmeyen çıktı: {output}"}), 400
+    compiled = compiled_model(model_id)
+    if compiled is None:
+        return jsonify({"error": "Katsayısı tanımlı değişken yok"}), 404
+
+    id_column = request.args.get("id_column")
+    try:
+        intercept = _intercept(request.args.get("intercept"))
+        columns = request_columns(compiled.names + ([id_column] if id_column else []))
+        ids = columns.pop(id_column, None) if id_column else None
+        if id_column and ids is None:
+            raise ValueError(f"Kolon bulunamadı: {id_column}")
+        if ids is not None and not np.isfinite(ids).all():
+            raise ValueError(f"{id_column}: Boş ya da sonlu olmayan id var")
+        if not columns:
+            raise ValueError("Örneklemde modelin değişken kolonlarından hiçbiri yok")
+        result = score_columns(compiled, columns, intercept)
+    except UnsupportedFormat as exc:
+        return jsonify({"error": str(exc)}), 415
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    if output == "csv":
+        header = (["id"] if ids is not None else []) + ["logit", "probability"]
+        arrays = ([_ids(ids)] if ids is not None else []) + [result["logit"], result["probability"]]
+        body = stream_with_context(_csv_stream(header, arrays))
+        return Response(body, content_type="text/csv; charset=utf-8", headers={
+            "Content-Disposition": f'attachment; filename="scores-{model_id}.csv"',
+            "Cache-Control": "no-store",
+            "X-Scored-Rows": str(result["rows"]),
+        })
+
+    body = {
+        "model_id": model_id,
+        "rows": result["rows"],
+        "variables": compiled.names,
+        "intercept": compiled.intercept if intercept is None else intercept,
+        "imputed": result["imputed"],
+        "missing_columns": result["missing_columns"],
+        "logit": np.round(result["logit"], 8).tolist(),
+        "probability": np.round(result["probability"], 8).tolist(),
+    }
+    if ids is not None:
+        body["id"] = _ids(ids).tolist()
+    return jsonify(body)
@@ -0,0 +1,35 @@
+from flask import Blueprint, request, jsonify
+from services import search as search_service
+from services.http_cache import conditional
+
+search_bp = Blueprint("search", __name__)
+
+MAX_LIMIT = 100
+
+
+@search_bp.route("/", methods=["GET"], strict_slashes=False)
+@conditional("model_inventory", "technical_guide", "model_variable")
+def search():
+    """
+    Model, teknik kılavuz ve değişkenlerde tam metin arama — sıralı sonuçlar.
+    q: arama metni (kelime önekleriyle eşleşir, tüm kelimeler aranır)
+    types: model,technical,variable (virgülle; boşsa hepsi)
+    model_id, limit (varsayılan 20)
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "q parametresi zorunludur"}), 400
+
+    types = [t for t in request.args.get("types", "").split(",") if t]
+    unknown = set(types) - set(search_service.SOURCES)
+    if unknown:
+        return jsonify({"error": f"Bilinmeyen tür: {', '.join(sorted(unknown))}"}), 400
+
+    limit = min(max(request.args.get("limit", 20, type=int), 1), MAX_LIMIT)
+    results = search_service.search(
+        query,
+        entities=types or None,
+        model_id=request.args.get("model_id", type=int),
+        limit=limit,
+    )
+    return jsonify({"query": query, "results": results})
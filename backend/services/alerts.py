@@ -0,0 +1,373 @@
+"""
+Gini/PSI/kalibrasyon alert kuralları — veritabanında değerlendirilir.
+
+Kurallar `alert_rule` tablosunda tutulur (kategori / ürün bazında eşik, N-of-M ay
+penceresi, PSI ve kalibrasyon koşulları). Değerlendirmeden önce aktif kurallar,
+modellerde görülen her (kategori, ürün) çifti için tek bir parametre satırına
+derlenir (`compile_rules`). Bu küçük tablo modellere join edilir; böylece kural
+sayısından bağımsız olarak tüm modeller tek sorguda, O(model) maliyetle
+değerlendirilir.
+
+Her model için son M aylık ("YYYY-MM") Gini kaydı ROW_NUMBER() OVER (PARTITION BY
+model_id ORDER BY period DESC) ile seçilir; sapma sayımı ve eşik kontrolü aynı
+sorguda yapılır. Yalnızca alert üreten modellerin satırları döner. SQLite ve
+Oracle'da çalışır.
+
+Sonuçlar `alert_state` tablosunda saklanır: Gini kaydı eklendiğinde ya da alert'e
+etki eden model alanları değiştiğinde yalnızca ilgili model, kural değiştiğinde
+tüm modeller yeniden değerlendirilir; dashboard bu tablodan indeksli okuma yapar.
+"""
+import json
+from datetime import datetime, timezone
+from itertools import groupby
+from sqlalchemy import select, delete, insert, func, case, literal, union_all, and_, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from models import db
+from models.dashboard import AlertState, AlertRule
+from models.scorecard import ModelInventory, GiniHistory
+
+# Kural tablosu boşken yüklenen varsayılan kurallar (kategori bazlı Gini eşikleri,
+# son 3 ayın 3'ünde ≥5 puan sapma, PSI flag tek başına alert)
+DEFAULT_RULES = (
+    {"name": "Başvuru modelleri", "scorecard_category": "Başvuru", "gini_threshold": 0.50},
+    {"name": "Davranış modelleri", "scorecard_category": "Davranış", "gini_threshold": 0.55},
+    {"name": "Genel", "gini_threshold": 0.50},
+)
+CALIBRATION_LEVELS = ("warning", "critical")
+
+ALERT_STATUSES = ("active", "under_review")
+# Bu model alanlarından biri değişirse alert durumu yeniden değerlendirilir
+ALERT_FIELDS = frozenset({
+    "gini_current", "gini_development", "psi_flag", "status",
+    "scorecard_category", "product_type", "calibration_status",
+})
+
+
+class monthly_period(FunctionElement):
+    """`period` değeri aylık ("YYYY-MM") biçimde mi — dialect'e göre derlenir."""
+    name = "monthly_period"
+    inherit_cache = True
+
+
+@compiles(monthly_period)
+def _monthly_period_default(element, compiler, **kw):
+    return "(%s LIKE '____-__')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(monthly_period, "sqlite")
+def _monthly_period_sqlite(element, compiler, **kw):
+    return "(%s GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(monthly_period, "oracle")
+def _monthly_period_oracle(element, compiler, **kw):
+    return "REGEXP_LIKE(%s, '^[0-9]{4}-[0-9]{2}$')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(monthly_period, "postgresql")
+def _monthly_period_postgresql(element, compiler, **kw):
+    return "(%s ~ '^[0-9]{4}-[0-9]{2}$')" % compiler.process(element.clauses, **kw)
+
+
+# ── Kural derleme ──
+
+def _specificity(rule):
+    return (rule.scorecard_category is not None) * 2 + (rule.product_type is not None)
+
+
+def compile_rules(rules, combos):
+    """
+    Her (kategori, ürün) çifti için geçerli kuralı seç: {(kategori, ürün): AlertRule}.
+    Maliyet çift × kural sayısıyla sınırlıdır, model sayısına bağlı değildir.
+    """
+    resolved = {}
+    for category, product in combos:
+        candidates = [
+            rule for rule in rules
+            if rule.scorecard_category in (None, category) and rule.product_type in (None, product)
+        ]
+        if candidates:
+            resolved[(category, product)] = max(
+                candidates, key=lambda r: (_specificity(r), r.priority or 0, -r.id)
+            )
+    return resolved
+
+
+def _rule_params(resolved):
+    """Derlenmiş kuralları sorguya join edilecek sabit satırlık bir alt sorguya çevir."""
+    rows = []
+    for (category, product), rule in resolved.items():
+        levels = f",{rule.calibration_levels}," if rule.calibration_levels else None
+        rows.append(select(
+            literal(category, db.String).label("scorecard_category"),
+            literal(product, db.String).label("product_type"),
+            literal(rule.gini_threshold, db.Float).label("gini_threshold"),
+            literal(rule.window_months, db.Integer).label("window_months"),
+            literal(rule.min_breaches, db.Integer).label("min_breaches"),
+            literal(rule.min_gini_diff, db.Float).label("min_gini_diff"),
+            literal(1 if rule.psi_alert else 0, db.Integer).label("psi_alert"),
+            literal(levels, db.String).label("calibration_levels"),
+            literal(1 if rule.calibration_requires_psi else 0, db.Integer).label("calibration_requires_psi"),
+        ))
+    query = rows[0] if len(rows) == 1 else union_all(*rows)
+    return query.subquery("rule_params")
+
+
+def _matches_rule(params):
+    # Ürün boş olabilir: NULL-güvenli eşitlik
+    return and_(
+        params.c.scorecard_category == ModelInventory.scorecard_category,
+        or_(
+            params.c.product_type == ModelInventory.product_type,
+            and_(params.c.product_type.is_(None), ModelInventory.product_type.is_(None)),
+        ),
+    )
+
+
+def _alert_statement(params, model_ids=None, condition=None):
+    """Alert üreten modelleri ve kural penceresindeki kayıtlarını döndüren tek SELECT."""
+    model_filter = [
+        ModelInventory.status.in_(ALERT_STATUSES),
+        ModelInventory.gini_development.isnot(None),
+    ]
+    if model_ids is not None:
+        model_filter.append(ModelInventory.id.in_(model_ids))
+    if condition is not None:
+        model_filter.append(condition)
+
+    rn = func.row_number().over(
+        partition_by=GiniHistory.model_id,
+        order_by=GiniHistory.period.desc(),
+    )
+    ranked = (
+        select(
+            GiniHistory.model_id,
+            GiniHistory.period,
+            GiniHistory.gini_value,
+            ModelInventory.gini_development,
+            params.c.window_months,
+            params.c.min_gini_diff,
+            rn.label("rn"),
+        )
+        .join(ModelInventory, ModelInventory.id == GiniHistory.model_id)
+        .join(params, _matches_rule(params))
+        .where(monthly_period(GiniHistory.period), *model_filter)
+        .subquery("ranked")
+    )
+
+    deviates = case(
+        (func.abs(ranked.c.gini_development - ranked.c.gini_value) >= ranked.c.min_gini_diff, 1),
+        else_=0,
+    )
+    last_n = (
+        select(
+            ranked.c.model_id,
+            ranked.c.period,
+            ranked.c.gini_value,
+            ranked.c.rn,
+            func.count().over(partition_by=ranked.c.model_id).label("n"),
+            func.sum(deviates).over(partition_by=ranked.c.model_id).label("n_dev"),
+        )
+        .where(ranked.c.rn <= ranked.c.window_months)
+        .subquery("last_n")
+    )
+
+    deviation = last_n.c.n_dev >= params.c.min_breaches
+    breach = and_(
+        ModelInventory.gini_current.isnot(None),
+        ModelInventory.gini_current < params.c.gini_threshold,
+    )
+    psi = and_(params.c.psi_alert == 1, ModelInventory.psi_flag == True)  # noqa: E712
+    calibration = and_(
+        params.c.calibration_levels.like("%," + ModelInventory.calibration_status + ",%"),
+        or_(params.c.calibration_requires_psi == 0, ModelInventory.psi_flag == True),  # noqa: E712
+    )
+
+    return (
+        select(
+            ModelInventory.id,
+            ModelInventory.model_name,
+            ModelInventory.scorecard_category,
+            ModelInventory.product_type,
+            ModelInventory.status,
+            ModelInventory.gini_development,
+            ModelInventory.gini_current,
+            ModelInventory.psi_flag,
+            ModelInventory.alert_work_started,
+            params.c.gini_threshold,
+            params.c.window_months,
+            params.c.min_breaches,
+            last_n.c.period,
+            last_n.c.gini_value,
+            case((deviation, 1), else_=0).label("deviation"),
+            case((breach, 1), else_=0).label("breach"),
+            case((calibration, 1), else_=0).label("calibration"),
+        )
+        .join(params, _matches_rule(params))
+        .outerjoin(last_n, and_(
+            last_n.c.model_id == ModelInventory.id,
+            last_n.c.n == params.c.window_months,  # pencere dolu değilse sapma sayılmaz
+        ))
+        .where(*model_filter, or_(deviation, breach, psi, calibration))
+        .order_by(ModelInventory.id, last_n.c.rn)
+    )
+
+
+def _rule_combos(model_ids=None, condition=None):
+    """Değerlendirilecek modellerde görülen (kategori, ürün) çiftleri."""
+    stmt = select(ModelInventory.scorecard_category, ModelInventory.product_type).distinct().where(
+        ModelInventory.status.in_(ALERT_STATUSES)
+    )
+    if model_ids is not None:
+        stmt = stmt.where(ModelInventory.id.in_(model_ids))
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return db.session.execute(stmt).all()
+
+
+def rule_scope_condition(scopes):
+    """
+    (kategori, ürün) kapsamlarından herhangi birine giren modeller için koşul; boş alan o
+    boyutta her değere uyar. Genel bir kapsam (ikisi de boş) varsa None — tüm modeller.
+    """
+    clauses = []
+    for category, product in scopes:
+        parts = []
+        if category is not None:
+            parts.append(ModelInventory.scorecard_category == category)
+        if product is not None:
+            parts.append(ModelInventory.product_type == product)
+        if not parts:
+            return None
+        clauses.append(and_(*parts))
+    return or_(*clauses)
+
+
+def evaluate_alerts(model_ids=None, condition=None):
+    """
+    Aktif kuralları derleyip değerlendir; yalnızca alert olan modeller döner.
+    model_ids / condition verilirse değerlendirme o modellerle sınırlanır.
+    """
+    rules = AlertRule.query.filter_by(is_active=True).all()
+    resolved = compile_rules(rules, _rule_combos(model_ids, condition))
+    if not resolved:
+        return []
+    rows = db.session.execute(_alert_statement(_rule_params(resolved), model_ids, condition))
+
+    alerts = []
+    for _, group in groupby(rows, key=lambda r: r.id):
+        group = list(group)
+        model = group[0]
+        window = [r for r in group if r.period is not None]
+        diffs = [model.gini_development - r.gini_value for r in window]
+
+        alert_reason = []
+        if model.deviation:
+            # N-of-M penceresinde N == M ise ardışık sapmadır
+            alert_reason.append(
+                "consecutive_deviation" if model.min_breaches >= model.window_months else "window_deviation"
+            )
+        if model.breach:
+            alert_reason.append("threshold_breach")
+        gini_alert = bool(alert_reason)
+        if model.calibration:
+            alert_reason.append("calibration")
+
+        direction = None
+        if diffs:
+            direction = "drop" if diffs[0] > 0 else "rise"
+
+        alerts.append({
+            "model_id": model.id,
+            "model_name": model.model_name,
+            "scorecard_category": model.scorecard_category,
+            "product_type": model.product_type,
+            "status": model.status,
+            "gini_development": model.gini_development,
+            "gini_current": model.gini_current,
+            "gini_threshold": model.gini_threshold,
+            "last3_periods": [r.period for r in window],
+            "last3_values": [round(r.gini_value, 4) for r in window],
+            "last3_diffs": [round(d, 4) for d in diffs],
+            "direction": direction,
+            "alert_reason": alert_reason,
+            "gini_alert": gini_alert,
+            "psi_flag": model.psi_flag or False,
+            "alert_work_started": model.alert_work_started or False,
+        })
+    return alerts
+
+
+def ensure_default_rules():
+    """Kural tablosu boşsa varsayılan kuralları ekle (commit çağırana bırakılır)."""
+    if AlertRule.query.first() is None:
+        db.session.add_all(AlertRule(**rule) for rule in DEFAULT_RULES)
+        db.session.flush()
+
+
+# ── Kalıcı alert durumu ──
+
+def refresh_alert_state(model_ids=None, condition=None):
+    """
+    Verilen modellerin (None ise tüm modellerin) alert durumunu yeniden hesaplayıp
+    `alert_state` tablosuna yaz. condition: ModelInventory üzerinde ek kapsam koşulu
+    (ör. rule_scope_condition). Commit çağırana bırakılır; yazım ile aynı transaction'da çalışır.
+    """
+    if model_ids is not None:
+        model_ids = list(model_ids)
+        if not model_ids:
+            return []
+
+    alerts = evaluate_alerts(model_ids, condition)
+
+    stmt = delete(AlertState)
+    if model_ids is not None:
+        stmt = stmt.where(AlertState.model_id.in_(model_ids))
+    if condition is not None:
+        stmt = stmt.where(AlertState.model_id.in_(select(ModelInventory.id).where(condition)))
+    db.session.execute(stmt)
+
+    if alerts:
+        now = datetime.now(timezone.utc)
+        db.session.execute(insert(AlertState), [{
+            "model_id": a["model_id"],
+            "gini_alert": a["gini_alert"],
+            "gini_threshold": a["gini_threshold"],
+            "alert_reason": json.dumps(a["alert_reason"]),
+            "last_periods": json.dumps(a["last3_periods"]),
+            "last_values": json.dumps(a["last3_values"]),
+            "last_diffs": json.dumps(a["last3_diffs"]),
+            "direction": a["direction"],
+            "severity_rank": 0 if a["gini_alert"] else 1,
+            "severity": abs(a["last3_diffs"][0]) if a["last3_diffs"] else 0,
+            "evaluated_at": now,
+        } for a in alerts])
+    return alerts
+
+
+def load_alert_states():
+    """AlertState satırlarını önem sırasıyla yükle (model kolonları olmadan)."""
+    return AlertState.query.order_by(
+        AlertState.severity_rank, AlertState.severity.desc(), AlertState.model_id
+    ).all()
+
+
+def list_alert_states():
+    """Saklanan alert durumlarını önem sırasıyla döndür (dashboard okuması)."""
+    rows = db.session.execute(
+        select(
+            AlertState,
+            ModelInventory.model_name,
+            ModelInventory.scorecard_category,
+            ModelInventory.product_type,
+            ModelInventory.status,
+            ModelInventory.gini_development,
+            ModelInventory.gini_current,
+            ModelInventory.psi_flag,
+            ModelInventory.alert_work_started,
+        )
+        .join(ModelInventory, ModelInventory.id == AlertState.model_id)
+        .order_by(AlertState.severity_rank, AlertState.severity.desc(), AlertState.model_id)
+    )
+    return [row.AlertState.to_dict(row) for row in rows]
@@ -0,0 +1,130 @@
+"""
+İçerik adresli dosya deposu (validasyon raporu ekleri).
+
+Dosyalar SHA-256 özetleriyle adreslenir: aynı içerik bir kez saklanır, kayıtlar
+yalnızca özeti (`file_hash`) tutar. Yükleme parça parça diske akıtılır; özet
+yazarken hesaplanır, dosya tamamlanınca atomik olarak yerine taşınır. İndirme
+dosya yolundan `send_file` ile yapılır (Range ve sendfile desteği).
+
+Silme kilitsizdir ama yüklemelerle yarışmaz: aynı içerik tekrar yüklendiğinde mevcut
+dosyanın mtime'ı yenilenir (henüz commit edilmemiş bir kayıt ona bağlanmış olabilir).
+`collect` dosyayı önce atomik olarak çöp adına taşır, sonra mtime'a bakar; bu arada
+dokunulmuşsa geri koyar. Taşımadan sonra gelen yükleme dosyayı bulamaz ve kendi
+kopyasını yazar. Böylece hiçbir kayıt eksik dosyaya işaret etmez.
+
+Backend `BLOB_STORE_BACKEND` ile seçilir; şu an yalnızca yerel dosya sistemi
+("local", kök dizin `BLOB_STORE_PATH`) vardır. Yeni backend aynı metotları
+sağlayıp `BACKENDS` sözlüğüne eklenir.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from flask import current_app
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LocalBlobStore:
+    """Kök dizin altında ab/cd/<sha256> düzeninde saklar."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._tmp = os.path.join(self.root, "tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def path(self, digest):
+        """Dosyanın yerel yolu — send_file ile doğrudan sunulabilir."""
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def save(self, stream):
+        """
+        Akışı parça parça diske yaz: (sha256, boyut, yeni dosyanın mtime_ns'i). İçerik zaten
+        varsa kopya tutulmaz, mevcut dosyanın mtime'ı yenilenir ve üçüncü değer None olur.
+        """
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            digest = sha.hexdigest()
+            target = self.path(digest)
+            try:
+                os.utime(target)  # Varlık kontrolü de budur: collect taşıdıysa FileNotFoundError
+                os.remove(tmp_path)
+                return digest, size, None
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+                return digest, size, os.stat(target).st_mtime_ns
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def collect(self, digest, older_than=None, expected_mtime_ns=None):
+        """
+        Dosyayı sil — ancak older_than'dan (epoch sn) sonra ya da expected_mtime_ns'ten farklı
+        bir zamanda dokunulmamışsa. Silindiyse True.
+        """
+        path = self.path(digest)
+        trash = os.path.join(self._tmp, f"{digest}.{os.getpid()}.{time.monotonic_ns()}.gc")
+        try:
+            os.replace(path, trash)
+        except FileNotFoundError:
+            return False
+        mtime_ns = os.stat(trash).st_mtime_ns
+        touched = (
+            (older_than is not None and mtime_ns > older_than * 1e9)
+            or (expected_mtime_ns is not None and mtime_ns != expected_mtime_ns)
+        )
+        if touched:
+            os.replace(trash, path)  # Bu arada aynı içerik yazıldıysa da özdeştir
+            return False
+        os.remove(trash)
+        return True
+
+    def digests(self):
+        """Depodaki tüm özetler."""
+        for directory, _, files in os.walk(self.root):
+            if os.path.abspath(directory).startswith(self._tmp):
+                continue
+            for name in files:
+                if len(name) == 64:
+                    yield name
+
+    def purge_tmp(self, older_than):
+        """Yarım kalmış yüklemelerin geçici dosyalarını sil (older_than: epoch sn)."""
+        removed = 0
+        for entry in os.scandir(self._tmp):
+            if entry.is_file() and entry.stat().st_mtime < older_than:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+BACKENDS = {"local": LocalBlobStore}
+
+
+def init_blob_store(app):
+    backend = BACKENDS[app.config["BLOB_STORE_BACKEND"]]
+    app.extensions["blob_store"] = backend(app.config["BLOB_STORE_PATH"])
+
+
+def get_blob_store():
+    return current_app.extensions["blob_store"]
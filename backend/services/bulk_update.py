@@ -0,0 +1,109 @@
+"""
+Model envanterinde toplu operasyonel güncelleme.
+
+İzlemeden sonra onlarca modelde psi_flag / calibration_status / alert_work_started /
+status değiştirilir. Değişiklikler aynı değişiklik kümesine sahip id'ler gruplanarak
+`UPDATE ... WHERE id IN (...)` ile yazılır (filtre ile güncellemede tek ifade). Core
+UPDATE mapper event'lerini atladığından dashboard sayaçları önceki değerlerden tek
+seferde düzeltilir, alert durumu etkilenen modeller için yenilenir (UPDATE gibi IN
+listesi sınırına göre parçalar halinde); hepsi tek transaction'dadır ve commit
+çağırana bırakılır.
+"""
+from sqlalchemy import select, update
+from models import db
+from models.scorecard import ModelInventory
+from services.alerts import ALERT_FIELDS, CALIBRATION_LEVELS, refresh_alert_state
+from services.summary import MODEL_ATTRS, apply_model_changes
+
+# Toplu güncellenebilir alanlar -> doğrulayıcı (geçersizse hata mesajı)
+BULK_FIELDS = {
+    "status": lambda v: None if v in ("active", "retired", "under_review") else "active, retired ya da under_review olmalıdır",
+    "calibration_status": lambda v: None if v in ("ok", *CALIBRATION_LEVELS) else "ok, warning ya da critical olmalıdır",
+    "psi_flag": lambda v: None if isinstance(v, bool) else "true/false olmalıdır",
+    "alert_work_started": lambda v: None if isinstance(v, bool) else "true/false olmalıdır",
+}
+FILTER_FIELDS = ("scorecard_category", "product_type", "status", "owner")
+_IN_BATCH = 1000  # Oracle IN listesi sınırı
+
+
+class BulkUpdateError(ValueError):
+    def __init__(self, message, missing=None):
+        super().__init__(message)
+        self.missing = missing or []
+
+
+def validate_changes(changes):
+    if not isinstance(changes, dict) or not changes:
+        raise BulkUpdateError("changes boş olmayan bir nesne olmalıdır")
+    for field, value in changes.items():
+        if field not in BULK_FIELDS:
+            raise BulkUpdateError(f"Toplu güncellenemeyen alan: {field}")
+        error = BULK_FIELDS[field](value)
+        if error:
+            raise BulkUpdateError(f"{field}: {error}")
+    return changes
+
+
+def filtered_ids(filters):
+    """Filtreye uyan model id'leri; filtre: ids ve/veya FILTER_FIELDS eşitlikleri."""
+    if not isinstance(filters, dict) or not filters:
+        raise BulkUpdateError("filter boş olmayan bir nesne olmalıdır")
+    unknown = set(filters) - {"ids", *FILTER_FIELDS}
+    if unknown:
+        raise BulkUpdateError(f"Bilinmeyen filtre: {', '.join(sorted(unknown))}")
+    requested = filters.get("ids")
+    if "ids" in filters and not (
+        isinstance(requested, list)
+        and all(isinstance(i, int) and not isinstance(i, bool) for i in requested)
+    ):
+        raise BulkUpdateError("filter.ids tam sayı listesi olmalıdır")
+    stmt = select(ModelInventory.id)
+    for field in FILTER_FIELDS:
+        if field in filters:
+            value = filters[field]
+            if value is not None and not isinstance(value, str):
+                raise BulkUpdateError(f"filter.{field} metin olmalıdır")
+            stmt = stmt.where(getattr(ModelInventory, field) == value)
+    ids = set(db.session.execute(stmt).scalars())
+    if requested is not None:
+        ids &= set(requested)
+    return sorted(ids)
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), _IN_BATCH):
+        yield ids[start:start + _IN_BATCH]
+
+
+def bulk_update_models(changes_by_id):
+    """changes_by_id: model id -> değişiklikler. Güncellenen id'leri döndürür; eksik id'de BulkUpdateError."""
+    ids = sorted(changes_by_id)
+    before = []
+    columns = [ModelInventory.id, *(getattr(ModelInventory, key) for key in MODEL_ATTRS)]
+    for chunk in _chunks(ids):
+        before.extend(db.session.execute(select(*columns).where(ModelInventory.id.in_(chunk))).mappings())
+    missing = sorted(set(ids) - {row["id"] for row in before})
+    if missing:
+        raise BulkUpdateError("Model bulunamadı", missing)
+
+    groups = {}
+    for model_id, changes in changes_by_id.items():
+        groups.setdefault(tuple(sorted(changes.items())), []).append(model_id)
+    for change_set, group_ids in groups.items():
+        for chunk in _chunks(sorted(group_ids)):
+            db.session.execute(
+                update(ModelInventory).where(ModelInventory.id.in_(chunk)).values(dict(change_set)),
+                execution_options={"synchronize_session": False},
+            )
+
+    pairs = []
+    for row in before:
+        old = {key: row[key] for key in MODEL_ATTRS}
+        pairs.append((old, {**old, **changes_by_id[row["id"]]}))
+    apply_model_changes(pairs)
+    alert_ids = sorted(model_id for model_id, changes in changes_by_id.items() if ALERT_FIELDS.intersection(changes))
+    for chunk in _chunks(alert_ids):
+        refresh_alert_state(chunk)
+    # Oturumda yüklü model nesneleri eski değerleri taşımasın
+    db.session.expire_all()
+    return ids
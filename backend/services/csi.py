@@ -0,0 +1,123 @@
+"""
+Değişken stabilitesi (CSI) izleme.
+
+Her model değişkeninin geliştirme dağılımı (`variable_binning`) bir kez kaydedilir:
+bin sayısı `woe_bin_count`'tan (yoksa PSI_BINS) alınır, sınırlar geliştirme
+değerlerinin kantilleridir, eksik değer ayrı bin'dir. Bir modelin referansları worker
+içinde NumPy dizileri olarak önbelleğe alınır ve `variable_binning` / `model_variable`
+versiyonu değişene kadar tekrar okunmaz. Dönem örnekleminde modelin tüm değişkenleri
+tek seferde hesaplanır ve sonuç `csi_history`'ye (değişken, dönem) üzerinden yazılır;
+böylece bir PSI alarmını hangi değişkenlerin sürüklediği doğrudan görülür.
+"""
+import json
+import threading
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+from models import db
+from models.scorecard import ModelVariable, VariableBinning, CsiHistory, PsiHistory
+from services.monitoring import csi, csi_bins
+from services.psi import psi_status
+from services.versioning import current_versions, uncommitted_tables
+
+_TABLES = (VariableBinning.__tablename__, ModelVariable.__tablename__)
+_binnings = {}     # model_id -> [(değişken id, ad, sınırlar, beklenen)]
+_binnings_version = None
+_binnings_lock = threading.Lock()
+
+
+def save_variable_bins(model_id, columns):
+    """
+    columns: değişken adı -> geliştirme değerleri. Dosyada bulunan her değişkenin referansını
+    kur (varsa değiştir). Dönüş: (kaydedilen VariableBinning listesi, dosyada olmayan değişkenler).
+    Commit çağırana bırakılır.
+    """
+    variables = ModelVariable.query.filter_by(model_id=model_id).all()
+    existing = {
+        binning.model_variable_id: binning
+        for binning in VariableBinning.query.filter_by(model_id=model_id)
+    }
+    saved, missing = [], []
+    for variable in variables:
+        values = columns.get(variable.variable_name)
+        if values is None:
+            missing.append(variable.variable_name)
+            continue
+        edges, expected = csi_bins(values, variable.woe_bin_count or current_app.config["PSI_BINS"])
+        binning = existing.get(variable.id) or VariableBinning(model_variable_id=variable.id, model_id=model_id)
+        binning.bin_edges = json.dumps(edges.tolist())
+        binning.expected = json.dumps(expected.tolist())
+        binning.sample_size = int(len(values))
+        db.session.add(binning)
+        saved.append(binning)
+    db.session.flush()
+    return saved, missing
+
+
+def load_binnings(model_id):
+    """Modelin CSI referansları: [(değişken id, ad, sınırlar, beklenen)] — değişken id sırasıyla."""
+    global _binnings_version
+    versions = current_versions(_TABLES)
+    fingerprint = tuple(versions[name][0] for name in _TABLES)
+    with _binnings_lock:
+        if fingerprint != _binnings_version:
+            _binnings.clear()
+            _binnings_version = fingerprint
+        cached = _binnings.get(model_id)
+    if cached is not None:
+        return cached
+
+    rows = db.session.execute(
+        select(ModelVariable.id, ModelVariable.variable_name, VariableBinning.bin_edges, VariableBinning.expected)
+        .join(VariableBinning, VariableBinning.model_variable_id == ModelVariable.id)
+        .where(ModelVariable.model_id == model_id)
+        .order_by(ModelVariable.id)
+    )
+    loaded = [
+        (variable_id, name, np.array(json.loads(edges), dtype=np.float64), np.array(json.loads(expected)))
+        for variable_id, name, edges, expected in rows
+    ]
+    with _binnings_lock:
+        if fingerprint == _binnings_version and not uncommitted_tables().intersection(_TABLES):
+            _binnings[model_id] = loaded
+    return loaded
+
+
+def record_csi(model_id, period, columns, binnings=None):
+    """
+    Dönem örnekleminden modelin tüm referanslı değişkenleri için CSI hesapla ve yaz.
+    Dönüş: {period, psi_value, variables: [CSI'ı büyükten küçüğe], missing_variables}.
+    Commit çağırana bırakılır.
+    """
+    binnings = binnings if binnings is not None else load_binnings(model_id)
+    if not binnings:
+        raise ValueError("CSI referans dağılımı yok")
+    used = [b for b in binnings if b[1] in columns]
+    missing = [b[1] for b in binnings if b[1] not in columns]
+    if not used:
+        raise ValueError("Örneklemde referanslı değişken kolonu yok")
+
+    matrix = np.column_stack([columns[name] for _, name, _, _ in used])
+    values, actual = csi(matrix, [b[2] for b in used], [b[3] for b in used])
+
+    existing = {
+        record.model_variable_id: record
+        for record in CsiHistory.query.filter_by(model_id=model_id, period=period)
+    }
+    records = []
+    for (variable_id, name, _, _), value, shares in zip(used, values.tolist(), actual):
+        record = existing.get(variable_id) or CsiHistory(model_variable_id=variable_id, model_id=model_id, period=period)
+        record.csi_value = round(value, 6)
+        record.csi_status = psi_status(value)
+        record.sample_size = int(matrix.shape[0])
+        record.actual = json.dumps([round(share, 6) for share in shares.tolist()])
+        db.session.add(record)
+        records.append((name, record))
+    db.session.flush()  # Yeni kayıtların id / created_at değerleri to_dict'ten önce dolsun
+    results = [{"variable_name": name, **record.to_dict()} for name, record in records]
+
+    psi_value = db.session.execute(
+        select(PsiHistory.psi_value).where(PsiHistory.model_id == model_id, PsiHistory.period == period)
+    ).scalars().first()
+    results.sort(key=lambda r: r["csi_value"], reverse=True)
+    return {"period": period, "psi_value": psi_value, "variables": results, "missing_variables": missing}
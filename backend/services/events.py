@@ -0,0 +1,68 @@
+"""
+Canlı güncelleme bildirimleri (Server-Sent Events).
+
+Her commit sonrası `on_commit` dinleyicisi worker içindeki `event_broker` sayacını
+artırır ve bekleyen stream'leri uyandırır. Diğer worker'lardaki yazımlar bu
+bildirimi tetiklemez; stream'ler bu yüzden ayrıca `data_version` tablosunu
+belirli aralıklarla kontrol eder.
+"""
+import json
+import threading
+from services.versioning import on_commit
+
+
+class EventBroker:
+    """Worker içi commit bildirimi — stream thread'leri `wait` ile bekler."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.sequence = 0
+
+    def notify(self, tables):
+        with self._condition:
+            self.sequence += 1
+            self._condition.notify_all()
+
+    def wait(self, seen, timeout):
+        """Yeni bir commit olana ya da timeout dolana kadar bekle; güncel sırayı döndür."""
+        with self._condition:
+            if self.sequence == seen:
+                self._condition.wait(timeout)
+            return self.sequence
+
+
+event_broker = EventBroker()
+on_commit(event_broker.notify)
+
+
+class StreamSlots:
+    """Worker içi eşzamanlı stream sayacı — her açık stream bir gthread thread'ini tutar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+
+    def acquire(self, limit):
+        with self._lock:
+            if self.active >= limit:
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
+stream_slots = StreamSlots()
+
+
+def sse_message(event, data):
+    """Tek bir SSE mesajı (event + tek satır JSON data)."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def sse_comment(text):
+    """İstemcinin yok saydığı yorum satırı — bağlantıyı canlı tutmak için."""
+    return f": {text}\n\n"
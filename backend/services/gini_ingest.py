@@ -0,0 +1,137 @@
+"""
+Toplu Gini geçmişi yükleme.
+
+Kayıtlar akış halinde okunur, doğrulanır ve CHUNK_SIZE'lık parçalar halinde
+(model_id, period) üzerinden upsert edilir: parçadaki mevcut kayıtlar tek
+SELECT ile bulunur, güncellemeler ve eklemeler executemany ile yazılır, her
+parça ayrı transaction'da commit edilir. Model id'leri tek sorguyla doğrulanır;
+alert durumu tüm parçalardan sonra etkilenen modeller için yenilenir (IN listesi
+sınırına göre parçalar halinde, tek transaction'da).
+"""
+from sqlalchemy import select, insert, update, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from models import db
+from models.scorecard import ModelInventory, GiniHistory
+from services.alerts import refresh_alert_state
+from services.tabular import blank_to_none, to_float, to_int
+
+CHUNK_SIZE = 1000
+_IN_BATCH = 500  # Oracle IN listesi sınırı (1000) altında
+# Yanıtta listelenen en fazla satır hatası (toplam sayı ayrıca döner)
+MAX_REPORTED_ERRORS = 500
+
+
+def _parse(record, known_models):
+    """Kaydı GiniHistory kolonlarına çevir; geçersizse ValueError."""
+    model_id = to_int(record.get("model_id"))
+    if model_id is None:
+        raise ValueError("model_id zorunludur")
+    if model_id not in known_models:
+        raise ValueError(f"Model bulunamadı: {model_id}")
+
+    period = blank_to_none(record.get("period"))
+    if period is None:
+        raise ValueError("period zorunludur")
+    period = str(period)
+    if len(period) > GiniHistory.period.type.length:
+        raise ValueError(f"period çok uzun: {period}")
+
+    gini_value = to_float(record.get("gini_value"))
+    if gini_value is None:
+        raise ValueError("gini_value zorunludur")
+    if not -1 <= gini_value <= 1:
+        raise ValueError(f"gini_value -1 ile 1 arasında olmalıdır: {gini_value}")
+
+    return {
+        "model_id": model_id,
+        "period": period,
+        "gini_value": gini_value,
+        "target_ratio": to_float(record.get("target_ratio")),
+        "sample_size": to_int(record.get("sample_size")),
+        "notes": blank_to_none(record.get("notes")),
+    }
+
+
+def _write_chunk(rows):
+    """Parçayı upsert et: (eklenen, güncellenen)."""
+    existing = {}
+    keys = list(rows)
+    for start in range(0, len(keys), _IN_BATCH):
+        batch = keys[start:start + _IN_BATCH]
+        for record_id, model_id, period in db.session.execute(
+            select(GiniHistory.id, GiniHistory.model_id, GiniHistory.period)
+            .where(tuple_(GiniHistory.model_id, GiniHistory.period).in_(batch))
+        ):
+            existing.setdefault((model_id, period), []).append(record_id)
+
+    updates = [
+        {"id": record_id, **values}
+        for key, values in rows.items()
+        for record_id in existing.get(key, ())
+    ]
+    inserts = [values for key, values in rows.items() if key not in existing]
+    if updates:
+        db.session.execute(update(GiniHistory), updates)
+    if inserts:
+        db.session.execute(insert(GiniHistory), inserts)
+    return len(inserts), len(rows) - len(inserts)
+
+
+def ingest_gini_records(records):
+    """
+    records: iter_records çıktısı — (line, record, error).
+    Dönüş: {rows, inserted, updated, models, error_count, errors: [{line, error}]}
+    """
+    known_models = set(db.session.execute(select(ModelInventory.id)).scalars())
+    report = {"rows": 0, "inserted": 0, "updated": 0, "error_count": 0, "errors": []}
+    touched_models = set()
+
+    def add_error(line, message):
+        report["error_count"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "error": message})
+
+    chunk = {}     # (model_id, period) -> kolonlar; parça içinde son satır geçerli
+    lines = {}     # (model_id, period) -> satır no (hata raporu için)
+
+    def flush():
+        if not chunk:
+            return
+        try:
+            inserted, updated = _write_chunk(chunk)
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            for key in chunk:
+                add_error(lines[key], f"Yazılamadı: {exc.__class__.__name__}")
+        else:
+            report["inserted"] += inserted
+            report["updated"] += updated
+            touched_models.update(model_id for model_id, _ in chunk)
+        chunk.clear()
+        lines.clear()
+
+    for line, record, error in records:
+        report["rows"] += 1
+        if error is None:
+            try:
+                values = _parse(record, known_models)
+            except (ValueError, TypeError) as exc:
+                error = str(exc)
+        if error is not None:
+            add_error(line, error)
+            continue
+        key = (values["model_id"], values["period"])
+        chunk[key] = values
+        lines[key] = line
+        if len(chunk) >= CHUNK_SIZE:
+            flush()
+    flush()
+
+    if touched_models:
+        touched = sorted(touched_models)
+        for start in range(0, len(touched), _IN_BATCH):
+            refresh_alert_state(touched[start:start + _IN_BATCH])
+        db.session.commit()
+    report["models"] = len(touched_models)
+    return report
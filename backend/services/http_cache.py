@@ -0,0 +1,107 @@
+"""
+Koşullu GET (ETag / Last-Modified / 304).
+
+`@conditional(...)` ile işaretlenen okuma endpoint'leri, bağımlı oldukları tabloların
+`data_version` sayaçlarından strong bir ETag ve Last-Modified üretir. İstemcinin
+If-None-Match / If-Modified-Since başlıkları güncelse view hiç çalıştırılmadan
+304 döner — yani ORM sorgusu, serileştirme ve sıkıştırma yapılmaz.
+
+HTTP tarihleri saniye çözünürlüklüdür: son değişikliğin saniyesi bitmeden verilen
+Last-Modified, aynı saniyedeki sonraki bir yazımı ayırt edemez. Bu yüzden
+Last-Modified yalnızca son değişiklik en az 1 sn eskiyse gönderilir ve
+If-Modified-Since yalnızca If-None-Match yokken ve aynı koşulda dikkate alınır;
+aksi halde doğrulama ETag ile yapılır.
+
+Koşulsuz isteklerde JSON yanıtlar sunucu tarafı LRU önbellekten
+(services/response_cache.py) verilir; önbellek commit edilen yazımlarla temizlenir.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import current_app, make_response, request
+from services.response_cache import request_key, response_cache
+from services.versioning import current_versions, on_commit
+
+on_commit(response_cache.invalidate)
+
+
+def _compute_etag(versions, extra):
+    parts = [repr(request_key())]
+    parts += [f"{name}:{versions[name][0]}" for name in sorted(versions)]
+    if extra is not None:
+        parts.append(str(extra()))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def _last_modified(versions):
+    """Saniyeye yuvarlanmış son değişiklik; değişiklik 1 sn'den yeniyse None (yalnızca ETag)."""
+    stamps = [changed_at for _, changed_at in versions.values() if changed_at is not None]
+    if not stamps:
+        return None
+    latest = max(stamps)
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    if datetime.now(timezone.utc) - latest < timedelta(seconds=1):
+        return None
+    return latest.replace(microsecond=0)
+
+
+def _matching_etag(etag):
+    """İstemcinin gönderdiği ve `etag` ile eşleşen değeri döndür.
+
+    Flask-Compress sıkıştırılmış yanıtın ETag'ine ":gzip" gibi bir son ek ekler;
+    karşılaştırmada bu son ek yok sayılır, 304'te istemcinin değeri aynen döner.
+    """
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set():
+        if tag.split(":", 1)[0] == etag:
+            return tag
+    return None
+
+
+def conditional(*tables, max_age=None, extra=None, cache=True):
+    """
+    Okuma endpoint'ini koşullu GET destekli yap.
+
+    tables: yanıtın bağlı olduğu tablolar — herhangi birine yazım ETag'i değiştirir.
+    max_age: verilirse "public, max-age=N", verilmezse "no-cache" (her seferinde doğrula).
+    extra: ETag'e eklenecek ek değer üreten fonksiyon (örn. tarihe bağlı yanıtlar için).
+    cache: False ise yanıt sunucu tarafı önbelleğe alınmaz.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = current_versions(tables)
+            etag = _compute_etag(versions, extra)
+            last_modified = _last_modified(versions)
+
+            matched = _matching_etag(etag)
+            not_modified = matched is not None
+            if not request.if_none_match and request.if_modified_since and last_modified:
+                not_modified = last_modified <= request.if_modified_since
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+                response.headers["ETag"] = f'"{matched or etag}"'
+            else:
+                entry = response_cache.get(request_key(), etag) if cache else None
+                if entry is not None:
+                    response = current_app.response_class(entry["body"], mimetype=entry["mimetype"])
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    if cache and response.mimetype == "application/json":
+                        response_cache.put(request_key(), tables, etag, response.get_data(), response.mimetype)
+                response.set_etag(etag)
+
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers["Cache-Control"] = (
+                f"public, max-age={max_age}" if max_age is not None else "no-cache"
+            )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,285 @@
+"""
+Model envanteri içe aktarma (Excel / CSV / NDJSON).
+
+Dosyadaki satırlar ModelInventory, ModelVariable ve ModelRollout tablolarına doğal
+anahtarla eşlenip upsert edilir:
+  models    -> model_name
+  variables -> (model, variable_name)
+  rollout   -> (model, rollout_percentage)
+Alt kayıtlarda model `model_id` ya da `model_name` kolonuyla belirtilir; aynı
+çalışma kitabında yeni eklenen modeller de kullanılabilir (models sayfası önce işlenir).
+Kolon adları tablo kolonlarıdır (büyük/küçük harf, boşluk/alt çizgi farkı önemsiz);
+dosyada olmayan kolonlara dokunulmaz, boş hücre değeri temizler.
+
+Satırlar CHUNK_SIZE'lık parçalar halinde işlenir: parçadaki mevcut kayıtlar tek
+SELECT ile bulunur, yalnızca değişen alanlar executemany UPDATE ile, yeni kayıtlar
+INSERT ile yazılır; her parça ayrı transaction'da commit edilir. Core yazımları
+mapper event'lerini atladığından dashboard sayaçları ve arama dokümanları parça
+başına açıkça güncellenir, alert durumu en sonda etkilenen modeller için (yine
+CHUNK_SIZE'lık parçalarla, tek transaction'da) yenilenir. dry_run'da hiçbir şey
+yazılmaz; yapılacak değişiklikler raporlanır.
+"""
+from datetime import date
+from sqlalchemy import select, insert, update, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from models import db
+from models.scorecard import ModelInventory, ModelVariable, ModelRollout
+from services.alerts import refresh_alert_state
+from services.search import refresh_documents
+from services.summary import MODEL_ATTRS, apply_model_changes
+from services.tabular import blank_to_none, to_bool, to_date, to_float, to_int
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 500
+MAX_REPORTED_CHANGES = 1000
+
+# Varlık -> (model, doğal anahtar kolonları, arama dokümanı türü)
+ENTITIES = {
+    "models": (ModelInventory, ("model_name",), "model"),
+    "variables": (ModelVariable, ("model_id", "variable_name"), "variable"),
+    "rollout": (ModelRollout, ("model_id", "rollout_percentage"), None),
+}
+
+_SKIP_COLUMNS = frozenset({"id", "created_at", "updated_at"})
+
+
+def _field(name):
+    return str(name).strip().lower().replace(" ", "_")
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _text_converter(column):
+    length = getattr(column.type, "length", None)
+
+    def convert(value):
+        value = blank_to_none(value)
+        if value is None:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)  # Excel sayı hücresi (ör. ürün kodu)
+        value = str(value)
+        if length and len(value) > length:
+            raise ValueError(f"En fazla {length} karakter olabilir")
+        return value
+    return convert
+
+
+def _converter(column):
+    python_type = column.type.python_type
+    if python_type is bool:
+        return to_bool
+    if python_type is int:
+        return to_int
+    if python_type is float:
+        return to_float
+    if python_type is date:
+        return to_date
+    return _text_converter(column)
+
+
+class _EntityImport:
+    """Tek varlığın satırlarını parça parça işler ve raporlar."""
+
+    def __init__(self, entity, context, dry_run):
+        self.entity = entity
+        self.model, self.key_fields, self.search_entity = ENTITIES[entity]
+        self.table = self.model.__table__
+        self.context = context
+        self.dry_run = dry_run
+        self.is_child = "model_id" in self.key_fields
+        columns = [c for c in self.table.columns if c.name not in _SKIP_COLUMNS and c.name != "model_id"]
+        self.converters = {c.name: _converter(c) for c in columns}
+        self.required = [c.name for c in columns if not c.nullable and c.default is None]
+        self.ignored = set()
+        self.report = {
+            "rows": 0, "inserted": 0, "updated": 0, "unchanged": 0,
+            "error_count": 0, "errors": [], "changes": [],
+        }
+
+    def add_error(self, line, message):
+        self.report["error_count"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"line": line, "error": message})
+
+    def add_change(self, line, action, key, fields):
+        if len(self.report["changes"]) < MAX_REPORTED_CHANGES:
+            self.report["changes"].append({
+                "line": line, "action": action,
+                "key": [_plain(part) for part in key],
+                "fields": {name: [_plain(old), _plain(new)] for name, (old, new) in fields.items()},
+            })
+
+    # ── Satır ──
+
+    def _resolve_model(self, record):
+        model_id = to_int(record.pop("model_id", None))
+        model_name = blank_to_none(record.pop("model_name", None))
+        if model_id is not None:
+            if model_id not in self.context["model_id_set"]:
+                raise ValueError(f"Model bulunamadı: {model_id}")
+            return model_id
+        if model_name is None:
+            raise ValueError("model_id ya da model_name zorunludur")
+        model_name = str(model_name)
+        ids = self.context["models"].get(model_name, [])
+        if len(ids) > 1:
+            raise ValueError(f"Birden çok model aynı ada sahip: {model_name}")
+        if ids:
+            return ids[0]
+        if model_name in self.context["pending"]:
+            return ("yeni", model_name)  # dry_run: bu içe aktarmada eklenecek model
+        raise ValueError(f"Model bulunamadı: {model_name}")
+
+    def parse(self, record):
+        """(anahtar, değerler) — geçersizse ValueError."""
+        record = {_field(name): value for name, value in record.items()}
+        values = {}
+        if self.is_child:
+            values["model_id"] = self._resolve_model(record)
+        for name, raw in record.items():
+            converter = self.converters.get(name)
+            if converter is None:
+                self.ignored.add(name)
+                continue
+            try:
+                values[name] = converter(raw)
+            except ValueError as exc:
+                raise ValueError(f"{name}: {exc}") from None
+        for name in self.key_fields:
+            if values.get(name) is None:
+                raise ValueError(f"{name} zorunludur")
+        return tuple(values[name] for name in self.key_fields), values
+
+    # ── Parça ──
+
+    def _existing(self, keys):
+        """Anahtar -> mevcut satırlar (mapping)."""
+        found = {}
+        lookup = [key for key in keys if not isinstance(key[0], tuple)]  # dry_run'daki yeni modeller hariç
+        key_columns = [self.table.c[name] for name in self.key_fields]
+        for start in range(0, len(lookup), CHUNK_SIZE):
+            batch = lookup[start:start + CHUNK_SIZE]
+            if len(key_columns) == 1:
+                condition = key_columns[0].in_([key[0] for key in batch])
+            else:
+                condition = tuple_(*key_columns).in_(batch)
+            for row in db.session.execute(select(*self.table.columns).where(condition)).mappings():
+                found.setdefault(tuple(row[name] for name in self.key_fields), []).append(row)
+        return found
+
+    def flush(self, chunk):
+        existing = self._existing(list(chunk))
+        updates, inserts, insert_lines, summary_pairs = [], [], {}, []
+        for key, (line, values) in chunk.items():
+            rows = existing.get(key, [])
+            if len(rows) > 1:
+                self.add_error(line, "Anahtar birden çok kayıtla eşleşiyor")
+                continue
+            if rows:
+                row = rows[0]
+                diff = {name: (row[name], value) for name, value in values.items() if row[name] != value}
+                if not diff:
+                    self.report["unchanged"] += 1
+                    continue
+                updates.append({"id": row["id"], **{name: new for name, (_, new) in diff.items()}})
+                self.add_change(line, "update", key, diff)
+                if self.entity == "models":
+                    old = {name: row[name] for name in MODEL_ATTRS}
+                    summary_pairs.append((old, {**old, **{k: v for k, v in values.items() if k in MODEL_ATTRS}}))
+            else:
+                missing = [name for name in self.required if values.get(name) is None]
+                if missing:
+                    self.add_error(line, f"Zorunlu alan eksik: {', '.join(missing)}")
+                    continue
+                inserts.append(values)
+                insert_lines[key] = line
+                self.add_change(line, "insert", key, {name: (None, value) for name, value in values.items()})
+
+        if self.dry_run:
+            if self.entity == "models":
+                self.context["pending"].update(values["model_name"] for values in inserts)
+            self.report["inserted"] += len(inserts)
+            self.report["updated"] += len(updates)
+            return
+
+        try:
+            if updates:
+                db.session.execute(update(self.model), updates)
+            if inserts:
+                db.session.execute(insert(self.model), inserts)
+            inserted = self._existing(list(insert_lines)) if inserts else {}
+            new_ids = [row["id"] for rows in inserted.values() for row in rows]
+            if self.entity == "models":
+                for rows in inserted.values():
+                    summary_pairs.extend((None, {name: row[name] for name in MODEL_ATTRS}) for row in rows)
+                apply_model_changes(summary_pairs)
+            if self.search_entity:
+                refresh_documents(self.search_entity, [u["id"] for u in updates] + new_ids)
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            for line, _ in chunk.values():
+                self.add_error(line, f"Yazılamadı: {exc.__class__.__name__}")
+            return
+
+        self.report["inserted"] += len(inserts)
+        self.report["updated"] += len(updates)
+        if self.entity == "models":
+            for (name,), rows in inserted.items():
+                self.context["models"].setdefault(name, []).extend(row["id"] for row in rows)
+                self.context["model_id_set"].update(row["id"] for row in rows)
+            self.context["touched"].update(u["id"] for u in updates)
+            self.context["touched"].update(new_ids)
+
+    def run(self, records):
+        chunk = {}  # anahtar -> (satır no, değerler); parça içinde son satır geçerli
+        for line, record, error in records:
+            self.report["rows"] += 1
+            if error is None:
+                try:
+                    key, values = self.parse(record)
+                except (ValueError, TypeError) as exc:
+                    error = str(exc)
+            if error is not None:
+                self.add_error(line, error)
+                continue
+            chunk[key] = (line, values)
+            if len(chunk) >= CHUNK_SIZE:
+                self.flush(chunk)
+                chunk = {}
+        if chunk:
+            self.flush(chunk)
+        self.report["ignored_columns"] = sorted(self.ignored)
+        return self.report
+
+
+def run_import(sources, dry_run=False):
+    """
+    sources: [(varlık, iter_records çıktısı)] — ENTITIES sırasıyla işlenir.
+    Dönüş: {dry_run, entities: {varlık: {rows, inserted, updated, unchanged, error_count,
+            errors, changes, ignored_columns}}}
+    """
+    models = {}
+    for model_id, model_name in db.session.execute(select(ModelInventory.id, ModelInventory.model_name)):
+        models.setdefault(model_name, []).append(model_id)
+    context = {
+        "models": models,
+        "model_id_set": {model_id for ids in models.values() for model_id in ids},
+        "pending": set(),
+        "touched": set(),
+    }
+
+    order = list(ENTITIES)
+    report = {"dry_run": dry_run, "entities": {}}
+    for entity, records in sorted(sources, key=lambda source: order.index(source[0])):
+        report["entities"][entity] = _EntityImport(entity, context, dry_run).run(records)
+
+    if context["touched"]:
+        touched = sorted(context["touched"])
+        for start in range(0, len(touched), CHUNK_SIZE):  # Oracle IN listesi sınırı (1000) altında
+            refresh_alert_state(touched[start:start + CHUNK_SIZE])
+        db.session.commit()
+    return report
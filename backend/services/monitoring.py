@@ -0,0 +1,201 @@
+"""
+Model izleme metrikleri (NumPy ile vektörel).
+
+Gini / AUC: skorlar sıralanır (O(n log n)), eşit skorlu örnekler tek grup sayılır
+ve her grubun iyi/kötü ağırlıkları bincount ile toplanır. AUC, kötü bir örneğin iyi
+bir örnekten daha riskli skorlanma olasılığıdır (eşitlikte yarım puan):
+
+    AUC = Σ_g kötü_g · (iyi_<g + ½ · iyi_g) / (Σ kötü · Σ iyi),   Gini = 2·AUC − 1
+
+Skorkart puanlarında yüksek skor düşük risktir (higher_is_better=True); PD gibi
+yüksek değerin riskli olduğu skorlarda False verilir. Hedef 1 = kötü (temerrüt).
+
+PSI: referans (geliştirme) skorları bir kez kantil bin'lere bölünür; yeni örneklem
+aynı iç sınırlarla bin indeksine (az sınırda karşılaştırma toplamı, değilse
+searchsorted) ve bincount ile histograma çevrilir:
+
+    PSI = Σ_b (gerçek_b − beklenen_b) · ln(gerçek_b / beklenen_b)
+
+Boş bin'ler PSI_EPSILON oranına yükseltilir (log(0) yerine).
+
+CSI: aynı formül değişken başına. Bir modelin tüm değişkenleri tek seferde işlenir:
+her değişkenin bin indeksi kendi ofsetiyle kaydırılır, tüm matris tek bincount ile
+sayılır ve terimler np.add.reduceat ile değişken başına toplanır. Eksik değerler
+(NaN) her değişkenin son bin'idir.
+"""
+import numpy as np
+
+PSI_EPSILON = 1e-4
+
+
+def _valid_sample(scores, targets, weights):
+    scores = np.asarray(scores, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    if scores.shape != targets.shape:
+        raise ValueError("Skor ve hedef uzunlukları eşit değil")
+    valid = ~(np.isnan(scores) | np.isnan(targets))
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != scores.shape:
+            raise ValueError("Ağırlık uzunluğu skor uzunluğuna eşit değil")
+        valid &= ~np.isnan(weights)
+    dropped = int(scores.size - np.count_nonzero(valid))
+    if dropped:
+        scores, targets = scores[valid], targets[valid]
+        weights = weights[valid] if weights is not None else None
+
+    if not np.isin(targets, (0.0, 1.0)).all():
+        raise ValueError("Hedef değişken 0 ya da 1 olmalıdır")
+    if weights is None:
+        weights = np.ones_like(scores)
+    elif (weights < 0).any():
+        raise ValueError("Ağırlıklar negatif olamaz")
+    return scores, targets, weights, dropped
+
+
+def gini_auc(scores, targets, weights=None, higher_is_better=True):
+    """
+    Ağırlıklı, eşitlik düzeltmeli AUC ve Gini.
+    Dönüş: {auc, gini, sample_size, weighted_size, bad_count, target_ratio, dropped}
+    NaN içeren satırlar atılır (dropped).
+    """
+    scores, targets, weights, dropped = _valid_sample(scores, targets, weights)
+    if scores.size == 0:
+        raise ValueError("Geçerli satır yok")
+
+    risk = -scores if higher_is_better else scores
+    order = np.argsort(risk)
+    risk = risk[order]
+    # Eşit skorlar aynı grup: grup numarası her skor değişiminde artar
+    group = np.empty(risk.size, dtype=np.intp)
+    group[0] = 0
+    np.cumsum(risk[1:] != risk[:-1], out=group[1:])
+
+    bad_weights = (weights * targets)[order]
+    good_weights = weights[order] - bad_weights
+    bad = np.bincount(group, weights=bad_weights)
+    good = np.bincount(group, weights=good_weights)
+    total_bad, total_good = bad.sum(), good.sum()
+    if total_bad <= 0 or total_good <= 0:
+        raise ValueError("Örneklemde hem 0 hem 1 hedefli kayıt bulunmalıdır")
+
+    good_below = np.cumsum(good) - good
+    auc = float(np.dot(bad, good_below + 0.5 * good) / (total_bad * total_good))
+    return {
+        "auc": auc,
+        "gini": 2 * auc - 1,
+        "sample_size": int(scores.size),
+        "weighted_size": float(total_bad + total_good),
+        "bad_count": int(np.count_nonzero(targets)),
+        "target_ratio": float(total_bad / (total_bad + total_good)),
+        "dropped": dropped,
+    }
+
+
+def _clean_scores(scores, weights):
+    scores = np.asarray(scores, dtype=np.float64)
+    valid = ~np.isnan(scores)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != scores.shape:
+            raise ValueError("Ağırlık uzunluğu skor uzunluğuna eşit değil")
+        valid &= ~np.isnan(weights)
+        weights = weights[valid]
+        if (weights < 0).any():
+            raise ValueError("Ağırlıklar negatif olamaz")
+    scores = scores[valid]
+    if scores.size == 0:
+        raise ValueError("Geçerli skor yok")
+    return scores, weights
+
+
+# Bu kadar sınıra kadar bin indeksi karşılaştırmaların toplamıyla bulunur (searchsorted'dan hızlı)
+_COMPARE_MAX_EDGES = 32
+
+
+def _bin_index(edges, values, out=None):
+    """bin i: edges[i-1] <= değer < edges[i]; NaN için 0 (çağıran ayrıca işaretler)."""
+    if len(edges) > _COMPARE_MAX_EDGES:
+        if out is None:
+            return np.searchsorted(edges, values, side="right")
+        out[:] = np.searchsorted(edges, values, side="right")
+        return out
+    if out is None:
+        out = np.zeros(values.shape, dtype=np.intp)
+    else:
+        out.fill(0)
+    for edge in edges:
+        out += values >= edge
+    return out
+
+
+def bin_distribution(scores, edges, weights=None):
+    """İç sınırlara göre bin oranları; bin i: edges[i-1] <= skor < edges[i]."""
+    index = _bin_index(edges, scores)
+    counts = np.bincount(index, weights=weights, minlength=len(edges) + 1)
+    total = counts.sum()
+    if total <= 0:
+        raise ValueError("Toplam ağırlık sıfır")
+    return counts / total
+
+
+def psi_bins(scores, weights=None, bins=10):
+    """Referans skorlarından (iç sınırlar, beklenen oranlar). Tekrarlanan kantiller birleştirilir."""
+    scores, weights = _clean_scores(scores, weights)
+    quantiles = np.quantile(scores, np.linspace(0, 1, bins + 1)[1:-1])
+    edges = np.unique(quantiles)
+    return edges, bin_distribution(scores, edges, weights)
+
+
+def psi(scores, edges, expected, weights=None):
+    """Örneklemin referansa göre PSI'ı: (psi, gerçek oranlar, kullanılan satır sayısı)."""
+    scores, weights = _clean_scores(scores, weights)
+    edges = np.asarray(edges, dtype=np.float64)
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), PSI_EPSILON)
+    actual = bin_distribution(scores, edges, weights)
+    floored = np.maximum(actual, PSI_EPSILON)
+    value = float(np.sum((floored - expected) * np.log(floored / expected)))
+    return value, actual, int(scores.size)
+
+
+def csi_bins(values, bins=10):
+    """Değişkenin referans dağılımı: (iç sınırlar, oranlar) — oranların sonuncusu eksik değer payı."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        raise ValueError("Geçerli satır yok")
+    present = values[~np.isnan(values)]
+    if present.size:
+        edges = np.unique(np.quantile(present, np.linspace(0, 1, bins + 1)[1:-1]))
+    else:
+        edges = np.empty(0)
+    return edges, _csi_counts(values[:, None], [edges])[0] / values.size
+
+
+def _csi_counts(matrix, edges_list):
+    """Her değişken için bin sayıları (eksik bin dahil) — tek bincount ile."""
+    sizes = np.array([len(edges) + 2 for edges in edges_list])
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    # Değişken başına bitişik satırlar (kolon yazımı strided olmasın)
+    index = np.empty((matrix.shape[1], matrix.shape[0]), dtype=np.intp)
+    for column, edges in enumerate(edges_list):
+        values = np.ascontiguousarray(matrix[:, column])
+        bins = _bin_index(edges, values, out=index[column])
+        bins[np.isnan(values)] = len(edges) + 1
+        bins += offsets[column]
+    counts = np.bincount(index.ravel(), minlength=int(sizes.sum()))
+    return np.split(counts, offsets[1:])
+
+
+def csi(matrix, edges_list, expected_list):
+    """
+    matrix: satır x değişken (NaN = eksik). Dönüş: (değişken başına CSI dizisi, gerçek oranlar listesi).
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise ValueError("Geçerli satır yok")
+    actual = [counts / matrix.shape[0] for counts in _csi_counts(matrix, edges_list)]
+    offsets = np.concatenate(([0], np.cumsum([len(a) for a in actual])[:-1]))
+    flat_actual = np.maximum(np.concatenate(actual), PSI_EPSILON)
+    flat_expected = np.maximum(np.concatenate(expected_list), PSI_EPSILON)
+    terms = (flat_actual - flat_expected) * np.log(flat_actual / flat_expected)
+    return np.add.reduceat(terms, offsets), actual
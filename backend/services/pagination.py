@@ -0,0 +1,181 @@
+"""
+Liste endpoint'leri için sayfalama.
+
+Keyset (cursor): satırlar (updated_at DESC, id DESC) sırasıyla döner. Cursor, sayfanın
+ilk/son satırının (updated_at, id) değerini taşıyan opak bir base64 token'dır; sonraki
+sayfa OFFSET olmadan doğrudan bu değerden itibaren okunur, böylece derin sayfalar ilk
+sayfa kadar ucuzdur. Oracle (a, b) < (x, y) satır karşılaştırmasını desteklemediği
+için koşul OR/AND ile açılır. updated_at insert'te her zaman doldurulur (kolon default'u).
+
+Toplam kayıt sayısı her istekte COUNT(*) ile hesaplanmaz: filtre kombinasyonu ve tablo
+versiyonu başına bir kez sayılıp worker içinde saklanır.
+"""
+import base64
+import binascii
+import json
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app, request
+from sqlalchemy import and_, or_
+from services.response_cache import request_key
+from services.versioning import current_versions
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+PAGING_ARGS = frozenset({"cursor", "limit", "page", "per_page"})
+
+_COUNT_CACHE_SIZE = 256
+_counts = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ── Cursor ──
+
+def encode_cursor(sort_value, row_id, direction):
+    payload = {
+        "v": sort_value.isoformat() if sort_value is not None else None,
+        "id": row_id,
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """(sort_value, id, direction) — bozuk token için InvalidCursor."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        sort_value = datetime.fromisoformat(payload["v"]) if payload["v"] is not None else None
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return sort_value, int(payload["id"]), direction
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Geçersiz cursor") from exc
+
+
+def _after(sort_column, id_column, sort_value, row_id):
+    # (sort, id) < (sort_value, row_id)
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+
+
+def _before(sort_column, id_column, sort_value, row_id):
+    # (sort, id) > (sort_value, row_id)
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+
+
+def keyset_page(query, sort_column, id_column, limit, cursor=None, row_key=None):
+    """
+    Tek keyset sayfası: (rows, next_cursor, prev_cursor).
+    row_key: satırdan sıralama kolonlarını taşıyan nesneyi döndürür (tuple sorgular için).
+    """
+    row_key = row_key or (lambda row: row)
+    direction = "next"
+    if cursor:
+        sort_value, row_id, direction = decode_cursor(cursor)
+        condition = _before if direction == "prev" else _after
+        query = query.filter(condition(sort_column, id_column, sort_value, row_id))
+    backward = direction == "prev"
+
+    order = (sort_column.asc(), id_column.asc()) if backward else (sort_column.desc(), id_column.desc())
+    rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    def make_cursor(row, to):
+        item = row_key(row)
+        return encode_cursor(getattr(item, sort_column.key), getattr(item, id_column.key), to)
+
+    if backward:
+        prev_cursor = make_cursor(rows[0], "prev") if has_more else None
+        next_cursor = make_cursor(rows[-1], "next")
+    else:
+        next_cursor = make_cursor(rows[-1], "next") if has_more else None
+        prev_cursor = make_cursor(rows[0], "prev") if cursor else None
+    return rows, next_cursor, prev_cursor
+
+
+# ── Toplam ──
+
+def _filter_key():
+    endpoint, view_args, args = request_key()
+    return endpoint, view_args, tuple((k, v) for k, v in args if k not in PAGING_ARGS)
+
+
+def cached_count(query, tables):
+    """Filtrelenmiş sorgunun satır sayısı; tablolar değişene kadar tekrar sayılmaz."""
+    versions = current_versions(tables)
+    fingerprint = tuple(versions[name][0] for name in sorted(versions))
+    key = _filter_key()
+    with _counts_lock:
+        cached = _counts.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            _counts.move_to_end(key)
+            return cached[1]
+    total = query.order_by(None).count()
+    with _counts_lock:
+        _counts[key] = (fingerprint, total)
+        _counts.move_to_end(key)
+        while len(_counts) > _COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return total
+
+
+# ── Endpoint akışı ──
+
+def paginate_listing(query, sort_column, id_column, tables, serialize, row_key=None):
+    """
+    Liste endpoint'lerinin ortak sayfalama akışı; JSON'a çevrilecek payload döner.
+
+    - cursor / limit: keyset sayfası {items, next_cursor, prev_cursor, limit, total}
+    - page / per_page: OFFSET sayfası (eski istemciler için, COUNT önbellekten)
+    - hiçbiri: kayıt sayısı LIST_UNPAGED_MAX'ı aşmıyorsa tüm liste (düz dizi — küçük
+      tablolarda sayfalama istemeyen istemcilerin yanıt biçimi değişmez); aşıyorsa ilk
+      keyset sayfası. Sınır, en fazla LIST_UNPAGED_MAX + 1 satır okunarak anlaşılır (COUNT yok).
+    """
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
+    page = request.args.get("page", type=int)
+
+    if page is not None and not cursor:
+        per_page = request.args.get("per_page", 20, type=int)
+        pagination = query.order_by(None).order_by(sort_column.desc(), id_column.desc()).paginate(
+            page=page, per_page=per_page, error_out=False, count=False
+        )
+        total = cached_count(query, tables)
+        return {
+            "items": [serialize(item) for item in pagination.items],
+            "total": total,
+            "page": pagination.page,
+            "per_page": pagination.per_page,
+            "pages": math.ceil(total / pagination.per_page) if pagination.per_page else 0,
+        }
+
+    if cursor is None and limit is None:
+        unpaged_max = current_app.config["LIST_UNPAGED_MAX"]
+        ordered = query.order_by(None).order_by(sort_column.desc(), id_column.desc())
+        items = ordered.limit(unpaged_max + 1).all()
+        if len(items) <= unpaged_max:
+            return [serialize(item) for item in items]
+
+    total = cached_count(query, tables)
+    limit = min(max(limit or DEFAULT_LIMIT, 1), MAX_LIMIT)
+    rows, next_cursor, prev_cursor = keyset_page(query, sort_column, id_column, limit, cursor, row_key)
+    return {
+        "items": [serialize(row) for row in rows],
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "limit": limit,
+        "total": total,
+    }
@@ -0,0 +1,181 @@
+"""
+PSI izleme: referans dağılımı, dönemlik PSI geçmişi ve psi_flag.
+
+Her modelin referans bin sınırları (`psi_baseline`) bir kez geliştirme örnekleminden
+hesaplanıp saklanır; worker içinde NumPy dizisi olarak önbelleğe alınır ve tablo
+versiyonu değişene kadar tekrar okunmaz. Dönem sonucu `psi_history`'ye yazılır
+((model, dönem) üzerinden upsert); modelin en güncel dönemindeki PSI eşiği aşıyorsa
+`psi_flag` açılır, altındaysa kapanır. psi_flag ORM üzerinden değiştiği için dashboard
+sayaçları event'lerle güncellenir; alert durumu toplu işte bir kez yenilenir. Model id
+listeleri Oracle IN sınırı için _IN_BATCH'lik parçalarla sorgulanır.
+"""
+import json
+import threading
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+from models import db
+from models.scorecard import ModelInventory, PsiBaseline, PsiHistory
+from services.alerts import refresh_alert_state
+from services.monitoring import psi, psi_bins
+from services.timeseries import parse_period
+from services.versioning import current_versions, uncommitted_tables
+
+_BASELINE_TABLE = PsiBaseline.__tablename__
+_IN_BATCH = 500  # Oracle IN listesi sınırı (1000) altında
+_baselines = {}    # model_id -> (iç sınırlar, beklenen oranlar)
+_baselines_version = None
+_baselines_lock = threading.Lock()
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), _IN_BATCH):
+        yield ids[start:start + _IN_BATCH]
+
+
+def psi_status(value):
+    if value >= current_app.config["PSI_ALERT_THRESHOLD"]:
+        return "alert"
+    if value >= current_app.config["PSI_WARNING_THRESHOLD"]:
+        return "warning"
+    return "stable"
+
+
+# ── Referans dağılımı ──
+
+def save_baseline(model_id, scores, weights=None, bins=None):
+    """Geliştirme skorlarından referans bin'lerini hesapla ve kaydet (commit çağırana bırakılır)."""
+    edges, expected = psi_bins(scores, weights, bins or current_app.config["PSI_BINS"])
+    baseline = PsiBaseline.query.filter_by(model_id=model_id).first()
+    if baseline is None:
+        baseline = PsiBaseline(model_id=model_id)
+        db.session.add(baseline)
+    baseline.bin_edges = json.dumps(edges.tolist())
+    baseline.expected = json.dumps(expected.tolist())
+    baseline.sample_size = int(np.count_nonzero(~np.isnan(np.asarray(scores, dtype=np.float64))))
+    db.session.flush()
+    return baseline
+
+
+def load_baselines(model_ids):
+    """model_id -> (sınırlar, beklenen) — referansı olmayan modeller sözlükte yer almaz."""
+    global _baselines_version
+    version = current_versions([_BASELINE_TABLE])[_BASELINE_TABLE][0]
+    with _baselines_lock:
+        if version != _baselines_version:
+            _baselines.clear()
+            _baselines_version = version
+        found = {model_id: _baselines[model_id] for model_id in model_ids if model_id in _baselines}
+
+    missing = [model_id for model_id in model_ids if model_id not in found]
+    if missing:
+        loaded = {}
+        for chunk in _chunks(missing):
+            for model_id, edges, expected in db.session.execute(
+                select(PsiBaseline.model_id, PsiBaseline.bin_edges, PsiBaseline.expected)
+                .where(PsiBaseline.model_id.in_(chunk))
+            ):
+                loaded[model_id] = (np.array(json.loads(edges), dtype=np.float64), np.array(json.loads(expected)))
+        with _baselines_lock:
+            if version == _baselines_version and _BASELINE_TABLE not in uncommitted_tables():
+                _baselines.update(loaded)
+        found.update(loaded)
+    return found
+
+
+# ── Dönem hesabı ──
+
+def _period_key(period):
+    parsed = parse_period(period)
+    return (1, parsed[0], period) if parsed else (0, 0, period)
+
+
+def _sync_flags(model_ids):
+    """Her modelin en güncel PSI dönemine göre psi_flag'i ayarla; değişen model id'leri."""
+    latest = {}
+    for chunk in _chunks(model_ids):
+        for model_id, period, value in db.session.execute(
+            select(PsiHistory.model_id, PsiHistory.period, PsiHistory.psi_value)
+            .where(PsiHistory.model_id.in_(chunk))
+        ):
+            key = _period_key(period)
+            if model_id not in latest or key > latest[model_id][0]:
+                latest[model_id] = (key, value)
+
+    threshold = current_app.config["PSI_ALERT_THRESHOLD"]
+    changed = []
+    for chunk in _chunks(latest):
+        for model in ModelInventory.query.filter(ModelInventory.id.in_(chunk)):
+            flag = latest[model.id][1] >= threshold
+            if bool(model.psi_flag) != flag:
+                model.psi_flag = flag
+                changed.append(model.id)
+    return changed
+
+
+def record_psi(period, samples):
+    """
+    samples: model_id -> (skorlar, ağırlıklar | None). Referansı olan her model için PSI
+    hesaplanıp dönem kaydına yazılır. Dönüş: ({model_id: sonuç}, {model_id: hata}).
+    Commit çağırana bırakılır.
+    """
+    baselines = load_baselines(list(samples))
+    results, errors = {}, {}
+    for model_id, (scores, weights) in samples.items():
+        if model_id not in baselines:
+            errors[model_id] = "PSI referans dağılımı yok"
+            continue
+        edges, expected = baselines[model_id]
+        try:
+            value, actual, size = psi(scores, edges, expected, weights)
+        except ValueError as exc:
+            errors[model_id] = str(exc)
+            continue
+        results[model_id] = {
+            "psi_value": round(value, 6),
+            "psi_status": psi_status(value),
+            "sample_size": size,
+            "actual": json.dumps([round(p, 6) for p in actual.tolist()]),
+        }
+
+    if results:
+        existing = {}
+        for chunk in _chunks(results):
+            for record in PsiHistory.query.filter(PsiHistory.model_id.in_(chunk), PsiHistory.period == period):
+                existing.setdefault(record.model_id, []).append(record)
+        for model_id, values in results.items():
+            records = existing.get(model_id) or [PsiHistory(model_id=model_id, period=period)]
+            for record in records:
+                for key, value in values.items():
+                    setattr(record, key, value)
+                db.session.add(record)
+        db.session.flush()
+        changed = _sync_flags(list(results))
+        for chunk in _chunks(sorted(changed)):
+            refresh_alert_state(chunk)
+    return results, errors
+
+
+def split_by_model(model_ids, scores, weights=None):
+    """
+    Portföy örneklemini modellere böl: model_id -> (skorlar, ağırlıklar). Boş model_id
+    satırları atlanır; tam sayı olmayan model_id ValueError (int() sessizce keserdi).
+    """
+    model_ids = np.asarray(model_ids, dtype=np.float64)
+    valid = ~np.isnan(model_ids)
+    model_ids, scores = model_ids[valid], np.asarray(scores)[valid]
+    invalid = ~np.isfinite(model_ids) | (model_ids != np.trunc(model_ids))
+    if invalid.any():
+        samples = ", ".join(f"{value:g}" for value in np.unique(model_ids[invalid])[:5])
+        raise ValueError(f"model_id tam sayı olmalı: {samples}")
+    weights = np.asarray(weights)[valid] if weights is not None else None
+    order = np.argsort(model_ids, kind="stable")
+    sorted_ids = model_ids[order]
+    unique, starts = np.unique(sorted_ids, return_index=True)
+    bounds = list(starts[1:]) + [len(sorted_ids)]
+    samples = {}
+    for model_id, start, end in zip(unique, starts, bounds):
+        index = order[start:end]
+        samples[int(model_id)] = (scores[index], weights[index] if weights is not None else None)
+    return samples
@@ -0,0 +1,136 @@
+"""
+Validasyon raporu dosyaları — blob deposu ile kayıt arasındaki işlemler.
+
+Yeni yüklemeler depoya akıtılır ve kayıtta yalnızca özet/boyut tutulur.
+`file_data` kolonunda dosyası olan eski kayıtlar indirilebilir kalır;
+`flask migrate-blobs` bunları depoya taşıyıp kolonu boşaltır.
+
+Transaction'da yeni yazılan dosyalar session'da izlenir: transaction commit edilmeden
+biterse (rollback, hata) dosya — bu arada başka bir yükleme ona bağlanmadıysa — silinir.
+Kaydı silinen dosya yalnızca son BLOB_GC_GRACE_SECONDS içinde dokunulmamışsa hemen
+silinir; kalanları (ör. yarıda kalan yüklemeler) `flask gc-blobs` süpürür.
+"""
+import io
+import os
+import time
+from flask import current_app, send_file
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from models import db
+from models.scorecard import ValidationReport
+from services.blobstore import get_blob_store
+
+_NEW_BLOBS_KEY = "uncommitted_blobs"
+
+
+def _track_new_blob(store, digest, mtime_ns):
+    if mtime_ns is not None:
+        db.session.info.setdefault(_NEW_BLOBS_KEY, []).append((store, digest, mtime_ns))
+
+
+@event.listens_for(Session, "after_commit")
+def _blobs_committed(session):
+    session.info.pop(_NEW_BLOBS_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _blobs_rolled_back(session, transaction):
+    if transaction.parent is not None:
+        return
+    for store, digest, mtime_ns in session.info.pop(_NEW_BLOBS_KEY, ()):
+        store.collect(digest, expected_mtime_ns=mtime_ns)
+
+
+def attach_upload(report, file_obj):
+    """Yüklenen dosyayı (werkzeug FileStorage) depoya yaz, kaydı güncelle."""
+    store = get_blob_store()
+    digest, size, created = store.save(file_obj.stream)
+    _track_new_blob(store, digest, created)
+    report.file_hash = digest
+    report.file_size = size
+    report.file_mimetype = file_obj.mimetype
+    report.file_path = file_obj.filename
+    report.file_data = None
+
+
+def send_report_file(report):
+    """Dosyayı sun; dosya yoksa None. Depodaki dosyalar yoldan, Range/ETag destekli."""
+    mimetype = report.file_mimetype or "application/octet-stream"
+    filename = report.file_path or report.report_name
+
+    if report.file_hash:
+        path = get_blob_store().path(report.file_hash)
+        if not os.path.exists(path):
+            return None
+        # İçerik adresli: özet aynı zamanda strong ETag
+        return send_file(path, mimetype=mimetype, as_attachment=True, download_name=filename,
+                         etag=report.file_hash, conditional=True)
+
+    data = db.session.execute(
+        select(ValidationReport.file_data).where(ValidationReport.id == report.id)
+    ).scalar()
+    if not data:
+        return None
+    return send_file(io.BytesIO(data), mimetype=mimetype, as_attachment=True, download_name=filename)
+
+
+def _grace_cutoff():
+    return time.time() - current_app.config["BLOB_GC_GRACE_SECONDS"]
+
+
+def release_file(digest):
+    """
+    Başka rapor aynı içeriği kullanmıyorsa dosyayı depodan sil (commit sonrası çağrılır).
+    Yakın zamanda dokunulan dosya (commit bekleyen bir yükleme bağlanmış olabilir) kalır.
+    """
+    if not digest:
+        return
+    in_use = db.session.execute(
+        select(ValidationReport.id).where(ValidationReport.file_hash == digest).limit(1)
+    ).first()
+    if in_use is None:
+        get_blob_store().collect(digest, older_than=_grace_cutoff())
+
+
+def collect_unreferenced_files():
+    """Hiçbir kayda bağlı olmayan, bekleme süresini aşmış dosyaları ve geçici dosyaları sil."""
+    store = get_blob_store()
+    cutoff = _grace_cutoff()
+    removed = 0
+    digests = list(store.digests())
+    for start in range(0, len(digests), 1000):  # Oracle IN listesi sınırı
+        batch = digests[start:start + 1000]
+        referenced = set(db.session.execute(
+            select(ValidationReport.file_hash).where(ValidationReport.file_hash.in_(batch))
+        ).scalars())
+        removed += sum(store.collect(digest, older_than=cutoff) for digest in batch if digest not in referenced)
+    return removed, store.purge_tmp(cutoff)
+
+
+def migrate_report_files():
+    """file_data'daki eski dosyaları depoya taşı; her kayıt ayrı commit. (taşınan, byte)"""
+    store = get_blob_store()
+    report_ids = db.session.execute(
+        select(ValidationReport.id).where(
+            ValidationReport.file_data.isnot(None), ValidationReport.file_hash.is_(None)
+        )
+    ).scalars().all()
+
+    migrated = total_bytes = 0
+    for report_id in report_ids:
+        # Bellekte aynı anda tek dosya bulunur
+        data = db.session.execute(
+            select(ValidationReport.file_data).where(ValidationReport.id == report_id)
+        ).scalar()
+        digest, size, created = store.save(io.BytesIO(data))
+        _track_new_blob(store, digest, created)
+        del data
+        db.session.execute(
+            update(ValidationReport)
+            .where(ValidationReport.id == report_id)
+            .values(file_hash=digest, file_size=size, file_data=None)
+        )
+        db.session.commit()
+        migrated += 1
+        total_bytes += size
+    return migrated, total_bytes
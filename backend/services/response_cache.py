@@ -0,0 +1,109 @@
+"""
+Sunucu tarafı, işlem içi (in-process) LRU yanıt önbelleği.
+
+Anahtar: endpoint + path parametreleri + normalize edilmiş query string.
+Her kayıt bağlı olduğu tabloları ve üretildiği andaki ETag'i (tablo
+`data_version` değerlerinden türetilir) taşır. CRUD handler'ları bu tablolara yazıp commit ettiğinde ilgili kayıtlar
+hemen silinir; diğer worker'larda yapılan yazımlar ise okuma anındaki versiyon
+karşılaştırmasıyla yakalanır. Boyut hem kayıt sayısı hem toplam byte ile sınırlıdır.
+"""
+import threading
+from collections import OrderedDict
+from flask import request
+
+
+class ResponseCache:
+
+    def __init__(self, max_entries=512, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def configure(self, config):
+        self.max_entries = config.get("RESPONSE_CACHE_MAX_ENTRIES", self.max_entries)
+        self.max_bytes = config.get("RESPONSE_CACHE_MAX_BYTES", self.max_bytes)
+        self.clear()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["etag"] != etag:
+                # Başka bir worker'da yazım olmuş — kayıt bayat
+                self._remove(key)
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, tables, etag, body, mimetype):
+        size = len(body)
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {"tables": frozenset(tables), "etag": etag, "body": body, "mimetype": mimetype}
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        """Verilen tablolardan herhangi birine bağlı tüm kayıtları sil."""
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if tables & entry["tables"]]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry["body"])
+
+
+def request_key():
+    """Endpoint + path parametreleri + sıralı query parametreleri."""
+    view_args = tuple(sorted((request.view_args or {}).items()))
+    args = tuple(sorted((k, v) for k, v in request.args.items(multi=True) if v != ""))
+    return request.endpoint, view_args, args
+
+
+response_cache = ResponseCache()
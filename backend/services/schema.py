@@ -0,0 +1,44 @@
+"""
+Şema güncelleme.
+
+`db.create_all()` yalnızca eksik tabloları oluşturur; mevcut tablolara sonradan
+eklenen kolon ve indeksleri eklemez. `upgrade_schema` metadata'yı veritabanıyla
+karşılaştırıp eksik nullable kolonları ALTER TABLE ile, eksik indeksleri
+CREATE INDEX ile ekler. NOT NULL kolonlar otomatik eklenmez, uyarı verilir.
+"""
+import logging
+from sqlalchemy import inspect, text
+from models import db
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema():
+    """Eksik kolon/indeksleri ekle; yapılan değişikliklerin listesini döndür."""
+    inspector = inspect(db.engine)
+    existing_tables = {name.lower() for name in inspector.get_table_names()}
+    changes = []
+    with db.engine.begin() as connection:
+        preparer = connection.dialect.identifier_preparer
+        for table in db.metadata.sorted_tables:
+            if table.name.lower() not in existing_tables:
+                continue
+            columns = {c["name"].lower() for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name.lower() in columns:
+                    continue
+                if not column.nullable:
+                    logger.warning("Column %s.%s is NOT NULL and must be added manually", table.name, column.name)
+                    continue
+                connection.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD {preparer.format_column(column)} {column.type.compile(dialect=connection.dialect)}"
+                ))
+                changes.append(f"column {table.name}.{column.name}")
+
+            indexes = {(i["name"] or "").lower() for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name.lower() not in indexes:
+                    index.create(connection)
+                    changes.append(f"index {index.name}")
+    return changes
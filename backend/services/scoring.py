@@ -0,0 +1,136 @@
+"""
+Toplu skorlama (kayıtlı model katsayılarıyla).
+
+Modelin değişkenleri bir kez "derlenir": katsayı vektörü, eğitim medyanları ve sabit
+terim NumPy dizileri olarak worker içinde önbelleğe alınır; `model_variable` versiyonu
+değişene kadar (değişken ekleme / güncelleme / silme, içe aktarma) tekrar okunmaz.
+Katsayısı boş değişkenler skora katılmaz. Adı INTERCEPT_NAMES'ten biri olan değişken
+(ör. "intercept") sabit terimdir; yalnızca katsayısı kullanılır.
+
+Örneklemde eksik değerler (NaN) ve hiç bulunmayan kolonlar `median_train` ile
+doldurulur; ardından tüm satırlar tek matris-vektör çarpımıyla skorlanır:
+
+    logit = X · β + β0,   olasılık = 1 / (1 + e^(−logit))
+"""
+import threading
+import numpy as np
+from sqlalchemy import select
+from models import db
+from models.scorecard import ModelVariable
+from services.versioning import current_versions, uncommitted_tables
+
+INTERCEPT_NAMES = frozenset({"intercept", "(intercept)", "const", "constant", "sabit"})
+
+_TABLES = (ModelVariable.__tablename__,)
+_compiled = {}     # model_id -> CompiledModel
+_compiled_version = None
+_compiled_lock = threading.Lock()
+
+
+class CompiledModel:
+    """Skorlamaya hazır katsayılar: ad listesi, katsayı ve medyan dizileri (medyanı boşsa NaN), sabit."""
+
+    __slots__ = ("names", "coefficients", "medians", "intercept")
+
+    def __init__(self, names, coefficients, medians, intercept):
+        self.names = names
+        self.coefficients = coefficients
+        self.medians = medians
+        self.intercept = intercept
+
+
+def compiled_model(model_id):
+    """Modelin derlenmiş katsayıları (worker içi önbellek); skorlanabilir değişken yoksa None."""
+    global _compiled_version
+    versions = current_versions(_TABLES)
+    fingerprint = tuple(versions[name][0] for name in _TABLES)
+    with _compiled_lock:
+        if fingerprint != _compiled_version:
+            _compiled.clear()
+            _compiled_version = fingerprint
+        cached = _compiled.get(model_id)
+    if cached is not None:
+        return cached
+
+    rows = db.session.execute(
+        select(ModelVariable.variable_name, ModelVariable.coefficient, ModelVariable.median_train)
+        .where(ModelVariable.model_id == model_id, ModelVariable.coefficient.is_not(None))
+        .order_by(ModelVariable.id)
+    ).all()
+    intercept = 0.0
+    names, coefficients, medians = [], [], []
+    for name, coefficient, median in rows:
+        if name.strip().lower() in INTERCEPT_NAMES:
+            intercept += coefficient
+            continue
+        names.append(name)
+        coefficients.append(coefficient)
+        medians.append(np.nan if median is None else median)
+    if not names:
+        return None
+
+    loaded = CompiledModel(
+        names, np.array(coefficients, dtype=np.float64), np.array(medians, dtype=np.float64), intercept,
+    )
+    with _compiled_lock:
+        if fingerprint == _compiled_version and not uncommitted_tables().intersection(_TABLES):
+            _compiled[model_id] = loaded
+    return loaded
+
+
+def score_columns(compiled, columns, intercept=None):
+    """
+    columns: değişken adı -> float64 dizisi. Dönüş: {rows, logit, probability, imputed, missing_columns}
+    — imputed: değişken -> medyanla doldurulan satır sayısı. Medyanı boş bir değişkende
+    eksik değer, sonsuz değer ya da sonlu olmayan skor (taşma) varsa ValueError.
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("Kolon uzunlukları eşit değil")
+    rows = lengths.pop() if lengths else 0
+    if rows == 0:
+        raise ValueError("Geçerli satır yok")
+
+    matrix = np.empty((rows, len(compiled.names)), dtype=np.float64, order="F")
+    imputed, missing_columns, no_median, infinite = {}, [], [], []
+    for index, (name, median) in enumerate(zip(compiled.names, compiled.medians.tolist())):
+        target = matrix[:, index]  # F düzeninde kolon bitişik
+        values = columns.get(name)
+        if values is None:
+            missing_columns.append(name)
+            target.fill(median)
+            count = rows
+        else:
+            np.copyto(target, values)
+            if np.isinf(target).any():
+                infinite.append(name)
+            gaps = np.isnan(target)
+            count = int(np.count_nonzero(gaps))
+            if count:
+                target[gaps] = median
+        if count:
+            if np.isnan(median):
+                no_median.append(name)
+            imputed[name] = count
+    if no_median:
+        raise ValueError(f"Eğitim medyanı olmayan değişkende eksik değer: {', '.join(no_median)}")
+    if infinite:
+        raise ValueError(f"Sonlu olmayan değer: {', '.join(infinite)}")
+
+    with np.errstate(over="ignore"):  # Taşma aşağıda sonlu olmayan skor olarak raporlanır
+        logit = matrix @ compiled.coefficients
+        logit += compiled.intercept if intercept is None else intercept
+    if not np.isfinite(logit).all():
+        raise ValueError("Skor sonlu değil (değerler çok büyük)")
+    probability = np.negative(logit)
+    with np.errstate(over="ignore"):  # Çok düşük logit: e^x = inf, olasılık 0
+        np.exp(probability, out=probability)
+    probability += 1.0
+    np.reciprocal(probability, out=probability)
+    return {
+        "rows": rows,
+        "logit": logit,
+        "probability": probability,
+        "imputed": imputed,
+        "missing_columns": missing_columns,
+    }
@@ -0,0 +1,347 @@
+"""
+Tam metin arama.
+
+Model envanteri, teknik kılavuz bölümleri ve model değişkenlerinin aranabilir metni
+`search_document` tablosunda tutulur; mapper event'leri kaynak satırın yazıldığı
+flush içinde dokümanı günceller. Metin indekslenmeden önce normalize edilir (küçük
+harf, aksan ve Türkçe karakter katlama: "Kartı" ~ "karti"). Normalizasyon karakter
+başına yapıldığı için eşleşme konumları orijinal metne aynen taşınır (snippet).
+
+İndeks dialect'e göre seçilir:
+- SQLite: FTS5 (external content, trigger'larla senkron), bm25 sıralaması
+- Oracle: Oracle Text CONTEXT indeksi (SYNC ON COMMIT), CONTAINS / SCORE
+- Diğer dialect'ler ya da indeks oluşturulamazsa: LIKE taraması
+
+Toplu Core yazımları event'leri atlar; `flask reindex-search` indeksi sıfırdan kurar.
+"""
+import logging
+import re
+import unicodedata
+from datetime import datetime, timezone
+from functools import lru_cache
+from sqlalchemy import event, inspect, select, insert, func, case, text, and_, column, table, literal_column
+from sqlalchemy.exc import DBAPIError
+from models import db
+from models.scorecard import ModelInventory, TechnicalGuide, ModelVariable
+from models.system import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+# entity -> (kaynak model, başlık alanı, gövde alanları, model_id alanı)
+SOURCES = {
+    "model": (ModelInventory, "model_name",
+              ("scorecard_category", "product_type", "owner", "development_table", "target_variable",
+               "description", "connected_processes", "dependency_warning"), "id"),
+    "technical": (TechnicalGuide, "section_title", ("section_type", "content", "query_code"), "model_id"),
+    "variable": (ModelVariable, "variable_name", ("variable_description", "notes"), "model_id"),
+}
+
+MAX_TERMS = 8
+_SNIPPET_BEFORE = 60
+_SNIPPET_AFTER = 140
+_REBUILD_BATCH = 500
+
+_documents = SearchDocument.__table__
+
+
+# ── Normalizasyon ──
+
+_FOLD_OVERRIDES = {"ı": "i", "İ": "i"}
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(char):
+    if char in _FOLD_OVERRIDES:
+        return _FOLD_OVERRIDES[char]
+    base = unicodedata.normalize("NFKD", char)[:1] or char
+    lower = base.lower()
+    # Uzunluk korunur: her karakter tek karaktere katlanır
+    return lower if len(lower) == 1 else base
+
+
+def normalize(value):
+    return "".join(map(_fold_char, value or ""))
+
+
+def search_terms(query):
+    """Sorgudan normalize edilmiş kelimeler (operatör / özel karakter içermez)."""
+    return re.findall(r"\w+", normalize(query))[:MAX_TERMS]
+
+
+# ── Doküman senkronizasyonu ──
+
+def _document(entity, target):
+    _, title_field, body_fields, model_field = SOURCES[entity]
+    title = getattr(target, title_field) or ""
+    parts = [title] + [str(value) for value in (getattr(target, f) for f in body_fields) if value]
+    body = "\n".join(parts)
+    return {
+        "entity": entity,
+        "entity_id": target.id,
+        "model_id": getattr(target, model_field),
+        "title": title[:300],
+        "text": body,
+        "title_key": normalize(title)[:300],
+        "content": normalize(body),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def _write(connection, entity, target):
+    document = _document(entity, target)
+    result = connection.execute(
+        _documents.update()
+        .where(_documents.c.entity == entity, _documents.c.entity_id == target.id)
+        .values(document)
+    )
+    if result.rowcount == 0:
+        connection.execute(_documents.insert().values(document))
+
+
+def _remove(connection, entity, entity_id):
+    connection.execute(
+        _documents.delete().where(_documents.c.entity == entity, _documents.c.entity_id == entity_id)
+    )
+
+
+def _track(entity):
+    source, title_field, body_fields, model_field = SOURCES[entity]
+    watched = (title_field, *body_fields, model_field)
+
+    def after_insert(mapper, connection, target):
+        _write(connection, entity, target)
+
+    def after_update(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[name].history.has_changes() for name in watched):
+            _write(connection, entity, target)
+
+    def after_delete(mapper, connection, target):
+        _remove(connection, entity, target.id)
+
+    event.listen(source, "after_insert", after_insert)
+    event.listen(source, "after_update", after_update)
+    event.listen(source, "after_delete", after_delete)
+
+
+for _entity in SOURCES:
+    _track(_entity)
+
+
+# ── İndeks backend'leri ──
+
+class LikeBackend:
+    """İndekssiz yedek: normalize metinde LIKE taraması."""
+    name = "like"
+
+    def ensure(self, connection):
+        return True
+
+    def matches(self, terms):
+        score = case((_documents.c.title_key.contains(terms[0], autoescape=True), 1), else_=0)
+        return (
+            select(_documents.c.id, score.label("score"))
+            .where(and_(*(_documents.c.content.contains(term, autoescape=True) for term in terms)))
+        )
+
+
+class Fts5Backend:
+    """SQLite FTS5 — search_document üzerinde external content tablosu, trigger'larla güncel."""
+    name = "fts5"
+    _fts = table("search_fts", column("rowid"))
+    _ddl = (
+        "CREATE VIRTUAL TABLE search_fts USING fts5("
+        "title_key, content, content='search_document', content_rowid='id', "
+        "tokenize=\"unicode61 remove_diacritics 2 tokenchars '_'\")",
+        "CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN "
+        "INSERT INTO search_fts(rowid, title_key, content) VALUES (new.id, new.title_key, new.content); END",
+        "CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, title_key, content) "
+        "VALUES ('delete', old.id, old.title_key, old.content); END",
+        "CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, title_key, content) "
+        "VALUES ('delete', old.id, old.title_key, old.content); "
+        "INSERT INTO search_fts(rowid, title_key, content) VALUES (new.id, new.title_key, new.content); END",
+    )
+
+    def ensure(self, connection):
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_fts'")
+        ).first()
+        if exists:
+            return True
+        for statement in self._ddl:
+            connection.execute(text(statement))
+        # Mevcut dokümanları indeksle
+        connection.execute(text("INSERT INTO search_fts(search_fts) VALUES ('rebuild')"))
+        return True
+
+    def matches(self, terms):
+        # Her kelime tırnaklı önek sorgusu: "kredi"* "kart"* (AND)
+        expression = " ".join(f'"{term}"*' for term in terms)
+        # Başlık eşleşmesi gövdeye göre 4 kat ağırlıklı; bm25 küçük olan daha iyi
+        score = -func.bm25(literal_column("search_fts"), 4.0, 1.0)
+        return (
+            select(_documents.c.id, score.label("score"))
+            .select_from(_documents.join(self._fts, self._fts.c.rowid == _documents.c.id))
+            .where(text("search_fts MATCH :expression").bindparams(expression=expression))
+        )
+
+
+class OracleTextBackend:
+    """Oracle Text CONTEXT indeksi — commit'te senkronize olur."""
+    name = "oracle_text"
+    index_name = "IX_SEARCH_DOCUMENT_CTX"
+    _reserved = frozenset({"about", "accum", "and", "bt", "btg", "btp", "fuzzy", "haspath", "inpath",
+                           "minus", "near", "not", "nt", "ntg", "ntp", "or", "pt", "rt", "sqe", "syn",
+                           "tr", "trsyn", "tt", "within"})
+
+    def ensure(self, connection):
+        exists = connection.execute(
+            text("SELECT 1 FROM user_indexes WHERE index_name = :name"), {"name": self.index_name}
+        ).first()
+        if not exists:
+            connection.execute(text(
+                f"CREATE INDEX {self.index_name} ON search_document (content) "
+                "INDEXTYPE IS CTXSYS.CONTEXT PARAMETERS ('SYNC (ON COMMIT)')"
+            ))
+        return True
+
+    def _term(self, term):
+        # Ayrılmış kelimeler ve "_" içerenler süslü parantezle kaçırılır; diğerleri önek araması
+        if term in self._reserved or "_" in term or len(term) < 3:
+            return "{%s}" % term
+        return f"{term}%"
+
+    def matches(self, terms):
+        expression = " AND ".join(self._term(term) for term in terms)
+        return (
+            select(_documents.c.id, literal_column("SCORE(1)").label("score"))
+            .where(text("CONTAINS(search_document.content, :expression, 1) > 0")
+                   .bindparams(expression=expression))
+        )
+
+
+_BACKENDS = {"sqlite": Fts5Backend, "oracle": OracleTextBackend}
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def _create_backend():
+    backend_class = _BACKENDS.get(db.engine.dialect.name, LikeBackend)
+    backend = backend_class()
+    try:
+        with db.engine.begin() as connection:
+            backend.ensure(connection)
+    except DBAPIError as exc:
+        # FTS5 derlenmemiş SQLite ya da CTXSYS yetkisi olmayan şema
+        logger.warning("Full-text index unavailable (%s), falling back to LIKE search: %s",
+                       backend.name, exc)
+        backend = LikeBackend()
+    return backend
+
+
+# ── Okuma ──
+
+def _snippet(original, folded, terms):
+    """İlk eşleşen kelimenin çevresinden kısa bir alıntı (orijinal metinden)."""
+    if not original:
+        return None
+    positions = [folded.find(term) for term in terms]
+    positions = [p for p in positions if p >= 0]
+    start = max(min(positions) - _SNIPPET_BEFORE, 0) if positions else 0
+    end = start + _SNIPPET_BEFORE + _SNIPPET_AFTER
+    excerpt = " ".join(original[start:end].split())
+    return ("…" if start > 0 else "") + excerpt + ("…" if end < len(original) else "")
+
+
+def search(query, entities=None, model_id=None, limit=20):
+    """Sıralı arama sonuçları: [{entity, id, model_id, model_name, title, snippet, score}]."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    hits = get_backend().matches(terms).subquery("hits")
+    stmt = (
+        select(
+            _documents.c.entity,
+            _documents.c.entity_id,
+            _documents.c.model_id,
+            _documents.c.title,
+            _documents.c.text,
+            _documents.c.content,
+            hits.c.score,
+            ModelInventory.model_name,
+        )
+        .join(hits, hits.c.id == _documents.c.id)
+        .outerjoin(ModelInventory, ModelInventory.id == _documents.c.model_id)
+        .order_by(hits.c.score.desc(), _documents.c.id)
+        .limit(limit)
+    )
+    if entities:
+        stmt = stmt.where(_documents.c.entity.in_(entities))
+    if model_id is not None:
+        stmt = stmt.where(_documents.c.model_id == model_id)
+
+    return [{
+        "entity": row.entity,
+        "id": row.entity_id,
+        "model_id": row.model_id,
+        "model_name": row.model_name,
+        "title": row.title,
+        "snippet": _snippet(row.text, row.content or "", terms),
+        "score": round(float(row.score or 0), 4),
+    } for row in db.session.execute(stmt)]
+
+
+# ── Bakım ──
+
+def rebuild_search_index():
+    """Tüm dokümanları kaynak tablolardan yeniden üret (commit çağırana bırakılır)."""
+    get_backend()
+    db.session.execute(_documents.delete())
+    total = 0
+    for entity, (source, *_) in SOURCES.items():
+        batch = []
+        for target in db.session.execute(
+            select(source).execution_options(yield_per=_REBUILD_BATCH)
+        ).scalars():
+            batch.append(_document(entity, target))
+            if len(batch) >= _REBUILD_BATCH:
+                db.session.execute(insert(SearchDocument), batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(SearchDocument), batch)
+            total += len(batch)
+    return total
+
+
+def refresh_documents(entity, ids):
+    """Core yazımlarından sonra (mapper event'leri atlanır) verilen kayıtların dokümanlarını yenile."""
+    source = SOURCES[entity][0]
+    ids = list(ids)
+    for start in range(0, len(ids), _REBUILD_BATCH):
+        batch = ids[start:start + _REBUILD_BATCH]
+        db.session.execute(
+            _documents.delete().where(_documents.c.entity == entity, _documents.c.entity_id.in_(batch))
+        )
+        targets = db.session.execute(
+            select(source).where(source.id.in_(batch)).execution_options(populate_existing=True)
+        ).scalars()
+        documents = [_document(entity, target) for target in targets]
+        if documents:
+            db.session.execute(insert(SearchDocument), documents)
+
+
+def ensure_search_index():
+    """İndeksi hazırla; doküman tablosu boşsa doldur (uygulama açılışında)."""
+    get_backend()
+    if db.session.execute(select(_documents.c.id).limit(1)).first() is None:
+        rebuild_search_index()
+        db.session.commit()
@@ -0,0 +1,197 @@
+"""
+Dashboard özet sayaçları.
+
+`dashboard_summary` tablosundaki tek satır, ModelInventory / DevelopmentProject /
+DevelopmentStage üzerindeki after_insert/after_update/after_delete event'leri ile
+aynı transaction içinde artımlı güncellenir. `/api/dashboard/summary` böylece
+tek bir primary-key okumasına iner.
+
+Toplu Core UPDATE/DELETE gibi mapper event'lerini atlayan yazımlar sayaçları
+kaydırabilir; `flask rebuild-summary` komutu sayaçları sıfırdan hesaplar.
+"""
+from datetime import date, datetime, timezone
+from sqlalchemy import event, func, case, inspect
+from models import db
+from models.dashboard import DashboardSummary
+from models.scorecard import ModelInventory
+from models.development import DevelopmentProject, DevelopmentStage
+
+SUMMARY_ID = 1
+
+_ACTIVE_STATUSES = ("active", "under_review")
+
+
+def _active(row):
+    return row["status"] in _ACTIVE_STATUSES
+
+
+# Sayaç kolonu -> satırın o sayaca katkısını veren predicate.
+# rebuild_summary içindeki SQL ifadeleriyle birebir aynı kuralları uygular.
+MODEL_COUNTERS = {
+    "models_total": lambda r: True,
+    "models_active": lambda r: r["status"] == "active",
+    "models_under_review": lambda r: r["status"] == "under_review",
+    "models_basvuru": lambda r: _active(r) and r["scorecard_category"] == "Başvuru",
+    "models_davranis": lambda r: _active(r) and r["scorecard_category"] == "Davranış",
+    "models_psi_flag": lambda r: _active(r) and bool(r["psi_flag"]),
+    "models_cal_warning": lambda r: _active(r) and r["calibration_status"] == "warning",
+    "models_cal_critical": lambda r: _active(r) and r["calibration_status"] == "critical",
+}
+
+PROJECT_COUNTERS = {
+    "projects_total": lambda r: True,
+    "projects_active": lambda r: r["status"] == "in_progress",
+    "projects_completed": lambda r: r["status"] == "completed",
+    "projects_basvuru": lambda r: r["status"] == "in_progress" and r["scorecard_category"] == "Başvuru",
+    "projects_davranis": lambda r: r["status"] == "in_progress" and r["scorecard_category"] == "Davranış",
+}
+
+STAGE_COUNTERS = {
+    "overdue_stages": lambda r: (
+        r["deadline"] is not None
+        and r["deadline"] < date.today()
+        and r["status"] is not None
+        and r["status"] != "completed"
+    ),
+}
+
+
+def _current_values(target, attrs):
+    return {key: getattr(target, key) for key in attrs}
+
+
+def _previous_values(target, attrs):
+    """Flush öncesi (committed) değerler — attribute history üzerinden."""
+    state = inspect(target)
+    values = {}
+    for key in attrs:
+        history = state.attrs[key].history
+        values[key] = history.deleted[0] if history.deleted else getattr(target, key)
+    return values
+
+
+def _contribution(counters, row):
+    return {name: 1 if predicate(row) else 0 for name, predicate in counters.items()}
+
+
+def _apply(connection, deltas):
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = DashboardSummary.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == SUMMARY_ID)
+        .values({table.c[name]: table.c[name] + delta for name, delta in deltas.items()})
+    )
+
+
+def _track(model, counters, attrs):
+    """Bir model sınıfı için sayaç event'lerini kaydet."""
+
+    def after_insert(mapper, connection, target):
+        _apply(connection, _contribution(counters, _current_values(target, attrs)))
+
+    def after_update(mapper, connection, target):
+        new = _contribution(counters, _current_values(target, attrs))
+        old = _contribution(counters, _previous_values(target, attrs))
+        _apply(connection, {name: new[name] - old[name] for name in counters})
+
+    def after_delete(mapper, connection, target):
+        old = _contribution(counters, _current_values(target, attrs))
+        _apply(connection, {name: -value for name, value in old.items()})
+
+    event.listen(model, "after_insert", after_insert)
+    event.listen(model, "after_update", after_update)
+    event.listen(model, "after_delete", after_delete)
+
+
+MODEL_ATTRS = ("status", "scorecard_category", "psi_flag", "calibration_status")
+
+_track(ModelInventory, MODEL_COUNTERS, MODEL_ATTRS)
+_track(DevelopmentProject, PROJECT_COUNTERS, ("status", "scorecard_category"))
+_track(DevelopmentStage, STAGE_COUNTERS, ("deadline", "status"))
+
+
+def apply_model_changes(pairs):
+    """
+    Core INSERT/UPDATE mapper event'lerini atlar; sayaçları tek seferde güncelle.
+    pairs: (önceki, sonraki) MODEL_ATTRS değerleri; yeni kayıtta önceki None.
+    """
+    deltas = dict.fromkeys(MODEL_COUNTERS, 0)
+    for old, new in pairs:
+        new_contribution = _contribution(MODEL_COUNTERS, new)
+        old_contribution = _contribution(MODEL_COUNTERS, old) if old is not None else {}
+        for name, value in new_contribution.items():
+            deltas[name] += value - old_contribution.get(name, 0)
+    _apply(db.session.connection(), deltas)
+
+
+# ── Okuma / yeniden hesaplama ──
+
+def _count_overdue_stages(today):
+    return DevelopmentStage.query.filter(
+        DevelopmentStage.deadline < today,
+        DevelopmentStage.status != "completed"
+    ).count()
+
+
+def rebuild_summary():
+    """Tüm sayaçları kaynak tablolardan yeniden hesapla ve kaydet."""
+    _active_filter = ModelInventory.status.in_(_ACTIVE_STATUSES)
+
+    model_counts = db.session.query(
+        func.count(ModelInventory.id),
+        func.count(case((ModelInventory.status == "active", 1))),
+        func.count(case((ModelInventory.status == "under_review", 1))),
+        func.count(case((_active_filter, case((ModelInventory.scorecard_category == "Başvuru", 1))))),
+        func.count(case((_active_filter, case((ModelInventory.scorecard_category == "Davranış", 1))))),
+        func.count(case((_active_filter, case((ModelInventory.psi_flag == True, 1))))),  # noqa: E712
+        func.count(case((_active_filter, case((ModelInventory.calibration_status == "warning", 1))))),
+        func.count(case((_active_filter, case((ModelInventory.calibration_status == "critical", 1))))),
+    ).one()
+
+    project_counts = db.session.query(
+        func.count(DevelopmentProject.id),
+        func.count(case((DevelopmentProject.status == "in_progress", 1))),
+        func.count(case((DevelopmentProject.status == "completed", 1))),
+        func.count(case((
+            (DevelopmentProject.status == "in_progress") & (DevelopmentProject.scorecard_category == "Başvuru"), 1
+        ))),
+        func.count(case((
+            (DevelopmentProject.status == "in_progress") & (DevelopmentProject.scorecard_category == "Davranış"), 1
+        ))),
+    ).one()
+
+    summary = db.session.get(DashboardSummary, SUMMARY_ID)
+    if summary is None:
+        summary = DashboardSummary(id=SUMMARY_ID)
+        db.session.add(summary)
+
+    for name, value in zip(MODEL_COUNTERS, model_counts):
+        setattr(summary, name, value)
+    for name, value in zip(PROJECT_COUNTERS, project_counts):
+        setattr(summary, name, value)
+
+    today = date.today()
+    summary.overdue_stages = _count_overdue_stages(today)
+    summary.overdue_as_of = today
+    summary.rebuilt_at = datetime.now(timezone.utc)
+
+    db.session.commit()
+    return summary
+
+
+def get_summary():
+    """Özet satırını döndür; yoksa oluştur, gün değiştiyse geciken aşamaları tazele."""
+    summary = db.session.get(DashboardSummary, SUMMARY_ID)
+    if summary is None:
+        return rebuild_summary()
+
+    today = date.today()
+    if summary.overdue_as_of != today:
+        # Deadline'lar yazım olmadan da geçebilir; günde bir kez yeniden say
+        summary.overdue_stages = _count_overdue_stages(today)
+        summary.overdue_as_of = today
+        db.session.commit()
+    return summary
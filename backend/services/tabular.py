@@ -0,0 +1,184 @@
+"""
+Akış halinde tablo verisi okuma (CSV / NDJSON / XLSX).
+
+İstek gövdesi bellekte tamponlanmadan satır satır okunur; her satır
+(satır_no, kayıt, hata) olarak döner. Satır hatası tüm yüklemeyi durdurmaz.
+XLSX (openpyxl, isteğe bağlı) read-only modda satır satır okunur; zip arşivi
+olduğundan akışın seek edilebilir olması gerekir (yüklenen dosya ya da geçici dosya).
+"""
+import csv
+import io
+import json
+import math
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+
+FORMATS = ("csv", "ndjson", "xlsx")
+
+_MIMETYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx",
+}
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".xlsx": "xlsx"}
+
+
+def detect_format(mimetype, explicit=None, filename=None):
+    """format= parametresi, Content-Type ya da dosya uzantısından biçim; bilinmiyorsa None."""
+    if explicit:
+        return explicit.lower() if explicit.lower() in FORMATS else None
+    fmt = _MIMETYPES.get((mimetype or "").lower())
+    if fmt is None and filename:
+        fmt = _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+    return fmt
+
+
+def iter_records(stream, fmt):
+    """(line, record, error) üret — record: alan adı -> değer (str / JSON değeri)."""
+    if fmt == "csv":
+        yield from _iter_csv(stream)
+    elif fmt == "ndjson":
+        yield from _iter_ndjson(stream)
+    elif fmt == "xlsx":
+        try:
+            workbook = open_workbook(stream)
+        except ValueError as exc:
+            yield 0, None, str(exc)
+            return
+        yield from iter_sheet(workbook.worksheets[0])
+    else:
+        raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+
+
+def _iter_csv(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    try:
+        for record in reader:
+            # Başlık satırı 1. satırdır
+            if None in record:
+                yield reader.line_num, None, "Başlıktan fazla kolon"
+                continue
+            yield reader.line_num, {k.strip(): v for k, v in record.items() if k}, None
+    except (csv.Error, UnicodeDecodeError) as exc:
+        yield reader.line_num, None, f"CSV okunamadı: {exc}"
+
+
+def _iter_ndjson(stream):
+    for line_no, raw in enumerate(stream, start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except (ValueError, UnicodeDecodeError) as exc:
+            yield line_no, None, f"Geçersiz JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Satır bir JSON nesnesi olmalıdır"
+            continue
+        yield line_no, record, None
+
+
+def open_workbook(stream):
+    """XLSX çalışma kitabını read-only aç; openpyxl yoksa ValueError."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX okumak için openpyxl kurulu olmalıdır") from None
+    if not stream.seekable():
+        # İstek gövdesi geri sarılamaz; zip okuması için geçici dosyaya al
+        spooled = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        shutil.copyfileobj(stream, spooled)
+        spooled.seek(0)
+        stream = spooled
+    try:
+        return load_workbook(stream, read_only=True, data_only=True)
+    except Exception as exc:  # openpyxl bozuk dosyada çeşitli hatalar fırlatır
+        raise ValueError(f"XLSX okunamadı: {exc}") from None
+
+
+def iter_sheet(sheet):
+    """Çalışma sayfasını (line, record, error) olarak oku; ilk satır başlıktır, boş satırlar atlanır."""
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    names = [str(name).strip() if name is not None else None for name in header]
+    for line_no, values in enumerate(rows, start=2):
+        if all(value is None or value == "" for value in values):
+            continue
+        if any(value not in (None, "") for name, value in zip(names, values) if name is None):
+            yield line_no, None, "Başlıktan fazla kolon"
+            continue
+        yield line_no, {name: value for name, value in zip(names, values) if name}, None
+
+
+def blank_to_none(value):
+    """CSV'de boş hücre None sayılır."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def to_float(value):
+    value = blank_to_none(value)
+    if value is None:
+        return None
+    if isinstance(value, str) and value.count(",") == 1 and "." not in value:
+        value = value.replace(",", ".")  # Ondalık virgül (Excel TR)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Sayı bekleniyordu: {value}") from None
+    if not math.isfinite(number):  # "nan", "inf" float() ile geçerli sayılır
+        raise ValueError(f"Sonlu sayı bekleniyordu: {value}")
+    return number
+
+
+def to_int(value):
+    value = blank_to_none(value)
+    if value is None:
+        return None
+    number = to_float(value)
+    if not number.is_integer():
+        raise ValueError(f"Tam sayı bekleniyordu: {value}")
+    return int(number)
+
+
+def to_bool(value):
+    value = blank_to_none(value)
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "evet", "e", "yes", "y"):
+        return True
+    if text in ("0", "false", "hayır", "hayir", "h", "no", "n"):
+        return False
+    raise ValueError(f"Evet/hayır bekleniyordu: {value}")
+
+
+def to_date(value):
+    """ISO (2025-01-31), TR (31.01.2025) ya da Excel tarih hücresi."""
+    value = blank_to_none(value)
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(text[:10], fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Tarih bekleniyordu: {value}")
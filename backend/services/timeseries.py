@@ -0,0 +1,217 @@
+"""
+Gini geçmişi zaman serisi.
+
+`period` serbest metindir ("2025-01", "2025-Q1", "2025", "202501"); her değer ay
+sırasına (yıl * 12 + ay) çevrilir. Kayıtlar istenen granülerliğe (ay / çeyrek / yıl)
+toplanır: Gini ve hedef oranı `sample_size` ağırlıklı ortalamadır (örneklem boyutu
+boş kayıtların ağırlığı 1). İstenenden kaba bir dönem (ör. aylık seride "2025-Q1")
+dönemin son ayına yazılır.
+
+Aynı aylar için hem ince hem kaba kayıt varsa (ör. 2025-01..03 aylık ve 2025-Q1)
+yalnızca en ince olanlar kullanılır: kapsadığı aylardan herhangi biri için daha ince
+bir kayıt bulunan kaba dönem atılır ve `overlapping_periods` olarak raporlanır.
+Böylece aynı dönem iki kez sayılıp ağırlıklı ortalamayı ve LTTB girdisini kaydırmaz.
+
+Kova değerleri üzerinden hareketli ortalama ve hareketli eğim (en küçük kareler,
+dönem başına değişim) hesaplanır. Uzun seriler grafik için LTTB (Largest-Triangle-
+Three-Buckets) ile hedef nokta sayısına indirilir; indirgeme sonuna uygulanır, yani
+hareketli metrikler tam seri üzerinden hesaplanmış değerlerdir.
+"""
+import re
+
+GRANULARITIES = {"month": 1, "quarter": 3, "year": 12}
+
+_PERIOD_PATTERNS = (
+    (re.compile(r"^(\d{4})[-/.]?(0[1-9]|1[0-2])$"), lambda y, m: (int(y), int(m), 1)),
+    (re.compile(r"^(\d{4})[-/ ]?Q([1-4])$", re.IGNORECASE), lambda y, q: (int(y), int(q) * 3, 3)),
+    (re.compile(r"^(\d{4})$"), lambda y: (int(y), 12, 12)),
+)
+
+
+def parse_period(period):
+    """(ay sırası, dönem uzunluğu ay) — tanınmayan biçim için None. Ay sırası dönemin son ayıdır."""
+    text = (period or "").strip()
+    for pattern, build in _PERIOD_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            year, month, span = build(*match.groups())
+            return year * 12 + month - 1, span
+    return None
+
+
+def bucket_of(ordinal, granularity):
+    """Ay sırasını kovanın son ayına yuvarla."""
+    step = GRANULARITIES[granularity]
+    return ordinal - ordinal % step + step - 1
+
+
+def period_label(ordinal, granularity):
+    year, month = divmod(ordinal, 12)
+    if granularity == "year":
+        return str(year)
+    if granularity == "quarter":
+        return f"{year}-Q{month // 3 + 1}"
+    return f"{year}-{month + 1:02d}"
+
+
+def _drop_overlapping(parsed_rows):
+    """Daha ince bir kayıtla ay paylaşan kaba kayıtları ayır: (kalanlar, atılan dönemler)."""
+    months_by_span = {}
+    for ordinal, span, _ in parsed_rows:
+        months_by_span.setdefault(span, set()).add(ordinal)
+    kept, dropped = [], []
+    for ordinal, span, row in parsed_rows:
+        finer = [months for other, months in months_by_span.items() if other < span]
+        if any(month in months for months in finer for month in range(ordinal - span + 1, ordinal + 1)):
+            dropped.append(row[0])
+        else:
+            kept.append((ordinal, span, row))
+    return kept, dropped
+
+
+def rollup(rows, granularity, ordinal_from=None, ordinal_to=None):
+    """
+    rows: (period, gini_value, target_ratio, sample_size) demetleri.
+    Dönüş: (kovalar, tanınmayan dönemler, ince kayıtlarla çakıştığı için atılan dönemler)
+    — kova: sıralı dict listesi.
+    """
+    parsed_rows = []
+    unparsed = []
+    for row in rows:
+        parsed = parse_period(row[0])
+        if parsed is None:
+            unparsed.append(row[0])
+        else:
+            parsed_rows.append((*parsed, row))
+    parsed_rows, overlapping = _drop_overlapping(parsed_rows)
+
+    buckets = {}
+    for ordinal, _, (period, gini_value, target_ratio, sample_size) in parsed_rows:
+        if ordinal_from is not None and ordinal < ordinal_from:
+            continue
+        if ordinal_to is not None and ordinal > ordinal_to:
+            continue
+        key = bucket_of(ordinal, granularity)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                "ordinal": key, "weight": 0.0, "gini_sum": 0.0,
+                "target_weight": 0.0, "target_sum": 0.0, "sample_size": None, "count": 0,
+            }
+        weight = sample_size if sample_size and sample_size > 0 else 1
+        bucket["weight"] += weight
+        bucket["gini_sum"] += gini_value * weight
+        if target_ratio is not None:
+            bucket["target_weight"] += weight
+            bucket["target_sum"] += target_ratio * weight
+        if sample_size is not None:
+            bucket["sample_size"] = (bucket["sample_size"] or 0) + sample_size
+        bucket["count"] += 1
+
+    result = []
+    for key in sorted(buckets):
+        bucket = buckets[key]
+        result.append({
+            "ordinal": key,
+            "gini": bucket["gini_sum"] / bucket["weight"],
+            "target_ratio": bucket["target_sum"] / bucket["target_weight"] if bucket["target_weight"] else None,
+            "sample_size": bucket["sample_size"],
+            "count": bucket["count"],
+        })
+    return result, unparsed, overlapping
+
+
+def rolling(xs, ys, window):
+    """Son `window` nokta üzerinden (ortalama, eğim) listeleri; eğim x birimi başına."""
+    means, slopes = [], []
+    for end in range(len(ys)):
+        start = max(0, end - window + 1)
+        n = end - start + 1
+        wx, wy = xs[start:end + 1], ys[start:end + 1]
+        mean_y = sum(wy) / n
+        means.append(mean_y)
+        if n < 2:
+            slopes.append(None)
+            continue
+        mean_x = sum(wx) / n
+        sxx = sum((x - mean_x) ** 2 for x in wx)
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(wx, wy))
+        slopes.append(sxy / sxx if sxx else None)
+    return means, slopes
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets: korunacak noktaların indeksleri."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    selected = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Sonraki kovanın ortalaması üçgenin üçüncü köşesi
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def build_series(rows, granularity="month", window=3, max_points=None,
+                 period_from=None, period_to=None):
+    """
+    Kolon bazlı seri: her alan dönemlerle paralel bir dizi.
+    period_from / period_to: parse_period'un tanıdığı herhangi bir biçimde sınır (dahil).
+    """
+    ordinal_from = ordinal_to = None
+    if period_from:
+        parsed = parse_period(period_from)
+        if parsed is None:
+            raise ValueError(f"Geçersiz period_from: {period_from}")
+        ordinal_from = parsed[0] - parsed[1] + 1  # Dönemin ilk ayı
+    if period_to:
+        parsed = parse_period(period_to)
+        if parsed is None:
+            raise ValueError(f"Geçersiz period_to: {period_to}")
+        ordinal_to = parsed[0]
+
+    buckets, unparsed, overlapping = rollup(rows, granularity, ordinal_from, ordinal_to)
+    step = GRANULARITIES[granularity]
+    xs = [b["ordinal"] // step for b in buckets]  # Eğim "dönem başına" olsun
+    ys = [b["gini"] for b in buckets]
+    means, slopes = rolling(xs, ys, window)
+
+    keep = lttb(xs, ys, max_points) if max_points else list(range(len(buckets)))
+
+    def column(values):
+        return [values[i] for i in keep]
+
+    def rounded(values):
+        return [round(v, 6) if v is not None else None for v in column(values)]
+
+    return {
+        "granularity": granularity,
+        "window": window,
+        "total_points": len(buckets),
+        "downsampled": len(keep) < len(buckets),
+        "period": column([period_label(b["ordinal"], granularity) for b in buckets]),
+        "gini": rounded(ys),
+        "target_ratio": rounded([b["target_ratio"] for b in buckets]),
+        "sample_size": column([b["sample_size"] for b in buckets]),
+        "count": column([b["count"] for b in buckets]),
+        "rolling_mean": rounded(means),
+        "slope": rounded(slopes),
+        "unparsed_periods": sorted(set(unparsed)),
+        "overlapping_periods": sorted(set(overlapping)),
+    }
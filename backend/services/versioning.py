@@ -0,0 +1,148 @@
+"""
+Tablo bazında veri versiyonları.
+
+Flush'larda (ve session üzerinden çalıştırılan toplu INSERT/UPDATE/DELETE'lerde)
+değişen tablolar biriktirilir; `data_version` satırları commit'ten hemen önce tek
+UPDATE ile artırılır. Böylece sayaç satırının kilidi transaction boyunca değil
+yalnızca commit anında tutulur (aynı tabloya yazanlar ilk flush'tan itibaren
+birbirini beklemez) ve changed_at commit zamanıdır. Sayaç veritabanında tutulduğu
+için tüm gunicorn worker'ları aynı değeri görür; okuma endpoint'leri ETag/Last-Modified
+üretmek için yalnızca bu küçük tabloyu okur.
+
+Transaction içinde sayaçlar henüz eski değerdedir: versiyonla anahtarlanan worker
+önbellekleri, `uncommitted_tables()` ile kesişen tablolar için sonuç saklamamalıdır.
+
+Transaction boyunca değişen tablolar ayrıca biriktirilir ve commit sonrasında
+`on_commit` ile kaydedilen dinleyicilere (örn. yanıt önbelleği) bildirilir.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+from models import db
+from models.system import DataVersion
+
+_VERSION_TABLE = DataVersion.__tablename__
+_PENDING_KEY = "pending_version_tables"
+_UNBUMPED_KEY = "unbumped_version_tables"
+_COMMITTED_KEY = "transaction_changed_tables"
+
+_commit_listeners = []
+
+
+def on_commit(listener):
+    """Commit sonrası `listener(tables)` çağrılır; tables: transaction'da değişen tablo adları."""
+    _commit_listeners.append(listener)
+    return listener
+
+
+def _record(session, tables):
+    session.info.setdefault(_COMMITTED_KEY, set()).update(tables)
+    session.info.setdefault(_UNBUMPED_KEY, set()).update(tables)
+
+
+def _bump(connection, tables):
+    tables = sorted(set(tables) - {_VERSION_TABLE})
+    if not tables:
+        return
+    table = DataVersion.__table__
+    now = datetime.now(timezone.utc)
+    result = connection.execute(
+        table.update()
+        .where(table.c.table_name.in_(tables))
+        .values(version=table.c.version + 1, changed_at=now)
+    )
+    if result.rowcount < len(tables):
+        existing = set(connection.execute(
+            select(table.c.table_name).where(table.c.table_name.in_(tables))
+        ).scalars())
+        connection.execute(table.insert(), [
+            {"table_name": name, "version": 1, "changed_at": now}
+            for name in tables if name not in existing
+        ])
+
+
+def _mark_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(mapper.local_table.name)
+
+
+def _mark_updated(mapper, connection, target):
+    session = object_session(target)
+    # Yalnızca koleksiyonu değişen (kolon değişikliği olmayan) nesneleri sayma
+    if session is not None and session.is_modified(target, include_collections=False):
+        _mark_changed(mapper, connection, target)
+
+
+event.listen(db.Model, "after_insert", _mark_changed, propagate=True)
+event.listen(db.Model, "after_update", _mark_updated, propagate=True)
+event.listen(db.Model, "after_delete", _mark_changed, propagate=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        _record(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_statement(orm_execute_state):
+    """session.execute(insert/update/delete(...)) mapper event'lerini atlar; versiyonu burada artır."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None:
+        _record(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    session.flush()  # Bekleyen nesnelerin tabloları da sayılsın
+    tables = session.info.pop(_UNBUMPED_KEY, None)
+    if tables:
+        _bump(session.connection(), tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    tables = session.info.pop(_COMMITTED_KEY, None)
+    if tables:
+        tables = frozenset(tables - {_VERSION_TABLE})
+        for listener in _commit_listeners:
+            listener(tables)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_UNBUMPED_KEY, None)
+    session.info.pop(_COMMITTED_KEY, None)
+
+
+def uncommitted_tables():
+    """Geçerli transaction'da yazılmış ama henüz commit edilmemiş tablolar."""
+    info = db.session.info
+    return info.get(_COMMITTED_KEY, set()) | info.get(_PENDING_KEY, set())
+
+
+def current_versions(tables):
+    """{tablo: (version, changed_at)} — tek sorgu."""
+    rows = db.session.execute(
+        select(DataVersion.table_name, DataVersion.version, DataVersion.changed_at)
+        .where(DataVersion.table_name.in_(tables))
+    )
+    versions = {name: (0, None) for name in tables}
+    for name, version, changed_at in rows:
+        versions[name] = (version, changed_at)
+    return versions
+
+
+def ensure_versions():
+    """Metadata'daki her tablo için sayaç satırı oluştur (uygulama açılışında)."""
+    existing = set(db.session.execute(select(DataVersion.table_name)).scalars())
+    now = datetime.now(timezone.utc)
+    for name in db.metadata.tables:
+        if name != _VERSION_TABLE and name not in existing:
+            db.session.add(DataVersion(table_name=name, version=0, changed_at=now))
+    db.session.commit()
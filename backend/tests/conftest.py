@@ -0,0 +1,58 @@
+"""
+Testler backend dizininden çalışır: python -m pytest -q
+
+Uygulama geçici bir SQLite veritabanı ve blob dizini ile, seed verisi olmadan kurulur.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="mt-dashboard-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ["BLOB_STORE_PATH"] = os.path.join(_TMP, "blobs")
+os.environ["SEED_ON_EMPTY"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import app as flask_app
+    return flask_app
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def scored_model(client):
+    """Katsayılı iki değişken ve sabit terimi olan model; id döner."""
+    response = client.post("/api/models/", json={
+        "model_name": "Test Skorkart", "scorecard_category": "Başvuru", "product_type": "KMH",
+    })
+    assert response.status_code == 201, response.get_json()
+    model_id = response.get_json()["id"]
+    for name, coefficient, median in (("x1", 0.5, 2.0), ("x2", -1.0, 10.0), ("intercept", 0.25, None)):
+        response = client.post(f"/api/models/{model_id}/variables", json={
+            "variable_name": name, "coefficient": coefficient, "median_train": median,
+        })
+        assert response.status_code == 201, response.get_json()
+    return model_id
+
+
+@pytest.fixture()
+def refresh_calls(monkeypatch):
+    """Verilen modüldeki refresh_alert_state çağrılarının id listelerini kaydet (gerçek fonksiyon da çalışır)."""
+    from services.alerts import refresh_alert_state
+    calls = []
+
+    def spy(module):
+        def refresh(model_ids=None, condition=None):
+            calls.append(sorted(model_ids) if model_ids is not None else None)
+            return refresh_alert_state(model_ids, condition)
+        monkeypatch.setattr(module, "refresh_alert_state", refresh)
+        return calls
+    return spy
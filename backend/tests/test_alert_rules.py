@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({"name": "x", "window_months": "3"}, "window_months: tam sayı"),
+    ({"name": "x", "window_months": None}, "window_months boş olamaz"),
+    ({"name": "x", "min_breaches": 2.5}, "min_breaches: tam sayı"),
+    ({"name": "x", "priority": True}, "priority: tam sayı"),
+    ({"name": "x", "gini_threshold": "abc"}, "gini_threshold: sonlu sayı"),
+    ({"name": "x", "min_gini_diff": float("nan")}, "min_gini_diff: sonlu sayı"),
+    ({"name": "x", "psi_alert": "yes"}, "psi_alert: true/false"),
+    ({"name": 5}, "name: metin"),
+    ({"name": "x", "calibration_levels": 5}, "calibration_levels"),
+    ({"name": "x", "window_months": 2, "min_breaches": 3}, "min_breaches 1 ile window_months"),
+    ([1, 2], "JSON nesnesi"),
+])
+def test_create_rule_rejects_invalid_fields(client, payload, message):
+    before = client.get("/api/alert-rules/").get_json()
+    response = client.post("/api/alert-rules/", json=payload)
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+    assert client.get("/api/alert-rules/").get_json() == before
+
+
+def test_update_rule_validates_and_keeps_values(client):
+    response = client.post("/api/alert-rules/", json={
+        "name": "Test kuralı", "product_type": "Test", "gini_threshold": 0.4, "window_months": 4,
+    })
+    assert response.status_code == 201, response.get_json()
+    rule = response.get_json()
+    assert rule["window_months"] == 4 and rule["min_breaches"] == 3
+
+    response = client.put(f"/api/alert-rules/{rule['id']}", json={"window_months": "6"})
+    assert response.status_code == 400
+    response = client.put(f"/api/alert-rules/{rule['id']}", json={"gini_threshold": None, "min_gini_diff": 1})
+    assert response.status_code == 200
+    updated = response.get_json()
+    assert updated["gini_threshold"] is None
+    assert updated["min_gini_diff"] == 1.0
+    assert updated["window_months"] == 4
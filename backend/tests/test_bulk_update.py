@@ -0,0 +1,15 @@
+from models import db
+from services import bulk_update
+
+
+def test_bulk_update_refreshes_alerts_in_in_list_chunks(app, client, monkeypatch, refresh_calls):
+    ids = [
+        client.post("/api/models/", json={"model_name": f"Toplu {i}", "scorecard_category": "Toplu"}).get_json()["id"]
+        for i in range(5)
+    ]
+    monkeypatch.setattr(bulk_update, "_IN_BATCH", 2)
+    calls = refresh_calls(bulk_update)
+    with app.app_context():
+        bulk_update.bulk_update_models({model_id: {"psi_flag": True} for model_id in ids})
+        db.session.rollback()
+    assert calls == [ids[0:2], ids[2:4], ids[4:5]]
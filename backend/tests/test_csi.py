@@ -0,0 +1,47 @@
+import math
+
+import numpy as np
+import pytest
+
+from services.monitoring import csi, csi_bins
+
+
+def test_csi_bins_put_missing_values_last():
+    edges, expected = csi_bins([1.0, 2.0, np.nan, 4.0], bins=2)
+    np.testing.assert_allclose(edges, [2.0])
+    np.testing.assert_allclose(expected, [0.25, 0.5, 0.25])
+
+
+def test_csi_matches_psi_formula_per_variable():
+    matrix = np.array([
+        [1.0, 10.0],
+        [2.0, np.nan],
+        [3.0, 30.0],
+        [4.0, np.nan],
+    ])
+    edges_list = [np.array([2.5]), np.array([20.0])]
+    expected_list = [np.array([0.5, 0.5, 0.0]), np.array([0.5, 0.5, 0.0])]
+    values, actual = csi(matrix, edges_list, expected_list)
+    np.testing.assert_allclose(actual[0], [0.5, 0.5, 0.0])
+    np.testing.assert_allclose(actual[1], [0.25, 0.25, 0.5])
+    assert values[0] == pytest.approx(0.0, abs=1e-12)
+
+    epsilon = 1e-4
+    second = sum(
+        (a - e) * math.log(a / e)
+        for a, e in zip((0.25, 0.25, 0.5), (0.5, 0.5, epsilon))
+    )
+    assert values[1] == pytest.approx(second)
+
+
+def test_csi_endpoint_returns_persisted_records(client, scored_model):
+    reference = {"x1": list(range(100)), "x2": [value % 7 for value in range(100)]}
+    response = client.put(f"/api/models/{scored_model}/monitoring/csi/baseline", json=reference)
+    assert response.status_code == 200, response.get_json()
+
+    response = client.post(f"/api/models/{scored_model}/monitoring/csi?period=2026-03", json=reference)
+    assert response.status_code == 200, response.get_json()
+    variables = response.get_json()["variables"]
+    assert {v["variable_name"] for v in variables} == {"x1", "x2"}
+    assert all(v["id"] is not None and v["created_at"] is not None for v in variables)
+    assert all(v["csi_value"] == pytest.approx(0.0, abs=1e-9) for v in variables)
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.mark.parametrize("value", ["abc", "3.5", ""])
+def test_export_rejects_invalid_integer_filter(client, value):
+    response = client.get(f"/api/export/gini_history?model_id={value}")
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("model_id:")
+
+
+def test_export_filters_by_converted_value(client, scored_model):
+    response = client.post(f"/api/models/{scored_model}/gini-history",
+                           json={"period": "2026-01", "gini_value": 0.61})
+    assert response.status_code == 201, response.get_json()
+    response = client.get(f"/api/export/gini_history?model_id={scored_model}")
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).strip().splitlines()
+    assert len(lines) == 2
+    assert "2026-01" in lines[1]
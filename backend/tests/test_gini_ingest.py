@@ -0,0 +1,17 @@
+from services import gini_ingest
+
+
+def test_ingest_refreshes_alerts_in_in_list_chunks(app, client, monkeypatch, refresh_calls):
+    ids = [
+        client.post("/api/models/", json={"model_name": f"Yükleme {i}", "scorecard_category": "Yükleme"}).get_json()["id"]
+        for i in range(3)
+    ]
+    monkeypatch.setattr(gini_ingest, "_IN_BATCH", 2)
+    calls = refresh_calls(gini_ingest)
+    records = [(line, {"model_id": str(model_id), "period": "2026-01", "gini_value": "0.5"}, None)
+               for line, model_id in enumerate(ids, start=2)]
+    with app.app_context():
+        report = gini_ingest.ingest_gini_records(records)
+    assert report["inserted"] == 3 and report["error_count"] == 0
+    assert calls == [ids[0:2], ids[2:3]]
+
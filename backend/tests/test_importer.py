@@ -0,0 +1,29 @@
+from models import db
+from models.scorecard import ModelInventory
+from services import importer
+
+
+def _model_rows(prefix, count):
+    return [(line, {"model_name": f"{prefix} {line}", "scorecard_category": "İçe aktarma"}, None)
+            for line in range(2, count + 2)]
+
+
+def test_import_refreshes_alerts_in_in_list_chunks(app, monkeypatch, refresh_calls):
+    monkeypatch.setattr(importer, "CHUNK_SIZE", 2)
+    calls = refresh_calls(importer)
+    with app.app_context():
+        report = importer.run_import([("models", _model_rows("Parçalı", 3))])
+        ids = sorted(db.session.scalars(
+            db.select(ModelInventory.id).where(ModelInventory.model_name.like("Parçalı %"))
+        ))
+    assert report["entities"]["models"]["inserted"] == 3
+    assert calls == [ids[0:2], ids[2:3]]
+
+
+def test_import_reports_non_finite_numbers_as_row_errors(app):
+    rows = [(2, {"model_name": "Sonsuz", "scorecard_category": "İçe aktarma", "gini_train": "inf"}, None)]
+    with app.app_context():
+        report = importer.run_import([("models", rows)], dry_run=True)
+    models = report["entities"]["models"]
+    assert models["error_count"] == 1
+    assert "Sonlu sayı bekleniyordu: inf" in models["errors"][0]["error"]
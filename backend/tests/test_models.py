@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.mark.parametrize("fields", ["", ",,", " , ", "%20"])
+def test_empty_fields_is_full_representation(client, scored_model, fields):
+    body = client.get(f"/api/models/?fields={fields}&limit=500").get_json()
+    item = next(item for item in body["items"] if item["id"] == scored_model)
+    assert item["model_name"] == "Test Skorkart"
+    assert "scorecard_category" in item
+
+
+def test_fields_projection(client, scored_model):
+    body = client.get("/api/models/?fields=model_name,%20,status&limit=500").get_json()
+    item = next(item for item in body["items"] if item["id"] == scored_model)
+    assert set(item) == {"id", "model_name", "status", "updated_at"}
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/api/models/?fields=model_name,nope")
+    assert response.status_code == 400
+    assert "nope" in response.get_json()["error"]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from services.monitoring import gini_auc
+
+
+def _brute_force_auc(scores, targets, weights, higher_is_better=True):
+    """Tüm kötü-iyi çiftleri: kötü daha riskliyse 1, eşitse ½ (ağırlık çarpımıyla)."""
+    numerator = denominator = 0.0
+    for bad_score, bad_target, bad_weight in zip(scores, targets, weights):
+        if bad_target != 1:
+            continue
+        for good_score, good_target, good_weight in zip(scores, targets, weights):
+            if good_target != 0:
+                continue
+            pair = bad_weight * good_weight
+            riskier = bad_score < good_score if higher_is_better else bad_score > good_score
+            numerator += pair * (1.0 if riskier else 0.5 if bad_score == good_score else 0.0)
+            denominator += pair
+    return numerator / denominator
+
+
+@pytest.mark.parametrize("higher_is_better", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_gini_auc_matches_brute_force_with_ties_and_weights(seed, higher_is_better):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 8, size=60).astype(float)  # Az sayıda değer: çok eşitlik
+    targets = rng.integers(0, 2, size=60).astype(float)
+    weights = rng.uniform(0.1, 3.0, size=60)
+    result = gini_auc(scores, targets, weights, higher_is_better=higher_is_better)
+    expected = _brute_force_auc(scores, targets, weights, higher_is_better)
+    assert result["auc"] == pytest.approx(expected, abs=1e-12)
+    assert result["gini"] == pytest.approx(2 * expected - 1, abs=1e-12)
+    assert result["weighted_size"] == pytest.approx(weights.sum())
+
+
+def test_gini_auc_known_values():
+    perfect = gini_auc([1, 2, 3, 4], [1, 1, 0, 0])
+    assert perfect["auc"] == 1.0 and perfect["gini"] == 1.0
+    all_tied = gini_auc([5, 5, 5, 5], [1, 0, 1, 0])
+    assert all_tied["auc"] == 0.5 and all_tied["gini"] == 0.0
+
+
+def test_gini_auc_drops_nan_rows():
+    result = gini_auc([1, np.nan, 3, 4], [1, 0, 0, np.nan])
+    assert result["dropped"] == 2
+    assert result["sample_size"] == 2
+    assert result["auc"] == 1.0
+
+
+@pytest.mark.parametrize("targets, message", [
+    ([1, 1, 1], "hem 0 hem 1"),
+    ([0, 2, 1], "0 ya da 1"),
+])
+def test_gini_auc_rejects_invalid_targets(targets, message):
+    with pytest.raises(ValueError, match=message):
+        gini_auc([1, 2, 3], targets)
+
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture()
+def unpaged_max(app):
+    previous = app.config["LIST_UNPAGED_MAX"]
+    yield lambda value: app.config.update(LIST_UNPAGED_MAX=value)
+    app.config["LIST_UNPAGED_MAX"] = previous
+
+
+def _create_models(client, category, count):
+    for index in range(count):
+        response = client.post("/api/models/", json={
+            "model_name": f"{category} {index}", "scorecard_category": category,
+        })
+        assert response.status_code == 201
+
+
+def test_unpaged_list_is_bare_up_to_limit(client, unpaged_max):
+    _create_models(client, "Sayfasız", 3)
+    unpaged_max(3)
+    body = client.get("/api/models/?scorecard_category=Sayfasız").get_json()
+    assert isinstance(body, list)
+    assert [item["model_name"] for item in body] == ["Sayfasız 2", "Sayfasız 1", "Sayfasız 0"]
+
+
+def test_unpaged_list_above_limit_returns_first_cursor_page(client, unpaged_max):
+    _create_models(client, "Sayfalı", 3)
+    unpaged_max(2)
+    body = client.get("/api/models/?scorecard_category=Sayfalı").get_json()
+    assert isinstance(body, dict)
+    assert body["total"] == 3
+    assert len(body["items"]) == 3
+    assert body["prev_cursor"] is None and body["next_cursor"] is None
@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from services.monitoring import psi, psi_bins
+from services.psi import split_by_model
+
+
+def test_psi_known_distribution():
+    edges = np.array([0.5])
+    expected = np.array([0.5, 0.5])
+    value, actual, rows = psi([0.1, 0.6, 0.7, 0.8], edges, expected)
+    assert rows == 4
+    np.testing.assert_allclose(actual, [0.25, 0.75])
+    assert value == pytest.approx(-0.25 * math.log(0.5) + 0.25 * math.log(1.5))
+
+
+def test_psi_is_zero_for_reference_sample():
+    scores = np.arange(1000, dtype=float)
+    edges, expected = psi_bins(scores, bins=10)
+    assert len(edges) == 9
+    np.testing.assert_allclose(expected, np.full(10, 0.1))
+    value, _, _ = psi(scores, edges, expected)
+    assert value == pytest.approx(0.0, abs=1e-12)
+
+
+def test_psi_floors_empty_bins():
+    value, actual, _ = psi([0.1, 0.2], [0.5], [0.5, 0.5])
+    np.testing.assert_allclose(actual, [1.0, 0.0])
+    epsilon = 1e-4
+    expected_value = 0.5 * math.log(2.0) + (epsilon - 0.5) * math.log(epsilon / 0.5)
+    assert value == pytest.approx(expected_value)
+
+
+def test_psi_uses_weights():
+    value, actual, _ = psi([0.1, 0.9], [0.5], [0.5, 0.5], weights=[3.0, 1.0])
+    np.testing.assert_allclose(actual, [0.75, 0.25])
+    assert value == pytest.approx(0.25 * math.log(1.5) - 0.25 * math.log(0.5))
+
+
+
+def test_split_by_model_groups_rows_and_skips_blank_ids():
+    samples = split_by_model([4, 3, np.nan, 3], [0.1, 0.2, 0.3, 0.4], [1.0, 2.0, 3.0, 4.0])
+    assert sorted(samples) == [3, 4]
+    scores, weights = samples[3]
+    np.testing.assert_array_equal(scores, [0.2, 0.4])
+    np.testing.assert_array_equal(weights, [2.0, 4.0])
+
+
+@pytest.mark.parametrize("model_id", [3.7, np.inf])
+def test_split_by_model_rejects_non_integer_ids(model_id):
+    with pytest.raises(ValueError, match="model_id tam sayı olmalı"):
+        split_by_model([3, model_id], [0.1, 0.2])
+
+
+def test_record_psi_chunks_in_lists(app, client, monkeypatch, refresh_calls):
+    from services import psi as psi_service
+    ids = [
+        client.post("/api/models/", json={"model_name": f"PSI {i}", "scorecard_category": "PSI"}).get_json()["id"]
+        for i in range(3)
+    ]
+    reference = np.arange(100, dtype=float)
+    for model_id in ids:
+        response = client.put(f"/api/models/{model_id}/monitoring/psi/baseline", json={"score": reference.tolist()})
+        assert response.status_code == 200, response.get_json()
+
+    monkeypatch.setattr(psi_service, "_IN_BATCH", 2)
+    calls = refresh_calls(psi_service)
+    shifted = reference + 80  # Dağılım kayar: psi_flag açılır
+    with app.app_context():
+        results, errors = psi_service.record_psi("2026-04", {model_id: (shifted, None) for model_id in ids})
+        psi_service.db.session.commit()
+    assert errors == {} and sorted(results) == ids
+    assert all(result["psi_status"] == "alert" for result in results.values())
+    assert calls == [ids[0:2], ids[2:3]]
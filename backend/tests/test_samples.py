@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pytest
+
+from services.samples import _fill_empty, read_columns
+
+
+@pytest.mark.parametrize("block, expected", [
+    (",,,\n", "nan,nan,nan,nan\n"),
+    (",1,2\n", "nan,1,2\n"),
+    ("1,2,\n", "1,2,nan\n"),
+    ("1,,,2\n", "1,nan,nan,2\n"),
+    ("1,2\n,3\n4,\n", "1,2\nnan,3\n4,nan\n"),
+    ("1,,2\r\n,3,\r\n", "1,nan,2\r\nnan,3,nan\r\n"),
+    ("1,2\n", "1,2\n"),
+])
+def test_fill_empty(block, expected):
+    assert _fill_empty(block) == expected
+
+
+def test_read_csv_empty_cells_become_nan():
+    body = b"a,b,c\r\n,,\r\n1,,3\r\n,2,\r\n"
+    columns = read_columns(io.BytesIO(body), "csv", ["a", "b", "c"])
+    np.testing.assert_array_equal(columns["a"], [np.nan, 1.0, np.nan])
+    np.testing.assert_array_equal(columns["b"], [np.nan, np.nan, 2.0])
+    np.testing.assert_array_equal(columns["c"], [np.nan, 3.0, np.nan])
+
+
+def test_read_csv_decimal_comma_falls_back_to_rows():
+    body = 'score,target\n"0,5",1\n"1,25",0\n'.encode()
+    columns = read_columns(io.BytesIO(body), "csv", ["score", "target"])
+    np.testing.assert_array_equal(columns["score"], [0.5, 1.25])
+
+
+def test_read_csv_skips_missing_columns():
+    columns = read_columns(io.BytesIO(b"a\n1\n"), "csv", ["a", "b"])
+    assert list(columns) == ["a"]
+
+
+@pytest.mark.parametrize("body", [b'{"score": 5}', b'{"score": [[1, 2]]}', b'{"score": [1, [2]]}'])
+def test_read_json_requires_flat_arrays(body):
+    with pytest.raises(ValueError, match="score: Sayı dizisi bekleniyordu"):
+        read_columns(io.BytesIO(body), "json", ["score"])
+
+
+def test_read_ndjson_rejects_nested_values():
+    with pytest.raises(ValueError, match="score: Sayı dizisi bekleniyordu"):
+        read_columns(io.BytesIO(b'{"score": [1, 2]}\n'), "ndjson", ["score"])
+
+
+@pytest.mark.parametrize("body", [{"score": 5, "target": 1}, {"score": [[1, 2]], "target": [[1, 0]]}])
+def test_gini_endpoint_rejects_non_flat_json(client, scored_model, body):
+    response = client.post(f"/api/models/{scored_model}/monitoring/gini", json=body)
+    assert response.status_code == 400
+    assert "Sayı dizisi bekleniyordu" in response.get_json()["error"]
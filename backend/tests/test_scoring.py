@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pytest
+
+from services.scoring import CompiledModel, score_columns
+
+
+def _model(medians=(2.0, 10.0)):
+    return CompiledModel(
+        ["x1", "x2"], np.array([0.5, -1.0]), np.array(medians, dtype=np.float64), 0.25,
+    )
+
+
+def _sigmoid(value):
+    return 1.0 / (1.0 + math.exp(-value))
+
+
+def test_score_columns_imputes_nan_with_median():
+    result = score_columns(_model(), {"x1": np.array([4.0, np.nan]), "x2": np.array([np.nan, 1.0])})
+    expected = [0.5 * 4.0 - 10.0 + 0.25, 0.5 * 2.0 - 1.0 + 0.25]
+    np.testing.assert_allclose(result["logit"], expected)
+    np.testing.assert_allclose(result["probability"], [_sigmoid(v) for v in expected])
+    assert result["imputed"] == {"x1": 1, "x2": 1}
+    assert result["missing_columns"] == []
+
+
+def test_score_columns_fills_missing_column():
+    result = score_columns(_model(), {"x1": np.array([0.0, 2.0])})
+    np.testing.assert_allclose(result["logit"], [-9.75, -8.75])
+    assert result["missing_columns"] == ["x2"]
+    assert result["imputed"] == {"x2": 2}
+
+
+def test_score_columns_intercept_override():
+    result = score_columns(_model(), {"x1": np.array([0.0]), "x2": np.array([0.0])}, intercept=-1.0)
+    np.testing.assert_allclose(result["logit"], [-1.0])
+
+
+def test_score_columns_requires_median_for_gaps():
+    model = _model(medians=(np.nan, 10.0))
+    with pytest.raises(ValueError, match="x1"):
+        score_columns(model, {"x1": np.array([np.nan]), "x2": np.array([1.0])})
+    result = score_columns(model, {"x1": np.array([1.0]), "x2": np.array([1.0])})
+    np.testing.assert_allclose(result["logit"], [-0.25])
+
+
+def test_score_columns_extreme_logit():
+    result = score_columns(_model(), {"x1": np.array([0.0]), "x2": np.array([1e4])})
+    assert result["probability"][0] == 0.0
+
+
+def test_score_endpoint(client, scored_model):
+    response = client.post(
+        f"/api/models/{scored_model}/score?id_column=id",
+        data="id,x1,x2\n7,4,\n8,,1\n", content_type="text/csv",
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["id"] == [7, 8]
+    assert body["intercept"] == 0.25
+    assert body["imputed"] == {"x1": 1, "x2": 1}
+    np.testing.assert_allclose(body["logit"], [-7.75, 0.25])
+
+
+@pytest.mark.parametrize("value", ["abc", "nan", "inf"])
+def test_score_endpoint_rejects_invalid_intercept(client, scored_model, value):
+    response = client.post(
+        f"/api/models/{scored_model}/score?intercept={value}",
+        data="x1,x2\n1,1\n", content_type="text/csv",
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("intercept:")
+
+
+def test_score_columns_rejects_infinite_values():
+    with pytest.raises(ValueError, match="Sonlu olmayan değer: x2"):
+        score_columns(_model(), {"x1": np.array([1.0]), "x2": np.array([np.inf])})
+    with pytest.raises(ValueError, match="Skor sonlu değil"):
+        score_columns(_model(), {"x1": np.array([1e308]), "x2": np.array([-1.7e308])})
+
+
+@pytest.mark.parametrize("body", ["id,x1,x2\n7,4,1\n,1,1\n", "id,x1,x2\n7,1e400,1\n"])
+def test_score_endpoint_rejects_non_finite_values(client, scored_model, body):
+    response = client.post(f"/api/models/{scored_model}/score?id_column=id", data=body, content_type="text/csv")
+    assert response.status_code == 400
+    assert "NaN" not in response.get_data(as_text=True)
+
+
+def test_score_endpoint_keeps_fractional_ids(client, scored_model):
+    response = client.post(
+        f"/api/models/{scored_model}/score?id_column=id",
+        data="id,x1,x2\n7,4,1\n7.5,1,1\n", content_type="text/csv",
+    )
+    assert response.status_code == 200
+    assert response.get_json()["id"] == [7.0, 7.5]
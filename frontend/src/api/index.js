@@ -46,18 +46,24 @@ export function invalidateCache(prefix) {
 
 // ── Dashboard ──
 export const dashboardApi = {
+  // summary + gini-overview + development-progress + gini-alerts tek istekte
+  getBootstrap: () => cachedGet('/dashboard/bootstrap'),
   getSummary: () => cachedGet('/dashboard/summary'),
   getGiniOverview: () => cachedGet('/dashboard/gini-overview'),
   getDevelopmentProgress: () => cachedGet('/dashboard/development-progress'),
   getGiniAlerts: () => cachedGet('/dashboard/gini-alerts'),
+  // Canlı güncellemeler (SSE): summary, alerts, progress, overview event'leri
+  openStream: () => new EventSource(`${api.defaults.baseURL}/dashboard/stream`),
 }
 
 // ── Models ──
 export const modelsApi = {
   list: (params) => api.get('/models/', { params }),
   get: (id) => api.get(`/models/${id}`),
+  getBatch: (ids, include) => api.get('/models/batch', { params: { ids: ids.join(','), include: include?.join(',') } }),
   create: (data) => api.post('/models/', data).then(r => { invalidateCache('/dashboard'); return r }),
   update: (id, data) => api.put(`/models/${id}`, data).then(r => { invalidateCache('/dashboard'); return r }),
+  bulkUpdate: (data) => api.patch('/models/bulk', data).then(r => { invalidateCache('/dashboard'); return r }),
   delete: (id) => api.delete(`/models/${id}`).then(r => { invalidateCache('/dashboard'); return r }),
 
   // Technical Guide
@@ -77,6 +83,16 @@ export const modelsApi = {
 
   // Gini History
   listGiniHistory: (modelId, params) => api.get(`/models/${modelId}/gini-history`, { params }),
+  giniSeries: (modelId, params) => api.get(`/models/${modelId}/gini-history/series`, { params }),
+
+  // PSI
+  getPsiBaseline: (modelId) => api.get(`/models/${modelId}/monitoring/psi/baseline`),
+  listPsiHistory: (modelId) => api.get(`/models/${modelId}/monitoring/psi`),
+  listCsiHistory: (modelId, params) => api.get(`/models/${modelId}/monitoring/csi`, { params }),
+  scoreBatch: (modelId, formData, params) => api.post(`/models/${modelId}/score`, formData, {
+    params,
+    headers: { 'Content-Type': 'multipart/form-data' },
+  }),
   createGiniRecord: (modelId, data) => api.post(`/models/${modelId}/gini-history`, data),
 
   // Rollout (İmplementasyon Kademeleri)
@@ -114,4 +130,13 @@ export const developmentApi = {
   listOwners: () => api.get('/development/owners'),
 }
 
+// ── Import / Export ──
+export const transferApi = {
+  importInventory: (formData, params) => api.post('/import/', formData, {
+    params,
+    headers: { 'Content-Type': 'multipart/form-data' },
+  }).then(r => { invalidateCache('/dashboard'); return r }),
+  exportUrl: (dataset, params) => `${api.defaults.baseURL}/export/${dataset}?${new URLSearchParams(params)}`,
+}
+
 export default api